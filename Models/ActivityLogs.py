@@ -1,12 +1,21 @@
 from datetime import datetime
 from extentions import db
+from utils.search import trigram_index
 
 class ActivityLog(db.Model):
     __tablename__ = "activity_logs"
+    __table_args__ = (
+        # Keyset pagination orders by (created_at, id)
+        db.Index('ix_activity_logs_created_at_id', 'created_at', 'id'),
+        # Substring search (utils.search.search_filter)
+        trigram_index('activity_logs', 'action'),
+        trigram_index('activity_logs', 'details'),
+        trigram_index('activity_logs', 'ip_address'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, nullable=False)  # Who did the action
     action = db.Column(db.String(255), nullable=False)  # e.g., "CREATE_PATIENT", "DELETE_MEDICINE"
     details = db.Column(db.Text, nullable=True)  # JSON or string of what was changed
     ip_address = db.Column(db.String(45), nullable=True)  # Optional
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -14,6 +14,10 @@ class AppointmentStatusTypeEnum(enum.Enum):
     
 class Appointment(db.Model):
     __tablename__ = "appointment"
+    __table_args__ = (
+        # Keyset pagination orders by (created_at, id)
+        db.Index('ix_appointment_created_at_id', 'created_at', 'id'),
+    )
 
     tenant_session = None
 
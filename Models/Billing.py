@@ -8,6 +8,7 @@ from extentions import db
 from Models.Orders import Orders
 from Models.WardBeds import WardBeds
 from Models.Payments import Payment
+from utils.search import trigram_index
 
 
 # from Models.BillingMedicines import BillingMedicines # Uncomment in your actual project
@@ -19,6 +20,12 @@ from Models.Payments import Payment
 
 class Billing(db.Model):
     __tablename__ = "billing"
+    __table_args__ = (
+        # Keyset pagination orders by (created_at, id)
+        db.Index('ix_billing_created_at_id', 'created_at', 'id'),
+        # Substring search (utils.search.search_filter)
+        trigram_index('billing', 'notes'),
+    )
 
     tenant_session = None
 
@@ -3,10 +3,15 @@ from datetime import datetime
 from sqlalchemy.orm import validates
 
 from extentions import db
+from utils.search import lower_index
 
 
 class LabTest(db.Model):
     __tablename__ = 'lab_test'
+    __table_args__ = (
+        # Case-insensitive exact match in order search (utils.order_search)
+        lower_index('lab_test', 'name'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False, unique=True)
@@ -1,15 +1,22 @@
 from datetime import datetime
 from extentions import db
 from Models.Users import User
+from utils.search import trigram_index
 
 
 class MedicalRecords(db.Model):
     __tablename__ = 'medical_records'
+    __table_args__ = (
+        # Keyset pagination orders by (created_at, id)
+        db.Index('ix_medical_records_created_at_id', 'created_at', 'id'),
+        # Substring search (utils.search.search_filter)
+        trigram_index('medical_records', 'notes'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     notes = db.Column(db.String(100), nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
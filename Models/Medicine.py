@@ -2,10 +2,19 @@ from datetime import datetime
 from sqlalchemy.orm import validates
 from extentions import db
 from Models.MedicineStock import MedicineStock
+from utils.search import trigram_index, lower_index
 
 
 class Medicine(db.Model):
     __tablename__ = 'medicine'
+    __table_args__ = (
+        # Substring search (utils.search.search_filter)
+        trigram_index('medicine', 'name'),
+        trigram_index('medicine', 'manufacturer'),
+        trigram_index('medicine', 'description'),
+        # Case-insensitive exact match in order search (utils.order_search)
+        lower_index('medicine', 'name'),
+    )
 
     tenant_session = None
 
@@ -1,9 +1,14 @@
 from datetime import datetime
 from extentions import db
+from utils.search import trigram_index
 
 
 class MedicineStock(db.Model):
     __tablename__ = 'medicine_stock'
+    __table_args__ = (
+        # Substring search (utils.search.search_filter)
+        trigram_index('medicine_stock', 'batch_no'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     medicine_id = db.Column(db.Integer, db.ForeignKey('medicine.id'), nullable=False)
@@ -7,10 +7,20 @@ from Models.PurchaseTest import PurchaseTest
 from Models.PurchaseOrder import PurchaseOrder
 from Models.PurchaseSurgery import PurchaseSurgery
 from Models.Prescriptions import Prescriptions
+from utils.search import lower_index
 
 
 class Orders(db.Model):
     __tablename__ = 'orders'
+    __table_args__ = (
+        # Keyset pagination orders by (created_at, id)
+        db.Index('ix_orders_created_at_id', 'created_at', 'id'),
+        # order_type filtering, then the same keyset order (utils.order_kind)
+        db.Index('ix_orders_order_kind_created_at_id', 'order_kind', 'created_at', 'id'),
+        # Case-insensitive exact match in order search (utils.order_search)
+        lower_index('orders', 'taken_by'),
+        lower_index('orders', 'taken_by_phone_no'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -18,7 +28,8 @@ class Orders(db.Model):
     received_date = db.Column(db.Date, nullable=True)
     taken_by = db.Column(db.String(50), nullable=True)
     taken_by_phone_no = db.Column(db.String(50), nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    order_kind = db.Column(db.String(20), nullable=True)  # 'medicine' | 'lab_test' | 'surgery' | 'mixed', kept by utils.order_kind
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     #Relationships
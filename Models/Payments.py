@@ -1,10 +1,17 @@
 from datetime import datetime
 
 from extentions import db
+from utils.search import trigram_index
 
 
 class Payment(db.Model):
     __tablename__ = "payments"
+    __table_args__ = (
+        # Keyset pagination orders by (created_at, id)
+        db.Index('ix_payments_created_at_id', 'created_at', 'id'),
+        # Substring search (utils.search.search_filter)
+        trigram_index('payments', 'transaction_ref'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     billing_id = db.Column(db.Integer, db.ForeignKey('billing.id'), nullable=False)
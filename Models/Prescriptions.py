@@ -1,12 +1,17 @@
 from datetime import datetime
 from sqlalchemy.orm import validates
 from extentions import db
+from utils.search import trigram_index
 # from Models.Users import User
 # from Models.PrescriptionMedicines import PrescriptionMedicines
 # from Models.PrescriptionTests import PrescriptionTests
 
 class Prescriptions(db.Model):
     __tablename__ = "prescriptions"
+    __table_args__ = (
+        # Substring search (utils.search.search_filter)
+        trigram_index('prescriptions', 'notes'),
+    )
 
     tenant_session = None
 
@@ -7,7 +7,7 @@ class PurchaseOrder(db.Model):
     __tablename__ = 'purchase_order'
 
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False)  # 👈 Add this
+    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False, index=True)  # 👈 Add this
     medicine_id = db.Column(db.Integer, db.ForeignKey('medicine.id'), nullable=False)
     quantity = db.Column(db.Integer, nullable=False)
     received_date = db.Column(db.Date, nullable=True)
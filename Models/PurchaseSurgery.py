@@ -7,7 +7,7 @@ class PurchaseSurgery(db.Model):
     __tablename__ = 'purchase_surgery'
 
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False, index=True)
     surgery_type_id = db.Column(db.Integer, db.ForeignKey('surgery_types.id'), nullable=False)
     operation_theatre_id = db.Column(db.Integer, db.ForeignKey('operation_theatres.id'), nullable=True)
     price = db.Column(db.Float, nullable=False, default=0)
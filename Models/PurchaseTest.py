@@ -7,7 +7,7 @@ class PurchaseTest(db.Model):
     __tablename__ = 'purchase_test'
 
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False, index=True)
     test_id = db.Column(db.Integer, db.ForeignKey('lab_test.id'), nullable=False)
     status = db.Column(db.String, nullable=True, default="PENDING")
     notes = db.Column(db.Text, nullable=True)
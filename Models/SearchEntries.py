@@ -0,0 +1,23 @@
+from datetime import datetime
+from extentions import db
+from utils.search import trigram_index
+
+class SearchEntry(db.Model):
+    """Denormalized search document for one user, order or appointment (see utils.search_index)."""
+    __tablename__ = "search_entries"
+    __table_args__ = (
+        db.UniqueConstraint('entity_type', 'entity_id', name='uq_search_entries_entity'),
+        db.Index('ix_search_entries_patient_id', 'patient_id'),
+        trigram_index('search_entries', 'search_text'),
+        trigram_index('search_entries', 'patient_name'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity_type = db.Column(db.String(30), nullable=False)  # "user", "order", "appointment"
+    entity_id = db.Column(db.Integer, nullable=False)
+    title = db.Column(db.String(255), nullable=False)
+    subtitle = db.Column(db.String(255), nullable=True)
+    search_text = db.Column(db.Text, nullable=False)  # lower-cased searchable fields of the entity
+    patient_id = db.Column(db.Integer, nullable=True)
+    patient_name = db.Column(db.String(100), nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
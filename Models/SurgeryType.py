@@ -2,9 +2,14 @@ from datetime import datetime
 from Models.Department import Department
 
 from extentions import db
+from utils.search import lower_index
 
 class SurgeryType(db.Model):
     __tablename__ = 'surgery_types'
+    __table_args__ = (
+        # Case-insensitive exact match in order search (utils.order_search)
+        lower_index('surgery_types', 'name'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
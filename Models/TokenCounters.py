@@ -0,0 +1,11 @@
+from extentions import db
+
+
+class TokenCounter(db.Model):
+    """Last token number handed out per department and day (see utils.token_numbers)."""
+    __tablename__ = "token_counters"
+
+    # Tokens without a department share key 0
+    department_key = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    token_date = db.Column(db.Date, primary_key=True)
+    last_number = db.Column(db.Integer, nullable=False, default=0)
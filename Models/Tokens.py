@@ -1,12 +1,20 @@
 from datetime import datetime
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import validates
 from extentions import db
 from Models.Users import User
 import enum
 from Models.Department import Department
+from utils.token_numbers import allocate_token_number
 
 class Token(db.Model):
     __tablename__ = "Token"
+    __table_args__ = (
+        # Keyset pagination orders by (created_at, id)
+        db.Index('ix_token_created_at_id', 'created_at', 'id'),
+        # Per-department daily queues (utils.token_queue)
+        db.Index('ix_token_department_id_appointment_date', 'department_id', 'appointment_date'),
+    )
 
     tenant_session = None
 
@@ -15,7 +23,7 @@ class Token(db.Model):
     doctor_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
     appointment_date = db.Column(db.DateTime, nullable=False)
     status = db.Column(db.String(50), nullable=False, default='Alloted')  # e.g., Scheduled, Completed, Canceled
-    token_number = db.Column(db.Integer, nullable=False)
+    token_number = db.Column(db.Integer, nullable=False)  # assigned on insert, see _assign_token_number
     department_id = db.Column(db.Integer, db.ForeignKey('department.id'), nullable=True)
 
     patient = db.relationship('User', foreign_keys=[patient_id], backref='patient_tokens', lazy=True)
@@ -69,7 +77,21 @@ class Token(db.Model):
                 raise ValueError("appointment date must be a valid date string YYYY-MM-DD")
         elif not isinstance(value, datetime):
             raise ValueError("appointment date must be a datetime object or a date string")
-
-        session = self.tenant_session or db.session
-        self.token_number = session.query(Token).filter_by(department_id = self.department_id,appointment_date=self.appointment_date).count() + 1
         return value
+
+
+# Token numbers come from the per-(department, day) counter when the row is
+# written, once both department_id and appointment_date are known.
+@event.listens_for(Token, "before_insert")
+def _assign_token_number(mapper, connection, target):
+    target.token_number = allocate_token_number(connection, target.department_id, target.appointment_date)
+
+
+@event.listens_for(Token, "before_update")
+def _reassign_token_number(mapper, connection, target):
+    # Moving a token to another department or day puts it at the end of that queue
+    attrs = inspect(target).attrs
+    department_id = attrs.department_id.history.deleted or [target.department_id]
+    appointment_date = attrs.appointment_date.history.deleted or [target.appointment_date]
+    if (department_id[0], appointment_date[0].date()) != (target.department_id, target.appointment_date.date()):
+        target.token_number = allocate_token_number(connection, target.department_id, target.appointment_date)
@@ -9,6 +9,7 @@ from Models.UserExtraFields import UserExtraFields
 from Models.Department import Department
 from Models.staffSchedule import StaffSchedule
 from Models.Billing import Billing
+from utils.search import trigram_index
 
 
 class GenderEnum(enum.Enum):
@@ -19,6 +20,14 @@ class GenderEnum(enum.Enum):
 
 class User(db.Model):
     __tablename__ = 'user'
+    __table_args__ = (
+        # Keyset pagination orders by (created_at, id)
+        db.Index('ix_user_created_at_id', 'created_at', 'id'),
+        # Substring search (utils.search.search_filter)
+        trigram_index('user', 'name'),
+        trigram_index('user', 'email'),
+        trigram_index('user', 'username'),
+    )
 
     tenant_session = None
 
@@ -40,6 +49,8 @@ class User(db.Model):
 
     is_active = db.Column(db.Boolean, nullable=False, default=True)
     is_deleted = db.Column(db.Boolean, nullable=False, default=False)
+    # Bumped whenever the user's JWT claims go stale (utils.principal_cache.revoke_tokens)
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     user_type_id = db.Column(db.Integer, db.ForeignKey('user_type.id'), nullable=False)
     user_type = db.relationship('UserType', backref=db.backref('users', lazy=True))
@@ -3,7 +3,7 @@ from datetime import datetime
 from sqlalchemy.orm import validates
 from extentions import db
 from Models.Wards import Ward
-from Models.Users import User
+# from Models.Users import User
 
 class WardBedStatusEnum(enum.Enum):
     AVAILABLE = 'AVAILABLE'
@@ -13,6 +13,13 @@ class WardBedStatusEnum(enum.Enum):
 
 class WardBeds(db.Model):
     __tablename__ = 'ward_beds'
+    __table_args__ = (
+        # Free beds per ward, for allocation and tallies (utils.bed_allocation)
+        db.Index(
+            'ix_ward_beds_available', 'ward_id', 'id',
+            postgresql_where=db.text("status = 'AVAILABLE' AND patient_id IS NULL AND is_active AND NOT is_deleted"),
+        ),
+    )
 
     tenant_session = None
 
@@ -6,13 +6,14 @@ from psycopg2 import sql
 from flask import request, url_for, current_app
 from flask_restful import Resource
 from flask_jwt_extended import jwt_required
-from sqlalchemy import or_
 from sqlalchemy.exc import IntegrityError
 from werkzeug.utils import secure_filename
 
 from Models.AccountInfo import AccountInfo
 from extentions import db
 from migration_helper import run_tenant_migrations
+from utils.account_cache import invalidate_account
+from utils.search import search_filter
 
 UPLOAD_FOLDER = "uploads"
 
@@ -43,12 +44,11 @@ class AccountInfoResource(Resource):
             query = AccountInfo.query
             q = request.args.get('q')
             if q:
-                query = query.filter(
-                    or_(
-                        AccountInfo.name.ilike(f"%{q}%"),
-                        AccountInfo.subdomain.ilike(f"%{q}%"),
-                    )
-                )
+                query = query.filter(search_filter(
+                    q,
+                    AccountInfo.name,
+                    AccountInfo.subdomain,
+                ))
 
             total_records = query.count()
             if page is not None and limit is not None:
@@ -159,6 +159,7 @@ class AccountInfoResource(Resource):
                 new_account = AccountInfo(name=name, subdomain=subdomain, db_uri=db_uri, logo_url=save_path)
                 db.session.add(new_account)
                 db.session.commit()
+                invalidate_account(new_account.id)
 
                 run_tenant_migrations(db_uri, subdomain, name)
 
@@ -213,6 +214,7 @@ class AccountInfoResource(Resource):
                 run_tenant_migrations(account.db_uri)
 
             db.session.commit()
+            invalidate_account(account.id)
             return {"message": f"Account {account.name} updated successfully."}, 200
         except Exception as e:
             db.session.rollback()
@@ -3,11 +3,12 @@ from flask_jwt_extended import jwt_required
 from flask_restful import Resource
 import logging
 
-from sqlalchemy import or_, cast, String
 
 from new import with_tenant_session_and_user
+from utils.pagination import keyset_requested, keyset_paginate, MAX_PAGE_SIZE
 from Serializers.ActivityLogsSerializers import activity_logs_serializers
 from Models.ActivityLogs import ActivityLog
+from utils.search import search_filter
 
 logger = logging.getLogger(__name__)
 
@@ -26,24 +27,34 @@ class ActivityLogsResource(Resource):
             # 🔹 Search query
             q = request.args.get('q')
             if q:
-                query = query.filter(
-                    or_(
-                        cast(ActivityLog.user_id, String).ilike(f"%{q}%"),
-                        ActivityLog.action.ilike(f"%{q}%"),
-                        ActivityLog.details.ilike(f"%{q}%"),
-                        ActivityLog.ip_address.ilike(f"%{q}%"),
-                    )
-                )
-
-            # 🔹 Pagination parameters
-            page = request.args.get("page", default=1, type=int)
-            limit = request.args.get("limit", default=20, type=int)
-
-            if page < 1: page = 1
-            if limit < 1: limit = 20
+                query = query.filter(search_filter(
+                    q,
+                    ActivityLog.user_id,
+                    ActivityLog.action,
+                    ActivityLog.details,
+                    ActivityLog.ip_address,
+                ))
 
             total_records = query.count()
-            logs = query.offset((page - 1) * limit).limit(limit).all()
+
+            if keyset_requested():
+                # 🔹 Keyset pagination (cursor / after_id), O(limit) at any depth
+                try:
+                    logs, limit, next_cursor = keyset_paginate(query, ActivityLog)
+                except ValueError as ve:
+                    return {"error": str(ve)}, 400
+                page = None
+            else:
+                # 🔹 Pagination parameters
+                page = request.args.get("page", default=1, type=int)
+                limit = request.args.get("limit", default=20, type=int)
+
+                if page < 1: page = 1
+                if limit < 1: limit = 20
+                limit = min(limit, MAX_PAGE_SIZE)
+
+                next_cursor = None
+                logs = query.offset((page - 1) * limit).limit(limit).all()
             result = activity_logs_serializers.dump(logs)
 
             return {
@@ -51,6 +62,7 @@ class ActivityLogsResource(Resource):
                 "limit": limit,
                 "total_records": total_records,
                 "total_pages": (total_records + limit - 1) // limit if limit else 1,
+                "next_cursor": next_cursor,
                 "data": result
             }, 200
 
@@ -1,7 +1,6 @@
 from flask import request
 from flask_jwt_extended import jwt_required
 from flask_restful import Resource
-from sqlalchemy import or_, cast, String
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 import logging
@@ -11,6 +10,10 @@ from Models.Appointments import Appointment
 from Models.Users import User
 from Serializers.AppointmentSerializers import AppointmentSerializers, AppointmentSerializerz
 from new import with_tenant_session_and_user
+from utils.aggregates import summarize, count_if
+from utils.pagination import keyset_requested, keyset_paginate, MAX_PAGE_SIZE
+from utils.loader_plan import loader_plan
+from utils.search import search_filter
 
 logger = logging.getLogger(__name__)
 
@@ -43,10 +46,15 @@ class AppointmentsResource(Resource):
                 except ValueError:
                     return {"error": "Invalid date format. Use YYYY-MM-DD"}, 400
                     
-            total_records = query.count()
-            scheduled_records = query.filter(Appointment.status == 'SCHEDULED').count()
-            completed_records = query.filter(Appointment.status == 'COMPLETED').count()
-            canceled_records = query.filter(Appointment.status == 'CANCELED').count()
+            # Status breakdown in a single pass
+            summary = summarize(
+                query,
+                total_records=count_if(),
+                scheduled_records=count_if(Appointment.status == 'SCHEDULED'),
+                completed_records=count_if(Appointment.status == 'COMPLETED'),
+                canceled_records=count_if(Appointment.status == 'CANCELED'),
+            )
+            total_records = summary["total_records"]
 
             if status:
                 query = query.filter(Appointment.status == status)
@@ -54,37 +62,50 @@ class AppointmentsResource(Resource):
             # Search
             q = request.args.get("q")
             if q:
-                query = query.filter(
-                    or_(
-                        Doctor.name.ilike(f"%{q}%"),
-                        Doctor.email.ilike(f"%{q}%"),
-                        Patient.name.ilike(f"%{q}%"),
-                        Patient.email.ilike(f"%{q}%"),
-                        cast(Appointment.appointment_date, String).ilike(f"%{q}%"),
-                        cast(Appointment.appointment_start_time, String).ilike(f"%{q}%"),
-                        cast(Appointment.appointment_end_time, String).ilike(f"%{q}%"),
-                        cast(Appointment.duration, String).ilike(f"%{q}%"),
-                    )
-                )
+                query = query.filter(search_filter(
+                    q,
+                    Doctor.name,
+                    Doctor.email,
+                    Patient.name,
+                    Patient.email,
+                    Appointment.appointment_date,
+                    Appointment.appointment_start_time,
+                    Appointment.appointment_end_time,
+                    Appointment.duration,
+                ))
+
+            # Eager-load everything the serializer nests
+            query = query.options(*loader_plan(AppointmentSerializers))
 
             # Pagination
-            page = request.args.get("page", default=1, type=int)
-            limit = request.args.get("limit", default=20, type=int)
-            if page < 1: page = 1
-            if limit < 1: limit = 20
-
-            appointments = query.offset((page - 1) * limit).limit(limit).all()
+            if keyset_requested():
+                # Keyset pagination (cursor / after_id), O(limit) at any depth
+                try:
+                    appointments, limit, next_cursor = keyset_paginate(query, Appointment)
+                except ValueError as ve:
+                    return {"error": str(ve)}, 400
+                page = None
+            else:
+                page = request.args.get("page", default=1, type=int)
+                limit = request.args.get("limit", default=20, type=int)
+                if page < 1: page = 1
+                if limit < 1: limit = 20
+                limit = min(limit, MAX_PAGE_SIZE)
+
+                next_cursor = None
+                appointments = query.offset((page - 1) * limit).limit(limit).all()
 
             result = AppointmentSerializers.dump(appointments)
 
             return {
                 "page": page,
                 "limit": limit,
-                "scheduled_records": scheduled_records,
-                "completed_records": completed_records,
-                "canceled_records": canceled_records,
+                "scheduled_records": summary["scheduled_records"],
+                "completed_records": summary["completed_records"],
+                "canceled_records": summary["canceled_records"],
                 "total_records": total_records,
                 "total_pages": (total_records + limit - 1) // limit,
+                "next_cursor": next_cursor,
                 "data": result
             }, 200
 
@@ -1,4 +1,4 @@
-from flask import request
+from flask import request, g, current_app
 from flask_jwt_extended import create_access_token
 from flask_restful import Resource
 from werkzeug.security import check_password_hash
@@ -6,6 +6,7 @@ from werkzeug.security import check_password_hash
 from Models.Users import User
 from Serializers.UserSerializers import user_serializer
 from new import with_tenant_session_and_user
+from utils.principal_cache import principal_claims
 
 
 class AuthResource(Resource):
@@ -24,10 +25,15 @@ class AuthResource(Resource):
         print(user)
         if not user:
             return {'msg': 'Bad username or password'}, 401
+
+        additional_claims = None
+        if current_app.config.get('JWT_EMBED_TENANT_CLAIMS'):
+            additional_claims = principal_claims(user, g.account["id"], current_app.config.get('JWT_CLAIMS_VERSION'))
+
         user = user_serializer.dump(user)
         # print(check_password_hash(user['password'], password), user['password'])
         # if not check_password_hash(user['password'], password):
         #     return {'msg': 'Bad username or password'}, 401
 
-        access_token = create_access_token(identity=username)
+        access_token = create_access_token(identity=username, additional_claims=additional_claims)
         return {'access_token': access_token, "user": user, "success": True}, 200
@@ -2,17 +2,20 @@ import json
 import logging
 from flask import request
 from flask_restful import Resource
-from sqlalchemy import or_, String, cast
+from sqlalchemy import or_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import aliased
 
 from Models.Users import User
 from new import with_tenant_session_and_user
+from utils.pagination import keyset_requested, keyset_paginate, stream_requested, stream_ndjson, MAX_PAGE_SIZE
 from utils.logger import log_activity
+from utils.loader_plan import loader_plan
 
 from Models.Billing import Billing
 from Models.Payments import Payment
 from Serializers.PaymentsSerializers import payment_serializers
+from utils.search import search_filter
 
 logger = logging.getLogger(__name__)
 
@@ -126,13 +129,12 @@ class BillingPaymentResource(Resource):
 
             q = request.args.get('q')
             if q:
-                query = query.filter(
-                    or_(
-                        BillingUser.name.ilike(f"%{q}%"),
-                        cast(Payment.amount, String).ilike(f"%{q}%"),
-                        Payment.transaction_ref.ilike(f"%{q}%"),
-                    )
-                )
+                query = query.filter(search_filter(
+                    q,
+                    BillingUser.name,
+                    Payment.amount,
+                    Payment.transaction_ref,
+                ))
             status = request.args.get('status')
             if status:
                 query = query.filter(
@@ -148,15 +150,33 @@ class BillingPaymentResource(Resource):
                     )
                 )
 
-            if page is not None and limit is not None:
-                if page < 1: page = 1
-                if limit < 1: limit = 10
-                query = query.offset((page - 1) * limit).limit(limit)
-            else:
-                page = 1
-                limit = total_records
+            # 🔹 Eager-load everything the serializer nests
+            query = query.options(*loader_plan(payment_serializers))
+
+            # 🔹 Full dump: stream NDJSON in batches instead of loading every row
+            if stream_requested():
+                return stream_ndjson(query, payment_serializers, tenant_session)
 
-            payments = query.all()
+            if keyset_requested():
+                # 🔹 Keyset pagination (cursor / after_id), O(limit) at any depth
+                try:
+                    payments, limit, next_cursor = keyset_paginate(query, Payment)
+                except ValueError as ve:
+                    return {"error": str(ve)}, 400
+                page = None
+            else:
+                next_cursor = None
+                if page is not None and limit is not None:
+                    if page < 1: page = 1
+                    if limit < 1: limit = 10
+                    limit = min(limit, MAX_PAGE_SIZE)
+                    query = query.offset((page - 1) * limit).limit(limit)
+                else:
+                    # No pagination requested: cap at MAX_PAGE_SIZE (use stream=true for a full dump)
+                    page = 1
+                    limit = MAX_PAGE_SIZE
+                    query = query.limit(limit)
+                payments = query.all()
             result = payment_serializers.dump(payments)
 
             return {
@@ -164,6 +184,7 @@ class BillingPaymentResource(Resource):
                 "limit": limit,
                 "total_records": total_records,
                 "total_pages": (total_records + limit - 1) // limit if limit else 1,
+                "next_cursor": next_cursor,
                 "data": result
             }, 200
 
@@ -3,7 +3,7 @@ import logging
 from flask import request
 from flask_jwt_extended import jwt_required
 from flask_restful import Resource
-from sqlalchemy import or_, func
+from sqlalchemy import or_
 from sqlalchemy.exc import IntegrityError
 
 from Models.BillingSurgeries import BillingSurgeries
@@ -14,9 +14,13 @@ from Models.BillingTests import BillingTests
 from Models.Orders import Orders
 from Models.WardBeds import WardBeds
 from Models.Users import User
-from Serializers.BillingSerializers import billing_serializers, billing_serializer
+from Serializers.BillingSerializers import billing_serializers, billing_serializer, billing_fast_serializer
 from Serializers.OrdersSerializer import order_serializer
 from new import with_tenant_session_and_user
+from utils.aggregates import summarize, count_if, sum_if
+from utils.pagination import keyset_requested, keyset_paginate, stream_requested, stream_ndjson, MAX_PAGE_SIZE
+from utils.loader_plan import loader_plan
+from utils.search import search_filter
 
 logger = logging.getLogger(__name__)
 
@@ -31,26 +35,26 @@ class BillingResource(Resource):
             query = query.outerjoin(Orders, Billing.order_id == Orders.id)
             query = query.outerjoin(User, User.id == Orders.user_id)
             query = query.outerjoin(WardBeds, Billing.bed_id == WardBeds.id)
-            total_records = query.count()
-            paid_records = query.filter(Billing.status == "PAID").count()
-            total_revenue = (
-                query.filter(Billing.status == "PAID")
-                .with_entities(func.coalesce(func.sum(Billing.total_amount), 0))
-                .scalar()
+            # 🔹 Counters and revenue in a single pass
+            summary = summarize(
+                query,
+                total_records=count_if(),
+                paid_records=count_if(Billing.status == "PAID"),
+                total_revenue=sum_if(Billing.total_amount, Billing.status == "PAID"),
             )
+            total_records = summary["total_records"]
             # 🔹 Pagination params (optional)
             page = request.args.get("page", type=int)
             limit = request.args.get("limit", type=int)
 
             q = request.args.get('q')
             if q:
-                query = query.filter(
-                    or_(
-                        User.name.ilike(f"%{q}%"),
-                        User.email.ilike(f"%{q}%"),
-                        Billing.notes.ilike(f"%{q}%"),
-                    )
-                )
+                query = query.filter(search_filter(
+                    q,
+                    User.name,
+                    User.email,
+                    Billing.notes,
+                ))
             status = request.args.get("status")
             if status: 
                 query = query.filter(
@@ -59,27 +63,47 @@ class BillingResource(Resource):
                     )
                 )
 
-            # 🔹 Apply pagination if both page and limit are provided
-            if page is not None and limit is not None:
-                if page < 1: page = 1
-                if limit < 1: limit = 10
-                query = query.offset((page - 1) * limit).limit(limit)
+            # 🔹 Full dump: stream NDJSON in batches instead of loading every row
+            if stream_requested():
+                # 🔹 Eager-load everything the serializer nests
+                query = query.options(*loader_plan(billing_serializers))
+                return stream_ndjson(query, billing_serializers, tenant_session)
+
+            # 🔹 Page over ids only, the fast serializer reads the columns it dumps
+            query = query.with_entities(Billing.id, Billing.created_at)
+
+            if keyset_requested():
+                # 🔹 Keyset pagination (cursor / after_id), O(limit) at any depth
+                try:
+                    billings, limit, next_cursor = keyset_paginate(query, Billing)
+                except ValueError as ve:
+                    return {"error": str(ve)}, 400
+                page = None
             else:
-                # Return all if pagination not provided
-                page = 1
-                limit = total_records
-
-            billings = query.all()
-            result = billing_serializers.dump(billings)
+                next_cursor = None
+                # 🔹 Apply pagination if both page and limit are provided
+                if page is not None and limit is not None:
+                    if page < 1: page = 1
+                    if limit < 1: limit = 10
+                    limit = min(limit, MAX_PAGE_SIZE)
+                    query = query.offset((page - 1) * limit).limit(limit)
+                else:
+                    # No pagination requested: cap at MAX_PAGE_SIZE (use stream=true for a full dump)
+                    page = 1
+                    limit = MAX_PAGE_SIZE
+                    query = query.limit(limit)
+                billings = query.all()
+            result = billing_fast_serializer.dump_ids(tenant_session, [row.id for row in billings])
 
             # 🔹 Structured response
             return {
                 "page": page,
                 "limit": limit,
                 "total_records": total_records,
-                "paid_records": paid_records,
-                "total_revenue": total_revenue,
+                "paid_records": summary["paid_records"],
+                "total_revenue": summary["total_revenue"],
                 "total_pages": (total_records + limit - 1) // limit if limit else 1,
+                "next_cursor": next_cursor,
                 "data": result
             }, 200
 
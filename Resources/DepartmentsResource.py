@@ -5,7 +5,7 @@ from datetime import datetime, timedelta
 from flask import request, g
 from flask_jwt_extended import jwt_required
 from flask_restful import Resource
-from sqlalchemy import func, or_
+from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
 
 from Models.Department import Department
@@ -14,7 +14,9 @@ from Models.UserType import UserType
 from Serializers.DepartmentSerializers import department_serializers, department_serializer
 from extentions import db
 from new import with_tenant_session_and_user
+from utils.pagination import stream_requested, stream_ndjson, MAX_PAGE_SIZE
 from utils.logger import log_activity
+from utils.search import search_filter
 
 logger = logging.getLogger(__name__)
 
@@ -42,26 +44,31 @@ class DepartmentsResource(Resource):
 
             q = request.args.get('q')
             if q:
-                query = query.filter(
-                    or_(
-                        Department.name.ilike(f"%{q}%"),
-                        Department.description.ilike(f"%{q}%"),
-                    )
-                )
+                query = query.filter(search_filter(
+                    q,
+                    Department.name,
+                    Department.description,
+                ))
 
             status = request.args.get('status')
             if status:
                 query = query.filter(Department.is_active == (status=="ACTIVE"))
                 
+            # 🔹 Full dump: stream NDJSON in batches instead of loading every row
+            if stream_requested():
+                return stream_ndjson(query, department_serializers, tenant_session)
+
             # 🔹 Apply pagination if both page and limit are provided
             if page is not None and limit is not None:
                 if page < 1: page = 1
                 if limit < 1: limit = 10
+                limit = min(limit, MAX_PAGE_SIZE)
                 query = query.offset((page - 1) * limit).limit(limit)
             else:
-                # Return all if pagination not provided
+                # No pagination requested: cap at MAX_PAGE_SIZE (use stream=true for a full dump)
                 page = 1
-                limit = total_records
+                limit = MAX_PAGE_SIZE
+                query = query.limit(limit)
 
             departments = query.all()
             result = department_serializers.dump(departments)
@@ -1,18 +1,11 @@
-import io
-import csv
-import pandas as pd
 import logging
-from flask import Response, send_file, request
+from flask import request, g, send_file
 from flask_jwt_extended import jwt_required
 from flask_restful import Resource
-from sqlalchemy import func, or_
 
-from Models.Department import Department
-from Models.Users import User
-from Models.UserType import UserType
-from Serializers.DepartmentSerializers import department_serializers
-from Serializers.UserSerializers import user_serializers
 from new import with_tenant_session_and_user
+from utils.export import EXPORTS, export_query, stream_export, CSV_MIMETYPE, XLSX_MIMETYPE
+from utils.export_jobs import submit_export, get_job, job_file_path, COMPLETED
 from utils.logger import log_activity
 
 logger = logging.getLogger(__name__)
@@ -27,121 +20,94 @@ class ExportResource(Resource):
         Export data from a table.
         Example:
             /api/export?type=departments&format=csv
-            /api/export?type=departments&format=excel
+            /api/export?type=orders&format=excel
+        Supported types: departments, users (optional user_type), orders, billing,
+        payments, medicine_stock.
         """
         try:
             table = request.args.get("type", "").lower()
             export_format = request.args.get("format", "csv").lower()
 
-            if table == "departments":
-                # 🔹 Fetch departments
-                departments = (
-                    tenant_session.query(Department)
-                    .filter_by(is_deleted=False)
-                    .order_by(Department.id)
-                    .all()
-                )
-                result = department_serializers.dump(departments)
-
-                if not result:
-                    return {"message": "No departments found to export."}, 404
-
-                # 🔹 Export as CSV
-                if export_format == "csv":
-                    output = io.StringIO()
-                    writer = csv.DictWriter(output, fieldnames=result[0].keys())
-                    writer.writeheader()
-                    writer.writerows(result)
-                    output.seek(0)
-
-                    log_activity("EXPORT_DEPARTMENTS_CSV", details={"count": len(result)})
-
-                    return Response(
-                        output,
-                        mimetype="text/csv",
-                        headers={
-                            "Content-Disposition": "attachment; filename=departments.csv"
-                        },
-                    )
-
-                # 🔹 Export as Excel
-                elif export_format == "excel":
-                    output = io.BytesIO()
-                    df = pd.DataFrame(result)
-                    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-                        df.to_excel(writer, index=False, sheet_name="Departments")
-                    output.seek(0)
-
-                    log_activity("EXPORT_DEPARTMENTS_EXCEL", details={"count": len(result)})
-
-                    return send_file(
-                        output,
-                        as_attachment=True,
-                        download_name="departments.xlsx",
-                        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    )
-
-                else:
-                    return {"message": "Invalid format. Use 'csv' or 'excel'."}, 400
-            if table == "users":
-                user_type = request.args.get("user_type", "").lower()
-                # 🔹 Fetch departments
-                users_query = tenant_session.query(User)
-                users_query = users_query.join(UserType)
-                if (user_type):
-                    users_query = users_query.filter(func.lower(UserType.type) == user_type)
-                users_query = (users_query
-                    .filter_by(is_deleted=False)
-                    .order_by(User.id)
-                    .all()
-                )
-                result = user_serializers.dump(users_query)
-
-                if not result:
-                    return {"message": "No users found to export."}, 404
-
-                # 🔹 Export as CSV
-                if export_format == "csv":
-                    output = io.StringIO()
-                    writer = csv.DictWriter(output, fieldnames=result[0].keys())
-                    writer.writeheader()
-                    writer.writerows(result)
-                    output.seek(0)
-
-                    log_activity(f"EXPORT_{user_type}_CSV", details={"count": len(result)})
-
-                    return Response(
-                        output,
-                        mimetype="text/csv",
-                        headers={
-                            f"Content-Disposition": "attachment; filename={user_type}.csv"
-                        },
-                    )
-
-                # 🔹 Export as Excel
-                elif export_format == "excel":
-                    output = io.BytesIO()
-                    df = pd.DataFrame(result)
-                    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-                        df.to_excel(writer, index=False, sheet_name="Departments")
-                    output.seek(0)
-
-                    log_activity(f"EXPORT_{user_type}_EXCEL", details={"count": len(result)})
-
-                    return send_file(
-                        output,
-                        as_attachment=True,
-                        download_name=f"{user_type}.xlsx",
-                        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    )
-
-                else:
-                    return {"message": "Invalid format. Use 'csv' or 'excel'."}, 400
-                    
-
-            else:
+            if table not in EXPORTS:
                 return {"message": "Invalid type or type not supported."}, 400
+            if export_format not in ("csv", "excel"):
+                return {"message": "Invalid format. Use 'csv' or 'excel'."}, 400
+
+            query, serializer, sheet_name = export_query(tenant_session, table, request.args)
+
+            # 🔹 Cheap existence check, rows themselves are streamed
+            if not tenant_session.query(query.exists()).scalar():
+                return {"message": f"No {table.replace('_', ' ')} found to export."}, 404
+
+            name = table
+            if table == "users" and request.args.get("user_type"):
+                name = request.args.get("user_type").lower()
+
+            log_activity(f"EXPORT_{name.upper()}_{export_format.upper()}")
+
+            return stream_export(query, serializer, sheet_name, export_format, name, tenant_session)
 
         except Exception as e:
             logger.exception("Error exporting data")
             return {"message": "Internal error occurred"}, 500
+
+    @with_tenant_session_and_user
+    def post(self, tenant_session, **kwargs):
+        """
+        Queue an export to run in the background. Takes the same `type`, `format` and
+        filter arguments as GET (query string or JSON body) and returns the job, whose
+        status is polled at /export/jobs/<job_id>.
+        """
+        try:
+            args = {**request.args.to_dict(), **(request.get_json(silent=True) or {})}
+            table = str(args.get("type", "")).lower()
+            export_format = str(args.get("format", "csv")).lower()
+
+            if table not in EXPORTS:
+                return {"message": "Invalid type or type not supported."}, 400
+            if export_format not in ("csv", "excel"):
+                return {"message": "Invalid format. Use 'csv' or 'excel'."}, 400
+
+            job = submit_export(g.account, table, export_format, args, user_id=g.user.get('id'))
+
+            log_activity(f"EXPORT_JOB_{table.upper()}_{export_format.upper()}", details=job["id"])
+
+            return {"message": "Export queued", "data": job}, 202
+
+        except Exception as e:
+            logger.exception("Error queueing export")
+            return {"message": "Internal error occurred"}, 500
+
+
+class ExportJobResource(Resource):
+    method_decorators = [jwt_required()]
+
+    @with_tenant_session_and_user
+    def get(self, tenant_session, job_id=None, **kwargs):
+        job = get_job(g.account["id"], job_id)
+        if not job:
+            return {"message": "Export job not found"}, 404
+        return {"data": job}, 200
+
+
+class ExportJobDownloadResource(Resource):
+    method_decorators = [jwt_required()]
+
+    @with_tenant_session_and_user
+    def get(self, tenant_session, job_id=None, **kwargs):
+        """Download a finished export. Range requests are honoured, so interrupted downloads can resume."""
+        job = get_job(g.account["id"], job_id)
+        if not job:
+            return {"message": "Export job not found"}, 404
+        if job["status"] != COMPLETED:
+            return {"message": f"Export is {job['status']}", "data": job}, 409
+
+        extension = job["filename"].rsplit(".", 1)[-1]
+        return send_file(
+            job_file_path(job),
+            as_attachment=True,
+            download_name=f"{job['type']}.{extension}",
+            mimetype=CSV_MIMETYPE if extension == "csv" else XLSX_MIMETYPE,
+            conditional=True,
+            etag=job["id"],
+        )
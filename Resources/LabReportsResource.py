@@ -1,7 +1,6 @@
 from flask import request
 from flask_jwt_extended import jwt_required
 from flask_restful import Resource
-from sqlalchemy import or_
 from sqlalchemy.exc import IntegrityError
 import logging
 
@@ -10,7 +9,9 @@ from Models.PurchaseTest import PurchaseTest
 from Serializers.LabReportSerializers import lab_report_serializer, lab_report_serializers
 from Serializers.PurchaseTestSerializers import purchase_test_serializer
 from new import with_tenant_session_and_user  # Tenant session decorator
+from utils.pagination import stream_requested, stream_ndjson, MAX_PAGE_SIZE
 from utils.logger import log_activity
+from utils.search import search_filter
 
 logger = logging.getLogger(__name__)
 
@@ -32,22 +33,27 @@ class LabReportsResource(Resource):
 
             q = request.args.get('q')
             if q:
-                query = query.filter(
-                    or_(
-                        LabReport.request_id.ilike(f"%{q}%"),
-                        LabReport.report_data.ilike(f"%{q}%"),
-                    )
-                )
+                query = query.filter(search_filter(
+                    q,
+                    LabReport.request_id,
+                    LabReport.report_data,
+                ))
+
+            # 🔹 Full dump: stream NDJSON in batches instead of loading every row
+            if stream_requested():
+                return stream_ndjson(query, lab_report_serializers, tenant_session)
 
             # 🔹 Apply pagination if both page and limit are provided
             if page is not None and limit is not None:
                 if page < 1: page = 1
                 if limit < 1: limit = 10
+                limit = min(limit, MAX_PAGE_SIZE)
                 query = query.offset((page - 1) * limit).limit(limit)
             else:
-                # Return all if pagination not provided
+                # No pagination requested: cap at MAX_PAGE_SIZE (use stream=true for a full dump)
                 page = 1
-                limit = total_records
+                limit = MAX_PAGE_SIZE
+                query = query.limit(limit)
 
             reports = query.all()
             result = lab_report_serializers.dump(reports)
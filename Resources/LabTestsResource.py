@@ -1,7 +1,7 @@
 from flask import request
 from flask_jwt_extended import jwt_required
 from flask_restful import Resource
-from sqlalchemy import or_, cast, String, func
+from sqlalchemy import or_, func
 from sqlalchemy.exc import IntegrityError
 import logging
 import json
@@ -9,7 +9,9 @@ import json
 from Models.LabTest import LabTest
 from Serializers.LabTestSerializers import lab_test_serializer, lab_test_serializers
 from new import with_tenant_session_and_user  # Tenant session decorator
+from utils.pagination import stream_requested, stream_ndjson, MAX_PAGE_SIZE
 from utils.logger import log_activity
+from utils.search import search_filter
 
 logger = logging.getLogger(__name__)
 
@@ -38,13 +40,12 @@ class LabTestsResource(Resource):
             
             q = request.args.get('q')
             if q:
-                query = query.filter(
-                    or_(
-                        LabTest.name.ilike(f"%{q}%"),
-                        LabTest.description.ilike(f"%{q}%"),
-                        cast(LabTest.price, String).ilike(f"%{q}%"),
-                    )
-                )
+                query = query.filter(search_filter(
+                    q,
+                    LabTest.name,
+                    LabTest.description,
+                    LabTest.price,
+                ))
             status = request.args.get('status')
             if status is not None and status != '':
                 print("status: ", status, status == 'true', status=='false')
@@ -55,15 +56,21 @@ class LabTestsResource(Resource):
                 )
 
 
+            # 🔹 Full dump: stream NDJSON in batches instead of loading every row
+            if stream_requested():
+                return stream_ndjson(query, lab_test_serializers, tenant_session)
+
             # 🔹 Apply pagination if both page and limit are provided
             if page is not None and limit is not None:
                 if page < 1: page = 1
                 if limit < 1: limit = 10
+                limit = min(limit, MAX_PAGE_SIZE)
                 query = query.offset((page - 1) * limit).limit(limit)
             else:
-                # Return all if pagination not provided
+                # No pagination requested: cap at MAX_PAGE_SIZE (use stream=true for a full dump)
                 page = 1
-                limit = total_records
+                limit = MAX_PAGE_SIZE
+                query = query.limit(limit)
 
             tests = query.all()
             result = lab_test_serializers.dump(tests)
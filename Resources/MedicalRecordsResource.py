@@ -1,7 +1,7 @@
 from flask import request
 from flask_jwt_extended import jwt_required
 from flask_restful import Resource
-from sqlalchemy import func, or_
+from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
 import logging
 
@@ -9,7 +9,10 @@ from Models.MedicalRecords import MedicalRecords
 from Models.Users import User
 from Serializers.MedicalRecordsSerializer import medical_records_serializers, medical_records_serializer
 from new import with_tenant_session_and_user
+from utils.pagination import keyset_requested, keyset_paginate, stream_requested, stream_ndjson, MAX_PAGE_SIZE
 from utils.logger import log_activity
+from utils.loader_plan import loader_plan
+from utils.search import search_filter
 
 logger = logging.getLogger(__name__)
 
@@ -32,24 +35,40 @@ class MedicalRecordsResource(Resource):
 
             q = request.args.get('q')
             if q:
-                query = query.filter(
-                    or_(
-                        MedicalRecords.notes.ilike(f"%{q}%"),
-                        User.name.ilike(f"%{q}%")
-                    )
-                )
-
-            # 🔹 Apply pagination if both page and limit are provided
-            if page is not None and limit is not None:
-                if page < 1: page = 1
-                if limit < 1: limit = 10
-                query = query.offset((page - 1) * limit).limit(limit)
+                query = query.filter(search_filter(
+                    q,
+                    MedicalRecords.notes,
+                    User.name,
+                ))
+
+            # 🔹 Eager-load everything the serializer nests
+            query = query.options(*loader_plan(medical_records_serializers))
+
+            # 🔹 Full dump: stream NDJSON in batches instead of loading every row
+            if stream_requested():
+                return stream_ndjson(query, medical_records_serializers, tenant_session)
+
+            if keyset_requested():
+                # 🔹 Keyset pagination (cursor / after_id), O(limit) at any depth
+                try:
+                    records, limit, next_cursor = keyset_paginate(query, MedicalRecords)
+                except ValueError as ve:
+                    return {"error": str(ve)}, 400
+                page = None
             else:
-                # Return all if pagination not provided
-                page = 1
-                limit = total_records
-
-            records = query.all()
+                next_cursor = None
+                # 🔹 Apply pagination if both page and limit are provided
+                if page is not None and limit is not None:
+                    if page < 1: page = 1
+                    if limit < 1: limit = 10
+                    limit = min(limit, MAX_PAGE_SIZE)
+                    query = query.offset((page - 1) * limit).limit(limit)
+                else:
+                    # No pagination requested: cap at MAX_PAGE_SIZE (use stream=true for a full dump)
+                    page = 1
+                    limit = MAX_PAGE_SIZE
+                    query = query.limit(limit)
+                records = query.all()
             result = medical_records_serializers.dump(records)
 
             # 🔹 Log activity
@@ -64,6 +83,7 @@ class MedicalRecordsResource(Resource):
                 "limit": limit,
                 "total_records": total_records,
                 "total_pages": (total_records + limit - 1) // limit if limit else 1,
+                "next_cursor": next_cursor,
                 "data": result
             }, 200
 
@@ -1,14 +1,15 @@
 from flask import request
 from flask_jwt_extended import jwt_required
 from flask_restful import Resource
-from sqlalchemy import or_
 from sqlalchemy.exc import IntegrityError
 import logging
 
 from Models.Medicine import Medicine
 from Serializers.MedicineSerializer import medicine_serializer, medicine_serializers
 from new import with_tenant_session_and_user
+from utils.pagination import stream_requested, stream_ndjson, MAX_PAGE_SIZE
 from utils.logger import log_activity
+from utils.search import search_filter
 
 logger = logging.getLogger(__name__)
 
@@ -30,23 +31,28 @@ class MedicineResource(Resource):
 
             q = request.args.get('q')
             if q:
-                query = query.filter(
-                    or_(
-                        Medicine.name.ilike(f"%{q}%"),
-                        Medicine.description.ilike(f"%{q}%"),
-                        Medicine.manufacturer.ilike(f"%{q}%"),
-                    )
-                )
+                query = query.filter(search_filter(
+                    q,
+                    Medicine.name,
+                    Medicine.description,
+                    Medicine.manufacturer,
+                ))
+
+            # 🔹 Full dump: stream NDJSON in batches instead of loading every row
+            if stream_requested():
+                return stream_ndjson(query, medicine_serializers, tenant_session)
 
             # 🔹 Apply pagination if both page and limit are provided
             if page is not None and limit is not None:
                 if page < 1: page = 1
                 if limit < 1: limit = 10
+                limit = min(limit, MAX_PAGE_SIZE)
                 query = query.offset((page - 1) * limit).limit(limit)
             else:
-                # Return all if pagination not provided
+                # No pagination requested: cap at MAX_PAGE_SIZE (use stream=true for a full dump)
                 page = 1
-                limit = total_records
+                limit = MAX_PAGE_SIZE
+                query = query.limit(limit)
 
             medicines = query.all()
             result = medicine_serializers.dump(medicines)
@@ -3,7 +3,6 @@ from flask_jwt_extended import jwt_required
 from flask_restful import Resource
 from sqlalchemy.exc import IntegrityError
 import logging
-from sqlalchemy import or_, cast, String
 
 from Models.MedicineStock import MedicineStock
 from Models.Medicine import Medicine
@@ -12,7 +11,9 @@ from Serializers.MedicineStockSerializer import (
     medicine_stock_serializers,
 )
 from new import with_tenant_session_and_user  # ✅ tenant session decorator
+from utils.pagination import stream_requested, stream_ndjson, MAX_PAGE_SIZE
 from utils.logger import log_activity
+from utils.search import search_filter
 
 logger = logging.getLogger(__name__)
 
@@ -35,25 +36,30 @@ class MedicineStockResource(Resource):
 
             q = request.args.get('q')
             if q:
-                query = query.filter(
-                    or_(
-                        Medicine.name.ilike(f"%{q}%"),
-                        cast(MedicineStock.quantity, String).ilike(f"%{q}%"),
-                        cast(MedicineStock.batch_no, String).ilike(f"%{q}%"),
-                        cast(MedicineStock.expiry_date, String).ilike(f"%{q}%"),
-                        cast(MedicineStock.price, String).ilike(f"%{q}%"),
-                    )
-                )
+                query = query.filter(search_filter(
+                    q,
+                    Medicine.name,
+                    MedicineStock.quantity,
+                    MedicineStock.batch_no,
+                    MedicineStock.expiry_date,
+                    MedicineStock.price,
+                ))
+
+            # 🔹 Full dump: stream NDJSON in batches instead of loading every row
+            if stream_requested():
+                return stream_ndjson(query, medicine_stock_serializers, tenant_session)
 
             # 🔹 Apply pagination if both page and limit provided
             if page is not None and limit is not None:
                 if page < 1: page = 1
                 if limit < 1: limit = 10
+                limit = min(limit, MAX_PAGE_SIZE)
                 query = query.offset((page - 1) * limit).limit(limit)
             else:
-                # Return all if pagination not provided
+                # No pagination requested: cap at MAX_PAGE_SIZE (use stream=true for a full dump)
                 page = 1
-                limit = total_records
+                limit = MAX_PAGE_SIZE
+                query = query.limit(limit)
 
             stocks = query.all()
             result = medicine_stock_serializers.dump(stocks)
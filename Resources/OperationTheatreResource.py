@@ -8,7 +8,10 @@ import logging
 from Models.OperationTheatre import OperationTheatre
 from Serializers.OperationTheatreSerializers import operation_theatre_serializer, operation_theatre_serializers
 from new import with_tenant_session_and_user
+from utils.aggregates import summarize, count_if
+from utils.pagination import stream_requested, stream_ndjson, MAX_PAGE_SIZE
 from utils.logger import log_activity
+from utils.search import search_filter
 
 logger = logging.getLogger(__name__)
 
@@ -27,25 +30,29 @@ class OperationTheatreResource(Resource):
 
             # 🔹 Base query
             query = tenant_session.query(OperationTheatre)
-            total_records = query.count()
-            available_theatres = query.filter(OperationTheatre.status == 'AVAILABLE').count()
-            under_maintenance_theatres = query.filter(OperationTheatre.status == 'UNDER_MAINTENANCE').count()
-            in_use_theatres = query.filter(OperationTheatre.status == 'IN_USE').count()
-            cleaning_theatres = query.filter(OperationTheatre.status == 'CLEANING').count()
-            active_theatres = query.filter(OperationTheatre.is_active == True).count()
-            out_of_service_theatres = query.filter(OperationTheatre.status == 'OUT_OF_SERVICE').count()
+            # 🔹 Status breakdown in a single pass
+            summary = summarize(
+                query,
+                total_records=count_if(),
+                available_theatres=count_if(OperationTheatre.status == 'AVAILABLE'),
+                under_maintenance_theatres=count_if(OperationTheatre.status == 'UNDER_MAINTENANCE'),
+                in_use_theatres=count_if(OperationTheatre.status == 'IN_USE'),
+                cleaning_theatres=count_if(OperationTheatre.status == 'CLEANING'),
+                active_theatres=count_if(OperationTheatre.is_active == True),
+                out_of_service_theatres=count_if(OperationTheatre.status == 'OUT_OF_SERVICE'),
+            )
+            total_records = summary["total_records"]
             q = request.args.get('q')
             if q:
-                query = query.filter(
-                    or_(
-                        OperationTheatre.name.ilike(f"%{q}%"),
-                        OperationTheatre.building.ilike(f"%{q}%"),
-                        OperationTheatre.floor.ilike(f"%{q}%"),
-                        OperationTheatre.wing.ilike(f"%{q}%"),
-                        OperationTheatre.room_number.ilike(f"%{q}%"),
-                        OperationTheatre.notes.ilike(f"%{q}%"),
-                    )
-                )
+                query = query.filter(search_filter(
+                    q,
+                    OperationTheatre.name,
+                    OperationTheatre.building,
+                    OperationTheatre.floor,
+                    OperationTheatre.wing,
+                    OperationTheatre.room_number,
+                    OperationTheatre.notes,
+                ))
             department = request.args.get('department')
             if department:
                 query = query.filter(
@@ -65,15 +72,21 @@ class OperationTheatreResource(Resource):
             page = request.args.get("page", type=int)
             limit = request.args.get("limit", type=int)
 
+            # 🔹 Full dump: stream NDJSON in batches instead of loading every row
+            if stream_requested():
+                return stream_ndjson(query, operation_theatre_serializers, tenant_session)
+
             # 🔹 Apply pagination if both page and limit provided
             if page is not None and limit is not None:
                 if page < 1: page = 1
                 if limit < 1: limit = 10
+                limit = min(limit, MAX_PAGE_SIZE)
                 query = query.offset((page - 1) * limit).limit(limit)
             else:
-                # Return all if pagination not provided
+                # No pagination requested: cap at MAX_PAGE_SIZE (use stream=true for a full dump)
                 page = 1
-                limit = total_records
+                limit = MAX_PAGE_SIZE
+                query = query.limit(limit)
 
             theatres = query.all()
             result = operation_theatre_serializers.dump(theatres)
@@ -85,12 +98,12 @@ class OperationTheatreResource(Resource):
                 "page": page,
                 "limit": limit,
                 "total_records": total_records,
-                "under_maintenance_theatres": under_maintenance_theatres,
-                "out_of_service_theatres": out_of_service_theatres,
-                "in_use_theatres": in_use_theatres,
-                "available_theatres": available_theatres,
-                "cleaning_theatres": cleaning_theatres,
-                "active_theatres": active_theatres,
+                "under_maintenance_theatres": summary["under_maintenance_theatres"],
+                "out_of_service_theatres": summary["out_of_service_theatres"],
+                "in_use_theatres": summary["in_use_theatres"],
+                "available_theatres": summary["available_theatres"],
+                "cleaning_theatres": summary["cleaning_theatres"],
+                "active_theatres": summary["active_theatres"],
                 "total_pages": (total_records + limit - 1) // limit if limit else 1,
                 "data": result
             }, 200
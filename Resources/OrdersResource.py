@@ -4,10 +4,8 @@ from decimal import Decimal
 from flask import request
 from flask_jwt_extended import jwt_required
 from flask_restful import Resource
-from sqlalchemy import or_, func
 from sqlalchemy.exc import IntegrityError
 import logging
-from sqlalchemy.orm import aliased
 
 from Models.Medicine import Medicine
 from Models.MedicineStock import MedicineStock
@@ -20,11 +18,15 @@ from Models.Prescriptions import Prescriptions
 from Models.Surgery import Surgery
 from Models.SurgeryType import SurgeryType
 from Models.Billing import Billing
-from Models.Users import User
 from Models.PurchaseOrder import PurchaseOrder
-from Serializers.OrdersSerializer import order_serializers, order_serializer
+from Serializers.OrdersSerializer import OrdersSerializer, order_serializers, order_serializer, order_fast_serializer
 from new import with_tenant_session_and_user
 from utils.logger import log_activity
+from utils.loader_plan import loader_plan
+from utils.fieldsets import sparse_serializers
+from utils.order_search import ORDER_TYPES, orders_query, order_search_filter, order_counters, has_items
+import utils.order_kind  # registers the flush listener keeping Orders.order_kind in sync
+from utils.pagination import keyset_requested, keyset_paginate, stream_requested, stream_ndjson, MAX_PAGE_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -43,153 +45,64 @@ class OrdersResource(Resource):
             # 🔹 Type filter
             order_type = request.args.get("order_type")  # 'medicine' | 'lab_test' | 'surgery' | 'prescription'
 
-            # 🔹 Base query
-            query = tenant_session.query(Orders).distinct()
-            query = query.join(User)
-            today_orders = 0
-            total_purchase_items = 0
-            total_in_progress_surgeries = 0
-            total_pending_surgeries = 0
-            total_completed_surgeries = 0
-            total_records = 0
-            total_pending_tests = 0
-
-            # 🔹 Strict Type Filtering: include only one type, exclude others
-            if order_type == 'medicine':
-                query = query.join(PurchaseOrder, Orders.id==PurchaseOrder.order_id)
-                query = query.join(Medicine, PurchaseOrder.medicine_id==Medicine.id)
-                query = query.filter(
-                    ~Orders.surgeries.any(),      # has surgeries
-                    Orders.medicines.any(),     # no medicines
-                    ~Orders.lab_tests.any()      # no lab tests
-                )
-                total_records = query.count()
-                today_orders = query.filter(Orders.received_date == func.current_date()).count()
-                total_purchase_items = total_purchase_items+(
-                    query.with_entities(func.coalesce(func.sum(PurchaseOrder.quantity), 0))
-                    .scalar()
-                )
-                q = request.args.get('q')
-                if q:
-                    query = query.filter(
-                        or_(
-                            User.email.ilike(f"%{q}%"),
-                            Orders.taken_by.ilike(f"{q}"),
-                            Orders.taken_by_phone_no.ilike(f"{q}"),
-                            Orders.taken_by_phone_no.ilike(f"{q}"),
-                            Medicine.name.ilike(f"{q}"),
-                        )
-                    )
-            elif order_type == 'lab_test':
-                query = query.join(PurchaseTest, Orders.id==PurchaseTest.order_id)
-                query = query.join(LabTest, LabTest.id==PurchaseTest.test_id)
-                query = query.filter(
-                    ~Orders.surgeries.any(),      # has surgeries
-                    ~Orders.medicines.any(),     # no medicines
-                    Orders.lab_tests.any()      # no lab tests
-                )
-                total_records = query.count()
-                today_orders = query.filter(Orders.received_date == func.current_date()).count()
-                total_purchase_items = total_purchase_items+(
-                    query.with_entities(func.count(PurchaseTest.id))
-                    .scalar()
-                )
-                total_pending_tests = total_pending_tests+(
-                    query.filter(PurchaseTest.result == None)
-                    .with_entities(func.count(PurchaseTest.id))
-                    .scalar()
-                )
-                q = request.args.get('q')
-                if q:
-                    query = query.filter(
-                        or_(
-                            User.email.ilike(f"%{q}%"),
-                            Orders.taken_by.ilike(f"{q}"),
-                            Orders.taken_by_phone_no.ilike(f"{q}"),
-                            Orders.taken_by_phone_no.ilike(f"{q}"),
-                            LabTest.name.ilike(f"{q}"),
-                        )
-                    )
-            elif order_type == 'surgery':
-                query = query.join(PurchaseSurgery, Orders.id==PurchaseSurgery.order_id)
-                query = query.join(SurgeryType, SurgeryType.id==PurchaseSurgery.surgery_type_id)
-                query = query.filter(
-                    Orders.surgeries.any(),      # has surgeries
-                    ~Orders.medicines.any(),     # no medicines
-                    ~Orders.lab_tests.any()      # no lab tests
-                )
-                today_orders = query.filter(Orders.received_date == func.current_date()).count()
-                total_records = query.count()
-                total_purchase_items = total_purchase_items+(
-                    query.with_entities(func.count(PurchaseSurgery.id))
-                    # query.with_entities(func.coalesce(PurchaseSurgecry))
-                    .scalar()
-                )
-                total_pending_surgeries = total_pending_surgeries+(
-                    query.filter(PurchaseSurgery.status == "SCHEDULED")
-                    .with_entities(func.count(PurchaseSurgery.id))
-                    .scalar()
-                )
-                total_in_progress_surgeries = total_in_progress_surgeries+(
-                    query.filter(PurchaseSurgery.status == "IN_PROGRESS")
-                    .with_entities(func.count(PurchaseSurgery.id))
-                    .scalar()
-                )
-                total_completed_surgeries = total_completed_surgeries+(
-                    query.filter(PurchaseSurgery.status == "COMPLETED")
-                    .with_entities(func.count(PurchaseSurgery.id))
-                    .scalar()
-                )
-                q = request.args.get('q')
+            if order_type is not None and order_type not in ORDER_TYPES:
+                return {"error": "Invalid type. Must be one of: medicine, lab_test, surgery, prescription"}, 400
+
+            # 🔹 Base query: one row per order, strict type filtering on order_kind
+            query = orders_query(tenant_session, order_type)
+
+            # 🔹 Counters (one aggregate query), skipped with summary=false
+            summary = request.args.get("summary", "true").lower() not in ("0", "false", "no")
+            counters = order_counters(query, order_type) if summary else None
+
+            if order_type == 'surgery':
                 status = request.args.get('status')
                 if status:
-                    query = query.filter(
-                        or_(
-                            PurchaseSurgery.status == status
-                        )
-                    )
-                if q:
-                    query = query.filter(
-                        or_(
-                            User.email.ilike(f"%{q}%"),
-                            Orders.taken_by.ilike(f"{q}"),
-                            Orders.taken_by_phone_no.ilike(f"{q}"),
-                            Orders.taken_by_phone_no.ilike(f"{q}"),
-                            SurgeryType.name.ilike(f"{q}"),
-                        )
-                    )
-            elif order_type == "prescription":
-                query = query.join(Prescriptions, Prescriptions.id==Orders.prescription_id)
-                Doctor = aliased(User)
-                query = query.join(Doctor, Doctor.id==Prescriptions.doctor_id)
-                today_orders = query.filter(Orders.received_date == func.current_date()).count()
-                total_records = query.count()
-                q = request.args.get('q')
-                if q:
-                    query = query.filter(
-                        or_(
-                            User.email.ilike(f"%{q}%"),
-                            Doctor.email.ilike(f"%{q}%"),
-                            Doctor.name.ilike(f"%{q}%"),
-                            Prescriptions.notes.ilike(f"%{q}%")
-                        )
-                    )
+                    query = query.filter(has_items(PurchaseSurgery, PurchaseSurgery.status == status))
 
-            elif order_type is not None:
-                return {"error": "Invalid type. Must be one of: medicine, lab_test, surgery, prescription"}, 400
+            # 🔹 Search
+            q = request.args.get('q')
+            if q and order_type is not None:
+                query = query.filter(order_search_filter(order_type, q))
+
+            # 🔹 Sparse fieldsets (fields= / include=) narrow both the SELECT and the output
+            try:
+                serializers, fast_serializer = sparse_serializers(OrdersSerializer, order_serializers, order_fast_serializer)
+            except ValueError as ve:
+                return {"error": str(ve)}, 400
+
+            # 🔹 Full dump: stream NDJSON in batches instead of loading every row
+            if stream_requested():
+                # 🔹 Eager-load everything the serializer nests
+                query = query.options(*loader_plan(serializers))
+                return stream_ndjson(query, serializers, tenant_session)
+
+            # 🔹 Page over ids only, the fast serializer reads the columns it dumps
+            query = query.with_entities(Orders.id, Orders.created_at)
 
             # 🔹 Pagination
-            if page is not None and limit is not None:
-                page = max(page, 1)
-                limit = max(limit, 1)
-                query = query.offset((page - 1) * limit).limit(limit)
+            if keyset_requested():
+                # 🔹 Keyset pagination (cursor / after_id), O(limit) at any depth
+                try:
+                    orders, limit, next_cursor = keyset_paginate(query, Orders)
+                except ValueError as ve:
+                    return {"error": str(ve)}, 400
+                page = None
             else:
-                page = 1
-                limit = total_records
+                next_cursor = None
+                if page is not None and limit is not None:
+                    page = max(page, 1)
+                    limit = min(max(limit, 1), MAX_PAGE_SIZE)
+                    query = query.offset((page - 1) * limit).limit(limit)
+                else:
+                    # No pagination requested: cap at MAX_PAGE_SIZE (use stream=true for a full dump)
+                    page = 1
+                    limit = MAX_PAGE_SIZE
+                    query = query.limit(limit)
 
-            # 🔹 Fetch and serialize results
-            orders = query.all()
-            result = order_serializers.dump(orders)
+                # 🔹 Fetch results
+                orders = query.all()
+            result = fast_serializer.dump_ids(tenant_session, [row.id for row in orders])
 
             # 🔹 Activity log
             log_activity("GET_ORDERS", details=json.dumps({
@@ -199,19 +112,17 @@ class OrdersResource(Resource):
                 "type": order_type
             }))
 
-            return {
+            response = {
                 "page": page,
                 "limit": limit,
-                "today_orders": today_orders,
-                "total_purchase_items": total_purchase_items,
-                "total_pending_tests": total_pending_tests,
-                "total_in_progress_surgeries": total_in_progress_surgeries,
-                "total_pending_surgeries": total_pending_surgeries,
-                "total_completed_surgeries": total_completed_surgeries,
-                "total_records": total_records,
-                "total_pages": (total_records + limit - 1) // limit if limit else 1,
+                "next_cursor": next_cursor,
                 "data": result
-            }, 200
+            }
+            if counters is not None:
+                total_records = counters["total_records"]
+                response.update(counters)
+                response["total_pages"] = (total_records + limit - 1) // limit if limit else 1
+            return response, 200
 
         except Exception as e:
             logger.exception("Error fetching orders")
@@ -0,0 +1,75 @@
+from flask import request
+from flask_jwt_extended import jwt_required
+from flask_restful import Resource
+from sqlalchemy import func, or_
+import logging
+
+from new import with_tenant_session_and_user
+from Models.SearchEntries import SearchEntry
+from utils.pagination import MAX_PAGE_SIZE
+from utils.search import ESCAPE, escape_like
+from utils.search_index import ENTITY_TYPES
+
+logger = logging.getLogger(__name__)
+
+MIN_QUERY_LENGTH = 2
+
+
+class SearchResource(Resource):
+    method_decorators = [jwt_required()]
+
+    @with_tenant_session_and_user
+    def get(self, tenant_session, **kwargs):
+        """
+        Unified search across users, orders and appointments of a tenant.
+        Query params: q (required), types=user,order,appointment, limit.
+        Hits are ranked by trigram similarity to `q`.
+        """
+        try:
+            q = (request.args.get('q') or '').strip().lower()
+            if len(q) < MIN_QUERY_LENGTH:
+                return {"error": f"'q' must be at least {MIN_QUERY_LENGTH} characters"}, 400
+
+            types = [t.strip() for t in request.args.get('types', '').split(',') if t.strip()]
+            unknown = set(types) - set(ENTITY_TYPES)
+            if unknown:
+                return {"error": f"Unknown types: {', '.join(sorted(unknown))}"}, 400
+
+            limit = request.args.get("limit", default=20, type=int)
+            if limit < 1: limit = 20
+            limit = min(limit, MAX_PAGE_SIZE)
+
+            # 🔹 ILIKE is served by the trigram indexes, similarity() ranks the matches
+            pattern = f"%{escape_like(q)}%"
+            score = func.greatest(
+                func.similarity(SearchEntry.search_text, q),
+                func.similarity(func.coalesce(SearchEntry.patient_name, ''), q),
+            ).label("score")
+            query = tenant_session.query(SearchEntry, score).filter(or_(
+                SearchEntry.search_text.ilike(pattern, escape=ESCAPE),
+                SearchEntry.patient_name.ilike(pattern, escape=ESCAPE),
+            ))
+            if types:
+                query = query.filter(SearchEntry.entity_type.in_(types))
+
+            hits = query.order_by(score.desc(), SearchEntry.updated_at.desc()).limit(limit).all()
+
+            return {
+                "query": q,
+                "data": [
+                    {
+                        "type": entry.entity_type,
+                        "id": entry.entity_id,
+                        "title": entry.title,
+                        "subtitle": entry.subtitle,
+                        "patient_id": entry.patient_id,
+                        "patient_name": entry.patient_name,
+                        "score": round(float(entry_score), 4),
+                    }
+                    for entry, entry_score in hits
+                ],
+            }, 200
+
+        except Exception:
+            logger.exception("Error running search")
+            return {"error": "Internal error occurred"}, 500
@@ -1,7 +1,6 @@
 from flask import request
 from flask_jwt_extended import jwt_required
 from flask_restful import Resource
-from sqlalchemy import or_
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 import logging
@@ -12,7 +11,9 @@ from Models.SurgeryType import SurgeryType
 from Models.Users import User
 from Serializers.SurgerySerializers import surgery_serializer, surgery_serializers
 from new import with_tenant_session_and_user
+from utils.pagination import stream_requested, stream_ndjson, MAX_PAGE_SIZE
 from utils.logger import log_activity
+from utils.search import search_filter
 
 logger = logging.getLogger(__name__)
 
@@ -41,23 +42,29 @@ class SurgeryResource(Resource):
 
             q = request.args.get('q')
             if q:
-                query = query.filter(
-                    or_(
-                        SurgeryType.name.ilike(f"%{q}%"),
-                        User.name.ilike(f"%{q}%"),
-                    )
-                )
+                query = query.filter(search_filter(
+                    q,
+                    SurgeryType.name,
+                    User.name,
+                ))
 
             total_records = query.count()
 
+            # 🔹 Full dump: stream NDJSON in batches instead of loading every row
+            if stream_requested():
+                return stream_ndjson(query, surgery_serializers, tenant_session)
+
             # 🔹 Apply pagination if both page and limit provided
             if page is not None and limit is not None:
                 if page < 1: page = 1
                 if limit < 1: limit = 10
+                limit = min(limit, MAX_PAGE_SIZE)
                 query = query.offset((page - 1) * limit).limit(limit)
             else:
+                # No pagination requested: cap at MAX_PAGE_SIZE (use stream=true for a full dump)
                 page = 1
-                limit = total_records
+                limit = MAX_PAGE_SIZE
+                query = query.limit(limit)
 
             surgeries = query.all()
             result = surgery_serializers.dump(surgeries)
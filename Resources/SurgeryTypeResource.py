@@ -9,7 +9,9 @@ from sqlalchemy.exc import IntegrityError
 from Models.SurgeryType import SurgeryType
 from Serializers.SurgeryTypeSerializers import surgery_type_serializer, surgery_type_serializers
 from new import with_tenant_session_and_user
+from utils.pagination import stream_requested, stream_ndjson, MAX_PAGE_SIZE
 from utils.logger import log_activity
+from utils.search import search_filter
 
 logger = logging.getLogger(__name__)
 
@@ -36,11 +38,10 @@ class SurgeryTypeResource(Resource):
 
             q = request.args.get('q')
             if q:
-                query = query.filter(
-                    or_(
-                        SurgeryType.name.ilike(f"%{q}%"),
-                    )
-                )
+                query = query.filter(search_filter(
+                    q,
+                    SurgeryType.name,
+                ))
             department = request.args.get('department')
             if department:
                 print("")
@@ -52,15 +53,21 @@ class SurgeryTypeResource(Resource):
 
             total_records = query.count()
 
+            # 🔹 Full dump: stream NDJSON in batches instead of loading every row
+            if stream_requested():
+                return stream_ndjson(query, surgery_type_serializers, tenant_session)
+
             # 🔹 Apply pagination only if both page and limit are provided
             if page is not None and limit is not None:
                 if page < 1: page = 1
                 if limit < 1: limit = 10
+                limit = min(limit, MAX_PAGE_SIZE)
                 query = query.offset((page - 1) * limit).limit(limit)
             else:
-                # If pagination not provided, return all
+                # No pagination requested: cap at MAX_PAGE_SIZE (use stream=true for a full dump)
                 page = 1
-                limit = total_records
+                limit = MAX_PAGE_SIZE
+                query = query.limit(limit)
 
             surgery_types = query.all()
             result = surgery_type_serializers.dump(surgery_types)
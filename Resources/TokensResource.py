@@ -1,9 +1,11 @@
-from flask import request
+import json
+
+from flask import request, g, Response, stream_with_context
 from flask_jwt_extended import jwt_required
 from flask_restful import Resource
-from sqlalchemy import or_, cast, String
+from sqlalchemy import or_
 from sqlalchemy.exc import IntegrityError
-from datetime import datetime
+from datetime import date, datetime
 import logging
 
 from sqlalchemy.orm import aliased
@@ -12,6 +14,11 @@ from Models.Tokens import Token
 from Models.Users import User
 from Serializers.TokenSerializers import TokenSerializers, TokenSerializerz
 from new import with_tenant_session_and_user
+from utils.aggregates import summarize, count_if
+from utils.pagination import keyset_requested, keyset_paginate, stream_requested, stream_ndjson, MAX_PAGE_SIZE
+from utils.loader_plan import loader_plan
+from utils.search import search_filter
+from utils.token_queue import token_queues
 
 logger = logging.getLogger(__name__)
 
@@ -51,52 +58,74 @@ class TokenResource(Resource):
                 .outerjoin(Doctor, Token.doctor_id == Doctor.id)  # 👈 use LEFT JOIN instead of INNER
                 .filter(or_(Doctor.is_deleted.is_(False), Doctor.id.is_(None)))  # include tokens without a doctor
             )
-            total_records = query.count()
-            scheduled_records = query.filter(Token.status == 'Alloted').count()
-            completed_records = query.filter(Token.status == 'Completed').count()
-            confirmed_records = query.filter(Token.status == 'Confirmed').count()
-            pending_records = query.filter(Token.status == 'Pending').count()
+            # 🔹 Status breakdown in a single pass
+            summary = summarize(
+                query,
+                total_records=count_if(),
+                alloted_records=count_if(Token.status == 'Alloted'),
+                completed_records=count_if(Token.status == 'Completed'),
+                confirmed_records=count_if(Token.status == 'Confirmed'),
+                pending_records=count_if(Token.status == 'Pending'),
+            )
+            total_records = summary["total_records"]
             # 🔹 Pagination params
             page = request.args.get("page", type=int)
             limit = request.args.get("limit", type=int)
             q = request.args.get('q')
             if q:
-                query = query.filter(
-                    or_(
-                        Doctor.name.ilike(f"%{q}%"),
-                        Doctor.email.ilike(f"%{q}%"),
-                        Patient.name.ilike(f"%{q}%"),
-                        Patient.email.ilike(f"%{q}%"),
-                        cast(Token.token_number, String).ilike(f"%{q}%"),
-                    )
-                )
+                query = query.filter(search_filter(
+                    q,
+                    Doctor.name,
+                    Doctor.email,
+                    Patient.name,
+                    Patient.email,
+                    Token.token_number,
+                ))
             if status:
                 query = query.filter(Token.status == status)
 
 
-            # 🔹 Apply pagination only if both page and limit are provided
-            if page is not None and limit is not None:
-                if page < 1: page = 1
-                if limit < 1: limit = 10
-                query = query.offset((page - 1) * limit).limit(limit)
-            else:
-                # Return all tokens if pagination not provided
-                page = 1
-                limit = total_records
+            # 🔹 Eager-load everything the serializer nests
+            query = query.options(*loader_plan(TokenSerializers))
+
+            # 🔹 Full dump: stream NDJSON in batches instead of loading every row
+            if stream_requested():
+                return stream_ndjson(query, TokenSerializers, tenant_session)
 
-            tokens = query.all()
+            if keyset_requested():
+                # 🔹 Keyset pagination (cursor / after_id), O(limit) at any depth
+                try:
+                    tokens, limit, next_cursor = keyset_paginate(query, Token)
+                except ValueError as ve:
+                    return {"error": str(ve)}, 400
+                page = None
+            else:
+                next_cursor = None
+                # 🔹 Apply pagination only if both page and limit are provided
+                if page is not None and limit is not None:
+                    if page < 1: page = 1
+                    if limit < 1: limit = 10
+                    limit = min(limit, MAX_PAGE_SIZE)
+                    query = query.offset((page - 1) * limit).limit(limit)
+                else:
+                    # No pagination requested: cap at MAX_PAGE_SIZE (use stream=true for a full dump)
+                    page = 1
+                    limit = MAX_PAGE_SIZE
+                    query = query.limit(limit)
+                tokens = query.all()
             result = TokenSerializers.dump(tokens, many=True)
 
             # 🔹 Structured response
             return {
                 "page": page,
                 "limit": limit,
-                "alloted_records": scheduled_records,
-                "completed_records": completed_records,
-                "confirmed_records": confirmed_records,
-                "pending_records": pending_records,
+                "alloted_records": summary["alloted_records"],
+                "completed_records": summary["completed_records"],
+                "confirmed_records": summary["confirmed_records"],
+                "pending_records": summary["pending_records"],
                 "total_records": total_records,
                 "total_pages": (total_records + limit - 1) // limit if limit else 1,
+                "next_cursor": next_cursor,
                 "data": result
             }, 200
 
@@ -188,3 +217,71 @@ class TokenResource(Resource):
     #         tenant_session.rollback()
     #         logger.exception("Error deleting token")
     #         return {"error": "Internal error occurred"}, 500
+
+
+# Seconds between SSE keep-alive comments while a queue is idle
+QUEUE_HEARTBEAT = 15
+
+
+def _queue_args():
+    """(department_id, day) of the queue a display asks for; day is None for "today"."""
+    department_id = request.args.get("department_id", type=int)
+    day = request.args.get("date")
+    if day:
+        day = datetime.strptime(day, "%Y-%m-%d").date()
+    return department_id, day
+
+
+class TokenQueueResource(Resource):
+    method_decorators = [jwt_required()]
+
+    # ✅ GET current queue state (now serving, next tokens, counts by status)
+    @with_tenant_session_and_user
+    def get(self, tenant_session, **kwargs):
+        try:
+            try:
+                department_id, day = _queue_args()
+            except ValueError:
+                return {"error": "Invalid date format. Use YYYY-MM-DD"}, 400
+
+            return token_queues.snapshot(tenant_session, g.account["id"], department_id, day or date.today()), 200
+
+        except Exception:
+            logger.exception("Error fetching token queue")
+            return {"error": "Internal error occurred"}, 500
+
+
+class TokenQueueEventsResource(Resource):
+    method_decorators = [jwt_required()]
+
+    # ✅ GET Server-Sent Events stream of queue states, pushed on every token change
+    @with_tenant_session_and_user
+    def get(self, tenant_session, **kwargs):
+        try:
+            department_id, day = _queue_args()
+        except ValueError:
+            return {"error": "Invalid date format. Use YYYY-MM-DD"}, 400
+        account_id = g.account["id"]
+
+        def generate():
+            # Runs after the view returns: the session is only used to (re)load the
+            # queue and is closed between loads so no connection is held while idle.
+            version = None
+            try:
+                while True:
+                    state = token_queues.wait(tenant_session, account_id, department_id,
+                                              day or date.today(), version, QUEUE_HEARTBEAT)
+                    tenant_session.close()
+                    if state["version"] == version:
+                        yield ": keep-alive\n\n"
+                        continue
+                    version = state["version"]
+                    yield f"id: {version}\nevent: queue\ndata: {json.dumps(state)}\n\n"
+            finally:
+                tenant_session.close()
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
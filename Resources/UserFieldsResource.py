@@ -2,7 +2,6 @@ from aniso8601.builders.python import year_range_check
 from flask import request
 from flask_jwt_extended import jwt_required
 from flask_restful import Resource
-from sqlalchemy import or_
 from sqlalchemy.exc import IntegrityError
 import logging
 
@@ -11,6 +10,7 @@ from Models.UserExtraFields import UserExtraFields
 from Models.Users import User
 from Serializers.UserFieldSerializers import user_field_serializers, user_field_serializer
 from new import with_tenant_session_and_user
+from utils.search import search_filter
 
 logger = logging.getLogger(__name__)
 
@@ -26,20 +26,19 @@ class UserFieldsResource(Resource):
             field_name = request.args.get("name")
             query = tenant_session.query(UserField).filter_by(is_deleted=False)
             if field_name:
-                query = query.filter(UserField.name.ilike(f"%{field_name}%"))
+                query = query.filter(UserField.field_name.ilike(f"%{field_name}%"))
 
             # 🔹 Pagination params (optional)
             page = request.args.get("page", type=int)
             limit = request.args.get("limit", type=int)
             q = request.args.get('q')
             if q:
-                query = query.filter(
-                    or_(
-                        UserField.field_name.ilike(f"%{q}%"),
-                        UserField.field_type.ilike(f"%{q}%"),
-                        UserField.is_mandatory.ilike(f"%{q}%"),
-                    )
-                )
+                query = query.filter(search_filter(
+                    q,
+                    UserField.field_name,
+                    UserField.field_type,
+                    UserField.is_mandatory,
+                ))
 
             total_records = query.count()
 
@@ -1,7 +1,6 @@
 from flask import request
 from flask_jwt_extended import jwt_required
 from flask_restful import Resource
-from sqlalchemy import or_
 from sqlalchemy.exc import IntegrityError
 import logging
 
@@ -10,6 +9,7 @@ from Models.Users import User
 from Serializers.UserTypeSerializer import user_type_serializers, user_type_serializer
 from new import with_tenant_session_and_user
 from extentions import db
+from utils.search import search_filter
 
 logger = logging.getLogger(__name__)
 
@@ -29,12 +29,11 @@ class UserTypesResource(Resource):
 
             q = request.args.get('q')
             if q:
-                query = query.filter(
-                    or_(
-                        UserType.name.ilike(f"%{q}%"),
-                        UserType.description.ilike(f"%{q}%"),
-                    )
-                )
+                query = query.filter(search_filter(
+                    q,
+                    UserType.type,
+                    UserType.description,
+                ))
 
             total_records = query.count()
 
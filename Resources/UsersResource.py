@@ -5,7 +5,7 @@ from datetime import datetime, timedelta
 from flask import request, g
 from flask_jwt_extended import jwt_required
 from flask_restful import Resource
-from sqlalchemy import func, or_
+from sqlalchemy import func, and_, true
 from sqlalchemy.exc import IntegrityError
 from werkzeug.security import generate_password_hash
 
@@ -13,9 +13,15 @@ from Models.UserExtraFields import UserExtraFields
 from Models.UserField import UserField
 from Models.UserType import UserType
 from Models.Users import User
-from Serializers.UserSerializers import user_serializers, user_serializer
+from Serializers.UserSerializers import UserSchema, user_serializers, user_serializer, user_fast_serializer
 from new import with_tenant_session_and_user
+from utils.aggregates import summarize, count_if
+from utils.pagination import keyset_requested, keyset_paginate, stream_requested, stream_ndjson, MAX_PAGE_SIZE
+from utils.principal_cache import invalidate_principal, revoke_tokens, PRINCIPAL_FIELDS
 from utils.utils import send_email
+from utils.loader_plan import loader_plan
+from utils.fieldsets import sparse_serializers
+from utils.search import search_filter
 
 
 # ---------------------------------------
@@ -71,62 +77,88 @@ class UsersResource(Resource):
             # Join with user type
             query = query.join(UserType)
 
-            # Count summaries
-            patient_users_count = query.filter(func.upper(UserType.type) == 'PATIENT').count()
-            doctor_users_count = query.filter(func.upper(UserType.type) == 'DOCTOR').count()
-            nurse_users_count = query.filter(func.upper(UserType.type) == 'NURSE').count()
-            staff_users_count = query.filter(~func.upper(UserType.type).in_(['NURSE', 'DOCTOR', 'PATIENT'])).count()
+            base_query = query
+            type_filter = true()
+            search_clause = true()
 
             # Filter by requested user_type
             if req_user_type:
-                query = query.filter(func.upper(UserType.type) == req_user_type.upper())
-
-            active_records = query.filter_by(is_active=True).count()
-            recently_added_records = query.filter(
-                User.is_deleted == False,
-                User.created_at >= seven_days_ago
-            ).count()
+                type_filter = func.upper(UserType.type) == req_user_type.upper()
+                query = query.filter(type_filter)
 
             # Search
             if q:
-                query = query.filter(
-                    or_(
-                        User.name.ilike(f"%{q}%"),
-                        User.email.ilike(f"%{q}%"),
-                        User.username.ilike(f"%{q}%")
-                    )
-                )
-
-            total_records = query.count()
+                search_clause = search_filter(q, User.name, User.email, User.username)
+                query = query.filter(search_clause)
+
+            # Count summaries, all in one pass over the base query
+            summary = summarize(
+                base_query,
+                patient_users_count=count_if(func.upper(UserType.type) == 'PATIENT'),
+                doctor_users_count=count_if(func.upper(UserType.type) == 'DOCTOR'),
+                nurse_users_count=count_if(func.upper(UserType.type) == 'NURSE'),
+                staff_users_count=count_if(~func.upper(UserType.type).in_(['NURSE', 'DOCTOR', 'PATIENT'])),
+                active_records=count_if(and_(type_filter, User.is_active == True)),
+                recently_added_records=count_if(and_(type_filter, User.created_at >= seven_days_ago)),
+                total_records=count_if(and_(type_filter, search_clause)),
+            )
+            total_records = summary["total_records"]
+
+            # 🔹 Sparse fieldsets (fields= / include=) narrow both the SELECT and the output
+            try:
+                serializers, fast_serializer = sparse_serializers(UserSchema, user_serializers, user_fast_serializer)
+            except ValueError as ve:
+                return {"message": str(ve)}, 400
+
+            # 🔹 Full dump: stream NDJSON in batches instead of loading every row
+            if stream_requested():
+                # 🔹 Eager-load everything the serializer nests
+                query = query.options(*loader_plan(serializers))
+                return stream_ndjson(query, serializers, tenant_session)
+
+            # 🔹 Page over ids only, the fast serializer reads the columns it dumps
+            query = query.with_entities(User.id, User.created_at)
 
             # Pagination
-            page = request.args.get("page")
-            limit = request.args.get("limit")
-            if page is not None and limit is not None:
-                if page < 1: page = 1
-                if limit < 1: limit = 10
-                query = query.offset((page - 1) * limit).limit(limit)
+            if keyset_requested():
+                # Keyset pagination (cursor / after_id), O(limit) at any depth
+                try:
+                    users, limit, next_cursor = keyset_paginate(query, User)
+                except ValueError as ve:
+                    return {"message": str(ve)}, 400
+                page = None
             else:
-                # If pagination not provided, return all
-                page = 1
-                limit = total_records
+                page = request.args.get("page", type=int)
+                limit = request.args.get("limit", type=int)
+                if page is not None and limit is not None:
+                    if page < 1: page = 1
+                    if limit < 1: limit = 10
+                    limit = min(limit, MAX_PAGE_SIZE)
+                    query = query.offset((page - 1) * limit).limit(limit)
+                else:
+                    # No pagination requested: cap at MAX_PAGE_SIZE (use stream=true for a full dump)
+                    page = 1
+                    limit = MAX_PAGE_SIZE
+                    query = query.limit(limit)
 
-            users = query.all() 
+                next_cursor = None
+                users = query.all() 
 
             # Response
             return {
                 "page": page,
                 "limit": limit,
-                "recently_added": recently_added_records,
+                "recently_added": summary["recently_added_records"],
                 "total_records": total_records,
-                "patient_users_count": patient_users_count,
-                "doctor_users_count": doctor_users_count,
-                "nurse_users_count": nurse_users_count,
-                "staff_users_count": staff_users_count,
-                "active_records": active_records,
-                "inactive_records": total_records - active_records,
+                "patient_users_count": summary["patient_users_count"],
+                "doctor_users_count": summary["doctor_users_count"],
+                "nurse_users_count": summary["nurse_users_count"],
+                "staff_users_count": summary["staff_users_count"],
+                "active_records": summary["active_records"],
+                "inactive_records": total_records - summary["active_records"],
                 "total_pages": (total_records + limit - 1) // limit,
-                "data": user_serializers.dump(users)
+                "next_cursor": next_cursor,
+                "data": fast_serializer.dump_ids(tenant_session, [row.id for row in users])
             }, 200
 
         except Exception as e:
@@ -196,12 +228,17 @@ class UsersResource(Resource):
             user = tenant_session.query(User).get(user_id)
             if not user:
                 return {"message": "User not found"}, 404
+            previous_username = user.username
 
             # Update user fields
             for key, value in json_data.items():
-                if hasattr(user, key) and key not in ["extra_fields", "id"]:
+                if hasattr(user, key) and key not in ["extra_fields", "id", "token_version"]:
                     setattr(user, key, value)
 
+            # Tokens embedding the old identity, role or status stop being trusted
+            if any(key in json_data for key in PRINCIPAL_FIELDS):
+                revoke_tokens(user)
+
             # Handle extra fields
             extra_fields_data = json_data.get('extra_fields', {})
             if extra_fields_data:
@@ -212,6 +249,7 @@ class UsersResource(Resource):
                     tenant_session.add(UserExtraFields(user_id=user.id, fields_data=extra_fields_data))
 
             tenant_session.commit()
+            invalidate_principal(g.account["id"], previous_username, user.username)
             return user_serializer.dump(user), 200
 
         except Exception as e:
@@ -236,7 +274,9 @@ class UsersResource(Resource):
 
             user.is_deleted = True
             user.is_active = False
+            revoke_tokens(user)
             tenant_session.commit()
+            invalidate_principal(g.account["id"], user.username)
 
             return {"message": "User deleted successfully"}, 200
 
@@ -1,9 +1,8 @@
 import json
 from datetime import datetime
-from flask import request
+from flask import request, g
 from flask_jwt_extended import jwt_required
 from flask_restful import Resource
-from sqlalchemy import or_, cast, String
 from sqlalchemy.exc import IntegrityError
 import logging
 
@@ -16,9 +15,23 @@ from Serializers.BillingSerializers import billing_serializer
 from Serializers.WardBedsSerializers import ward_beds_serializers, ward_beds_serializer
 from new import with_tenant_session_and_user
 from utils.logger import log_activity
+from utils.loader_plan import loader_plan
+from utils.search import search_filter
+from utils.bed_allocation import allocate_bed, release_bed, free_beds_by_ward, BedUnavailable
 
 logger = logging.getLogger(__name__)
 
+
+def bill_stay(tenant_session, bed_id, patient_id, price, admission_date):
+    """Bill a discharged patient for the days (at least one) spent in the bed."""
+    duration_days = max((datetime.utcnow() - admission_date).days, 1)
+    Billing.tenant_session = tenant_session
+    billing = Billing(bed_id=bed_id, patient_id=patient_id, total_amount=float(price or 0) * duration_days)
+    tenant_session.add(billing)
+    tenant_session.flush()
+    return billing
+
+
 class WardBedsResource(Resource):
     method_decorators = [jwt_required()]
 
@@ -49,14 +62,13 @@ class WardBedsResource(Resource):
 
             q = request.args.get('q')
             if q:
-                query = query.filter(
-                    or_(
-                        cast(WardBeds.bed_no, String).ilike(f"%{q}%"),
-                        User.name.ilike(f"%{q}%"),
-                        # WardBeds.patient_id.ilike(f"%{q}%"),
-                        Ward.name.ilike(f"%{q}%"),
-                    )
-                )
+                query = query.filter(search_filter(
+                    q,
+                    WardBeds.bed_no,
+                    User.name,
+                    # WardBeds.patient_id,
+                    Ward.name,
+                ))
 
             status = request.args.get('status')
             if status:
@@ -77,6 +89,9 @@ class WardBedsResource(Resource):
             if limit < 1:
                 limit = 10
 
+            # 🔹 Eager-load everything the serializer nests
+            query = query.options(*loader_plan(ward_beds_serializers))
+
             # 🔹 Apply pagination
             ward_beds = query.offset((page - 1) * limit).limit(limit).all()
             result = ward_beds_serializers.dump(ward_beds)
@@ -156,18 +171,12 @@ class WardBedsResource(Resource):
                 json_data["patient_id"] = None
                 json_data["admission_date"] = None
 
-                price = float(old_data.get("price", 0))
                 try:
                     admission_date = datetime.strptime(old_data.get("admission_date"), "%Y-%m-%dT%H:%M:%S")
-                    duration_days = max((datetime.utcnow() - admission_date).days, 1)
-                    total_price = price * duration_days
                 except Exception as date_err:
                     return {"error": f"Invalid admission date: {date_err}"}, 400
 
-                Billing.tenant_session = tenant_session
-                billing = Billing(bed_id=ward_id, patient_id=ward_bed.patient_id, total_amount=total_price)
-                tenant_session.add(billing)
-                tenant_session.flush()
+                bill_stay(tenant_session, ward_id, patient_id, old_data.get("price", 0), admission_date)
 
                 # BillingBeds.tenant_session = tenant_session
                 # billing_bed = BillingBeds(
@@ -227,3 +236,90 @@ class WardBedsResource(Resource):
             tenant_session.rollback()
             logger.exception("Error deleting ward bed")
             return {"error": "Internal error occurred"}, 500
+
+
+class BedAllocationResource(Resource):
+    method_decorators = [jwt_required()]
+
+    # ✅ POST admit a patient to a free bed (a given bed_id, or any free bed of ward_id)
+    @with_tenant_session_and_user
+    def post(self, tenant_session, **kwargs):
+        try:
+            json_data = request.get_json(force=True)
+            if not json_data:
+                return {"error": "No input data provided"}, 400
+
+            patient_id = json_data.get("patient_id")
+            ward_id = json_data.get("ward_id")
+            bed_id = json_data.get("bed_id")
+            if not patient_id:
+                return {"error": "patient_id is required"}, 400
+            if not (ward_id or bed_id):
+                return {"error": "ward_id or bed_id is required"}, 400
+            if not tenant_session.query(User.id).filter(User.id == patient_id).first():
+                return {"error": "Patient not found"}, 404
+
+            ward_bed = allocate_bed(tenant_session, patient_id, ward_id=ward_id, bed_id=bed_id)
+            tenant_session.commit()
+
+            result = ward_beds_serializer.dump(ward_bed)
+            log_activity("ALLOCATE_WARD_BED", details=json.dumps(result))
+            return result, 201
+
+        except BedUnavailable as bu:
+            tenant_session.rollback()
+            return {"error": str(bu)}, 409
+        except ValueError as ve:
+            tenant_session.rollback()
+            return {"error": str(ve)}, 400
+        except Exception:
+            tenant_session.rollback()
+            logger.exception("Error allocating ward bed")
+            return {"error": "Internal error occurred"}, 500
+
+    # ✅ DELETE discharge the patient from a bed and bill the stay
+    @with_tenant_session_and_user
+    def delete(self, tenant_session, **kwargs):
+        try:
+            bed_id = request.args.get("id", type=int)
+            if not bed_id:
+                return {"error": "Ward bed ID is required"}, 400
+
+            released = release_bed(tenant_session, bed_id)
+            if released is None:
+                return {"error": "Ward bed not found or not occupied"}, 404
+
+            ward_bed, patient_id, admission_date = released
+            billing = bill_stay(tenant_session, ward_bed.id, patient_id, ward_bed.price,
+                                admission_date or datetime.utcnow())
+            tenant_session.commit()
+
+            result = ward_beds_serializer.dump(ward_bed)
+            log_activity("RELEASE_WARD_BED", details=json.dumps({"bed": result, "patient_id": patient_id}))
+            return {"bed": result, "billing": billing_serializer.dump(billing)}, 200
+
+        except Exception:
+            tenant_session.rollback()
+            logger.exception("Error releasing ward bed")
+            return {"error": "Internal error occurred"}, 500
+
+
+class BedAvailabilityResource(Resource):
+    method_decorators = [jwt_required()]
+
+    # ✅ GET free beds per ward
+    @with_tenant_session_and_user
+    def get(self, tenant_session, **kwargs):
+        try:
+            tally = free_beds_by_ward(tenant_session, g.account["id"])
+            ward_id = request.args.get("ward_id", type=int)
+            if ward_id:
+                return {"ward_id": ward_id, "available_beds": tally.get(ward_id, 0)}, 200
+            return {
+                "total_available_beds": sum(tally.values()),
+                "data": [{"ward_id": ward, "available_beds": count} for ward, count in sorted(tally.items())],
+            }, 200
+
+        except Exception:
+            logger.exception("Error fetching bed availability")
+            return {"error": "Internal error occurred"}, 500
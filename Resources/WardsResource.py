@@ -2,7 +2,6 @@ import json
 from flask import request
 from flask_jwt_extended import jwt_required
 from flask_restful import Resource
-from sqlalchemy import or_, cast, String
 from sqlalchemy.exc import IntegrityError
 import logging
 
@@ -11,6 +10,9 @@ from Models.Wards import Ward
 from Serializers.WardSerializer import ward_serializer, ward_serializers
 from new import with_tenant_session_and_user
 from utils.logger import log_activity
+from utils.loader_plan import loader_plan
+from utils.search import search_filter
+from utils.bed_allocation import count_beds, provision_beds, retire_beds, renumber_beds
 
 logger = logging.getLogger(__name__)
 
@@ -32,19 +34,21 @@ class WardsResource(Resource):
 
             q = request.args.get("q")
             if q:
-                query = query.filter(
-                    or_(
-                        Ward.name.ilike(f"%{q}%"),
-                        Ward.ward_type.ilike(f"%{q}%"),
-                        cast(Ward.capacity, String).ilike(f"%{q}%"),
-                        Ward.email.ilike(f"%{q}%"),
-                    )
-                )
+                query = query.filter(search_filter(
+                    q,
+                    Ward.name,
+                    Ward.ward_type,
+                    Ward.capacity,
+                    Ward.email,
+                ))
 
             total_records = query.count()
             page = request.args.get("page", type=int) or 1
             limit = request.args.get("limit", type=int) or (total_records if total_records > 0 else 1)
 
+            # 🔹 Eager-load everything the serializer nests
+            query = query.options(*loader_plan(ward_serializers))
+
             wards = query.offset((page - 1) * limit).limit(limit).all()
             result = ward_serializers.dump(wards)
 
@@ -74,14 +78,8 @@ class WardsResource(Resource):
             tenant_session.add(ward)
             tenant_session.flush()  # get ward.id
 
-            # Create beds
-            WardBeds.tenant_session = tenant_session
-            for bed_no in range(1, ward.capacity + 1):
-                bed = WardBeds(
-                    ward_id=ward.id,
-                    bed_no=f"{ward.name}-{bed_no}"
-                )
-                tenant_session.add(bed)
+            # Create beds (one multi-row INSERT)
+            provision_beds(tenant_session, ward, 1, ward.capacity)
 
             tenant_session.commit()
             log_activity("CREATE_WARD", details=json.dumps(ward_serializer.dump(ward)))
@@ -121,33 +119,18 @@ class WardsResource(Resource):
                 if hasattr(ward, key):
                     setattr(ward, key, value)
 
-            # Adjust beds if capacity changed
-            WardBeds.tenant_session = tenant_session
-            current_bed_count = tenant_session.query(WardBeds).filter_by(ward_id=ward_id).count()
+            # Adjust beds if capacity changed (set-based: one INSERT or one UPDATE)
+            current_bed_count = count_beds(tenant_session, ward.id)
             if ward.capacity > current_bed_count:
                 # Add new beds
-                for bed_no in range(current_bed_count + 1, ward.capacity + 1):
-                    bed = WardBeds(
-                        ward_id=ward.id,
-                        bed_no=f"{ward.name}-{bed_no}"
-                    )
-                    tenant_session.add(bed)
+                provision_beds(tenant_session, ward, current_bed_count + 1, ward.capacity)
             elif ward.capacity < current_bed_count:
-                # Remove unoccupied beds if capacity decreased
-                unoccupied_beds = tenant_session.query(WardBeds)\
-                    .filter(WardBeds.ward_id == ward_id, WardBeds.patient_id.is_(None))\
-                    .order_by(WardBeds.bed_no.desc()).all()
-                beds_to_remove = current_bed_count - ward.capacity
-                if len(unoccupied_beds) < beds_to_remove:
-                    raise ValueError("Cannot reduce capacity: not enough unoccupied beds")
-                for bed in unoccupied_beds[:beds_to_remove]:
-                    tenant_session.delete(bed)
+                # Retire unoccupied beds if capacity decreased
+                retire_beds(tenant_session, ward.id, current_bed_count - ward.capacity)
 
             # Update bed names if ward name changed
             if 'name' in json_data and json_data['name'] != old_name:
-                beds = tenant_session.query(WardBeds).filter_by(ward_id=ward_id).order_by(WardBeds.id).all()
-                for idx, bed in enumerate(beds, start=1):
-                    bed.bed_no = f"{ward.name}-{idx}"
+                renumber_beds(tenant_session, ward)
 
             tenant_session.commit()
             log_activity(
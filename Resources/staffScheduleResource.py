@@ -2,18 +2,35 @@ import json
 import logging
 from datetime import datetime
 
-from flask import request, current_app
+from flask import request, current_app, g
 from flask_jwt_extended import jwt_required
 from flask_restful import Resource
 from sqlalchemy.orm import joinedload
 
 from Models.staffSchedule import StaffSchedule, Schedule
+from Models.UserType import UserType
+from Models.Users import User
 from new import with_tenant_session_and_user
 from utils.logger import log_activity
+from utils.search import search_filter
+from utils.staff_availability import free_busy, find_overlaps
 
 logger = logging.getLogger(__name__)
 
 
+def _overlap_error(items):
+    """409 response when schedule items of one staff member overlap, else None."""
+    overlaps = find_overlaps([(item.start_time, item.end_time, index) for index, item in enumerate(items)])
+    if not overlaps:
+        return None
+    return {
+        "error": "Schedule items overlap",
+        "conflicts": [
+            {"first": items[first].title, "second": items[second].title} for first, second in overlaps
+        ],
+    }, 409
+
+
 class StaffScheduleResource(Resource):
     method_decorators = [jwt_required()]
 
@@ -99,6 +116,11 @@ class StaffScheduleResource(Resource):
                         notes=item_data.get("notes")
                     ))
 
+                # 🔹 Reject overlapping items before writing anything
+                overlap_error = _overlap_error(schedule_items)
+                if overlap_error:
+                    return overlap_error
+
                 staff_schedule.items = schedule_items
 
                 tenant_session.add(staff_schedule)
@@ -180,6 +202,12 @@ class StaffScheduleResource(Resource):
                         notes=item_data.get("notes")
                     ))
 
+            # 🔹 Reject overlapping items before writing anything
+            overlap_error = _overlap_error(schedule_items)
+            if overlap_error:
+                tenant_session.rollback()
+                return overlap_error
+
             staff_schedule.items = schedule_items
 
             tenant_session.add(staff_schedule)
@@ -208,3 +236,45 @@ class StaffScheduleResource(Resource):
             tenant_session.rollback()
             current_app.logger.error(e)
             return {"error": f"An internal error occurred: {e}"}, 500
+
+
+class StaffAvailabilityResource(Resource):
+    method_decorators = [jwt_required()]
+
+    @with_tenant_session_and_user
+    def get(self, tenant_session, **kwargs):
+        """
+        Free/busy staff for a time window, in one call.
+        Query params: start, end (HH:MM, required), staff_ids=1,2,3 and/or
+        user_type (e.g. doctor) to narrow the staff considered.
+        """
+        try:
+            try:
+                start_time = datetime.strptime(request.args.get('start', ''), '%H:%M').time()
+                end_time = datetime.strptime(request.args.get('end', ''), '%H:%M').time()
+            except ValueError:
+                return {"error": "'start' and 'end' are required, format HH:MM"}, 400
+
+            staff_ids = None
+            if request.args.get('staff_ids'):
+                try:
+                    staff_ids = {int(staff_id) for staff_id in request.args['staff_ids'].split(',') if staff_id.strip()}
+                except ValueError:
+                    return {"error": "'staff_ids' must be a comma-separated list of ids"}, 400
+
+            user_type = request.args.get('user_type')
+            if user_type:
+                typed_ids = {
+                    staff_id for staff_id, in tenant_session.query(User.id)
+                    .join(UserType, UserType.id == User.user_type_id)
+                    .filter(search_filter(user_type, UserType.type), ~User.is_deleted)
+                }
+                staff_ids = typed_ids if staff_ids is None else staff_ids & typed_ids
+
+            result = free_busy(tenant_session, g.account["id"], start_time, end_time, staff_ids)
+            result.update({"start": start_time.strftime('%H:%M'), "end": end_time.strftime('%H:%M')})
+            return result, 200
+
+        except Exception as e:
+            current_app.logger.error(e)
+            return {"error": "Internal Server Error"}, 500
@@ -8,6 +8,7 @@ from Models.BillingTests import BillingTests
 from Serializers.UserSerializers import UserSchema
 from Serializers.OrdersSerializer import OrdersSerializer
 from Serializers.WardBedsSerializers import WardBedsSerializer
+from utils.fast_serializer import FastSerializer
 
 class BillingMedicineSerializer(ma.SQLAlchemyAutoSchema):
     class Meta:
@@ -62,3 +63,4 @@ class BillingSerializer(ma.SQLAlchemyAutoSchema):
 
 billing_serializer = BillingSerializer()
 billing_serializers = BillingSerializer(many=True)
+billing_fast_serializer = FastSerializer(billing_serializers)
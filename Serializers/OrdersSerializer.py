@@ -5,6 +5,7 @@ from Serializers.PrescriptionSerializers import prescription_serializer
 from Serializers.PurchaseTestSerializers import purchase_test_serializer
 from Serializers.PurchaseSurgerySerializers import purchase_surgery_serializer
 from extentions import ma
+from utils.fast_serializer import FastSerializer
 
 class OrdersSerializer(ma.SQLAlchemyAutoSchema):
     user = ma.Nested(user_serializer, dump_only=True)
@@ -12,6 +13,7 @@ class OrdersSerializer(ma.SQLAlchemyAutoSchema):
     medicines = ma.Nested(purchase_order_serializer, many=True, dump_only=True)
     lab_tests = ma.Nested(purchase_test_serializer, many=True, dump_only=True) 
     surgeries = ma.Nested(purchase_surgery_serializer, many=True, dump_only=True) 
+    order_kind = ma.auto_field(dump_only=True)
 
     class Meta:
         model = Orders
@@ -20,3 +22,4 @@ class OrdersSerializer(ma.SQLAlchemyAutoSchema):
 
 order_serializer = OrdersSerializer()
 order_serializers = OrdersSerializer(many=True)
+order_fast_serializer = FastSerializer(order_serializers)
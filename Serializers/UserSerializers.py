@@ -5,6 +5,7 @@ from Models.UserExtraFields import UserExtraFields
 from Models.Users import User
 from Serializers.DepartmentSerializers import DepartmentSerializer
 from Serializers.UserTypeSerializer import UserTypeSerializer
+from utils.fast_serializer import FastSerializer
 
 
 class UserExtraFieldsSchema(SQLAlchemyAutoSchema):
@@ -22,6 +23,8 @@ class UserSchema(SQLAlchemyAutoSchema):
         model = User
         load_instance = True
         include_fk = True
+        exclude = ("token_version",)
 
 user_serializer = UserSchema()
 user_serializers = UserSchema(many=True)
+user_fast_serializer = FastSerializer(user_serializers)
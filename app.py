@@ -22,6 +22,10 @@ def create_app():
     app.config['MAIL_PASSWORD'] = os.environ.get('MAIL_PASSWORD')
     app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY')
     app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(days=1)
+    # Embed the user principal in login tokens so requests can skip the user lookup.
+    # Bump JWT_CLAIMS_VERSION to force every outstanding token back to the database.
+    app.config['JWT_EMBED_TENANT_CLAIMS'] = os.environ.get('JWT_EMBED_TENANT_CLAIMS', '').lower() in ('1', 'true', 'yes')
+    app.config['JWT_CLAIMS_VERSION'] = int(os.environ.get('JWT_CLAIMS_VERSION', 1))
 
     print(os.environ.get('MASTER_DATABASE_URL'))
     configure_routes(api)
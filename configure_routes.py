@@ -12,7 +12,7 @@ from Resources.MedicineStockResource import MedicineStockResource
 from Resources.OperationTheatreResource import OperationTheatreResource
 from Resources.OrdersResource import OrdersResource
 # from Resources.PrescriptionMedicineResource import PrescriptionMedicinesResource
-from Resources.ExportResource import ExportResource
+from Resources.ExportResource import ExportResource, ExportJobResource, ExportJobDownloadResource
 # from Resources.PurchaseOrdersResource import PurchaseOrdersResource
 # from Resources.SurgeryDoctorResource import SurgeryDoctorResource
 from Resources.SurgeryResource import SurgeryResource
@@ -20,15 +20,16 @@ from Resources.SurgeryTypeResource import SurgeryTypeResource
 from Resources.UserFieldsResource import UserFieldsResource
 from Resources.UserTypesResource import UserTypesResource
 from Resources.UsersResource import UsersResource
-from Resources.WardBedsResource import WardBedsResource
+from Resources.WardBedsResource import WardBedsResource, BedAllocationResource, BedAvailabilityResource
 from Resources.WardsResource import WardsResource
 from Resources.AppointmentsResource import AppointmentsResource
-from Resources.TokensResource import TokenResource
+from Resources.TokensResource import TokenResource, TokenQueueResource, TokenQueueEventsResource
 # from Resources.EmergenciesResource import EmergencyResource
 from Resources.StatsResource import StatsResource
+from Resources.SearchResource import SearchResource
 # from Resources.PrescriptionResource import PrescriptionResource
 from Resources.BillingResource import BillingResource
-from Resources.staffScheduleResource import StaffSchedule, StaffScheduleResource
+from Resources.staffScheduleResource import StaffSchedule, StaffScheduleResource, StaffAvailabilityResource
 
 
 def configure_routes(api):
@@ -47,8 +48,12 @@ def configure_routes(api):
     api.add_resource(LabReportsResource, f'{base_path}/lab-reports')
     api.add_resource(WardsResource, f'{base_path}/wards')
     api.add_resource(WardBedsResource, f'{base_path}/ward-beds')
+    api.add_resource(BedAllocationResource, f'{base_path}/ward-beds/allocation')
+    api.add_resource(BedAvailabilityResource, f'{base_path}/ward-beds/availability')
     api.add_resource(AppointmentsResource, f'{base_path}/appointment')
     api.add_resource(TokenResource, f'{base_path}/tokens')
+    api.add_resource(TokenQueueResource, f'{base_path}/tokens/queue')
+    api.add_resource(TokenQueueEventsResource, f'{base_path}/tokens/queue/events')
     # api.add_resource(PrescriptionResource, f'{base_path}/prescriptions')
     api.add_resource(BillingResource, f'{base_path}/billing')
     api.add_resource(AuthResource, f'{base_path}/login')
@@ -59,7 +64,11 @@ def configure_routes(api):
     # api.add_resource(SurgeryDoctorResource, f'{base_path}/surgery-doctor')
     api.add_resource(ActivityLogsResource, f'{base_path}/activity-logs')
     api.add_resource(ExportResource, f'{base_path}/export')
+    api.add_resource(ExportJobResource, f'{base_path}/export/jobs/<string:job_id>')
+    api.add_resource(ExportJobDownloadResource, f'{base_path}/export/jobs/<string:job_id>/download')
     api.add_resource(StatsResource, f'{base_path}/stats')
+    api.add_resource(SearchResource, f'{base_path}/search')
     # api.add_resource(EmergencyResource, f'{base_path}/emergencies')
     api.add_resource(AccountInfoResource, '/account-info')
     api.add_resource(StaffScheduleResource, f'{base_path}/staff-schedule')
+    api.add_resource(StaffAvailabilityResource, f'{base_path}/staff-schedule/availability')
@@ -0,0 +1,46 @@
+"""added order search indexes
+
+Revision ID: 3f8d2b6c1a94
+Revises: d41a7c3e9b25
+Create Date: 2026-10-18 19:02:33.560417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f8d2b6c1a94'
+down_revision = 'd41a7c3e9b25'
+branch_labels = None
+depends_on = None
+
+
+# Case-insensitive exact matches: lower(col) = :q (utils.order_search)
+LOWER_COLUMNS = {
+    'orders': ['taken_by', 'taken_by_phone_no'],
+    'medicine': ['name'],
+    'lab_test': ['name'],
+    'surgery_types': ['name'],
+}
+
+# Order item tables, probed by the correlated EXISTS type and search filters
+ORDER_ITEM_TABLES = ['purchase_order', 'purchase_test', 'purchase_surgery']
+
+
+def upgrade():
+    for table, columns in LOWER_COLUMNS.items():
+        for column in columns:
+            op.create_index(f'ix_{table}_{column}_lower', table, [sa.text(f'lower({column})')], unique=False)
+
+    for table in ORDER_ITEM_TABLES:
+        op.create_index(op.f(f'ix_{table}_order_id'), table, ['order_id'], unique=False)
+
+
+def downgrade():
+    for table in ORDER_ITEM_TABLES:
+        op.drop_index(op.f(f'ix_{table}_order_id'), table_name=table)
+
+    for table, columns in LOWER_COLUMNS.items():
+        for column in columns:
+            op.drop_index(f'ix_{table}_{column}_lower', table_name=table)
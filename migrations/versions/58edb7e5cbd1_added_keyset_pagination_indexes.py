@@ -0,0 +1,38 @@
+"""added keyset pagination indexes
+
+Revision ID: 58edb7e5cbd1
+Revises: a7566e450c84
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '58edb7e5cbd1'
+down_revision = 'a7566e450c84'
+branch_labels = None
+depends_on = None
+
+
+KEYSET_TABLES = {
+    'orders': 'ix_orders_created_at_id',
+    'activity_logs': 'ix_activity_logs_created_at_id',
+    'billing': 'ix_billing_created_at_id',
+    'medical_records': 'ix_medical_records_created_at_id',
+    'Token': 'ix_token_created_at_id',
+    'appointment': 'ix_appointment_created_at_id',
+    'payments': 'ix_payments_created_at_id',
+    'user': 'ix_user_created_at_id',
+}
+
+
+def upgrade():
+    for table, index in KEYSET_TABLES.items():
+        op.create_index(index, table, ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    for table, index in KEYSET_TABLES.items():
+        op.drop_index(index, table_name=table)
@@ -0,0 +1,24 @@
+"""added user token version
+
+Revision ID: 5b9d2e7f4a13
+Revises: e1f7b3a9c652
+Create Date: 2026-10-19 09:12:37.540218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b9d2e7f4a13'
+down_revision = 'e1f7b3a9c652'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('user', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    op.drop_column('user', 'token_version')
@@ -0,0 +1,46 @@
+"""added orders order_kind
+
+Revision ID: 7b5e0a9d4c18
+Revises: 3f8d2b6c1a94
+Create Date: 2026-10-18 19:40:51.207734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b5e0a9d4c18'
+down_revision = '3f8d2b6c1a94'
+branch_labels = None
+depends_on = None
+
+
+# Same classification as utils.order_kind.order_kind_expression
+BACKFILL = """
+UPDATE orders o SET order_kind = CASE
+    WHEN m AND NOT t AND NOT s THEN 'medicine'
+    WHEN NOT m AND t AND NOT s THEN 'lab_test'
+    WHEN NOT m AND NOT t AND s THEN 'surgery'
+    WHEN m OR t OR s THEN 'mixed'
+END
+FROM (
+    SELECT id,
+           EXISTS (SELECT 1 FROM purchase_order WHERE order_id = orders.id) AS m,
+           EXISTS (SELECT 1 FROM purchase_test WHERE order_id = orders.id) AS t,
+           EXISTS (SELECT 1 FROM purchase_surgery WHERE order_id = orders.id) AS s
+    FROM orders
+) items
+WHERE items.id = o.id
+"""
+
+
+def upgrade():
+    op.add_column('orders', sa.Column('order_kind', sa.String(length=20), nullable=True))
+    op.execute(BACKFILL)
+    op.create_index('ix_orders_order_kind_created_at_id', 'orders', ['order_kind', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_orders_order_kind_created_at_id', table_name='orders')
+    op.drop_column('orders', 'order_kind')
@@ -0,0 +1,36 @@
+"""made created_at not null
+
+Revision ID: 8e4a6c1d9f70
+Revises: 5b9d2e7f4a13
+Create Date: 2026-10-19 09:48:02.315876
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4a6c1d9f70'
+down_revision = '5b9d2e7f4a13'
+branch_labels = None
+depends_on = None
+
+
+# Keyset pagination orders by (created_at, id); rows without created_at were never
+# returned and broke cursors. Undated rows take their last update time, else the epoch.
+BACKFILL = {
+    'activity_logs': "UPDATE activity_logs SET created_at = 'epoch' WHERE created_at IS NULL",
+    'orders': "UPDATE orders SET created_at = COALESCE(updated_at, 'epoch') WHERE created_at IS NULL",
+    'medical_records': "UPDATE medical_records SET created_at = COALESCE(updated_at, 'epoch') WHERE created_at IS NULL",
+}
+
+
+def upgrade():
+    for table, backfill in BACKFILL.items():
+        op.execute(backfill)
+        op.alter_column(table, 'created_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade():
+    for table in reversed(list(BACKFILL)):
+        op.alter_column(table, 'created_at', existing_type=sa.DateTime(), nullable=True)
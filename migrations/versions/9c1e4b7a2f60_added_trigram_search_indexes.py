@@ -0,0 +1,64 @@
+"""added trigram search indexes
+
+Revision ID: 9c1e4b7a2f60
+Revises: 58edb7e5cbd1
+Create Date: 2026-10-18 17:05:12.402871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c1e4b7a2f60'
+down_revision = '58edb7e5cbd1'
+branch_labels = None
+depends_on = None
+
+
+# table -> text columns searched with ILIKE '%q%'
+TRIGRAM_COLUMNS = {
+    'user': ['name', 'email', 'username'],
+    'activity_logs': ['action', 'details', 'ip_address'],
+    'billing': ['notes'],
+    'payments': ['transaction_ref'],
+    'medical_records': ['notes'],
+    'medicine': ['name', 'manufacturer', 'description'],
+    'medicine_stock': ['batch_no'],
+    'prescriptions': ['notes'],
+}
+
+# Integer columns searched as text; the expression must match CAST(col AS VARCHAR)
+# emitted by utils.search.search_filter. Date/float casts are not immutable, so those
+# searches are left unindexed.
+TRIGRAM_EXPRESSIONS = {
+    'ix_activity_logs_user_id_trgm': ('activity_logs', 'user_id'),
+    'ix_medicine_stock_quantity_trgm': ('medicine_stock', 'quantity'),
+    'ix_token_token_number_trgm': ('Token', 'token_number'),
+}
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    for table, columns in TRIGRAM_COLUMNS.items():
+        for column in columns:
+            op.create_index(
+                f'ix_{table}_{column}_trgm', table, [column], unique=False,
+                postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'},
+            )
+
+    for index, (table, column) in TRIGRAM_EXPRESSIONS.items():
+        op.create_index(
+            index, table, [sa.text(f'(CAST({column} AS VARCHAR)) gin_trgm_ops')], unique=False,
+            postgresql_using='gin',
+        )
+
+
+def downgrade():
+    for index, (table, column) in TRIGRAM_EXPRESSIONS.items():
+        op.drop_index(index, table_name=table)
+
+    for table, columns in TRIGRAM_COLUMNS.items():
+        for column in columns:
+            op.drop_index(f'ix_{table}_{column}_trgm', table_name=table)
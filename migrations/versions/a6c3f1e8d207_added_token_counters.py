@@ -0,0 +1,36 @@
+"""added token counters
+
+Revision ID: a6c3f1e8d207
+Revises: 7b5e0a9d4c18
+Create Date: 2026-10-18 20:14:09.881342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6c3f1e8d207'
+down_revision = '7b5e0a9d4c18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('token_counters',
+    sa.Column('department_key', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('token_date', sa.Date(), nullable=False),
+    sa.Column('last_number', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('department_key', 'token_date')
+    )
+    # Continue today's (and future) queues from the highest number already issued
+    op.execute("""
+        INSERT INTO token_counters (department_key, token_date, last_number)
+        SELECT COALESCE(department_id, 0), CAST(appointment_date AS DATE), MAX(token_number)
+        FROM "Token"
+        GROUP BY 1, 2
+    """)
+
+
+def downgrade():
+    op.drop_table('token_counters')
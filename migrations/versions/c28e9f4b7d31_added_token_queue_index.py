@@ -0,0 +1,24 @@
+"""added token queue index
+
+Revision ID: c28e9f4b7d31
+Revises: a6c3f1e8d207
+Create Date: 2026-10-18 20:52:17.640925
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c28e9f4b7d31'
+down_revision = 'a6c3f1e8d207'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_token_department_id_appointment_date', 'Token', ['department_id', 'appointment_date'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_token_department_id_appointment_date', table_name='Token')
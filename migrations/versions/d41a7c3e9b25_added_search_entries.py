@@ -0,0 +1,80 @@
+"""added search entries
+
+Revision ID: d41a7c3e9b25
+Revises: 9c1e4b7a2f60
+Create Date: 2026-10-18 18:21:40.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41a7c3e9b25'
+down_revision = '9c1e4b7a2f60'
+branch_labels = None
+depends_on = None
+
+
+# Backfill; the documents must match the ones built by utils.search_index
+BACKFILL = [
+    """
+    INSERT INTO search_entries (entity_type, entity_id, title, subtitle, search_text, patient_id, patient_name, updated_at)
+    SELECT 'user', u.id, u.name, u.email,
+           lower(concat_ws(' ', u.name, u.username, u.email, u.phone_no)),
+           u.id, u.name, now()
+    FROM "user" u
+    WHERE NOT u.is_deleted
+    """,
+    """
+    INSERT INTO search_entries (entity_type, entity_id, title, subtitle, search_text, patient_id, patient_name, updated_at)
+    SELECT 'order', o.id, 'Order #' || o.id, o.taken_by,
+           lower(concat_ws(' ', 'order', o.id, o.taken_by, o.taken_by_phone_no)),
+           o.user_id, u.name, now()
+    FROM orders o
+    LEFT JOIN "user" u ON u.id = o.user_id
+    """,
+    """
+    INSERT INTO search_entries (entity_type, entity_id, title, subtitle, search_text, patient_id, patient_name, updated_at)
+    SELECT 'appointment', a.id, 'Appointment ' || to_char(a.appointment_date, 'YYYY-MM-DD'), a.status,
+           lower(concat_ws(' ', 'appointment', to_char(a.appointment_date, 'YYYY-MM-DD'), a.status, a.reason)),
+           a.patient_id, u.name, now()
+    FROM appointment a
+    LEFT JOIN "user" u ON u.id = a.patient_id
+    WHERE NOT a.is_deleted
+    """,
+]
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    op.create_table('search_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entity_type', sa.String(length=30), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('subtitle', sa.String(length=255), nullable=True),
+    sa.Column('search_text', sa.Text(), nullable=False),
+    sa.Column('patient_id', sa.Integer(), nullable=True),
+    sa.Column('patient_name', sa.String(length=100), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('entity_type', 'entity_id', name='uq_search_entries_entity')
+    )
+    op.create_index('ix_search_entries_patient_id', 'search_entries', ['patient_id'], unique=False)
+    for column in ('search_text', 'patient_name'):
+        op.create_index(
+            f'ix_search_entries_{column}_trgm', 'search_entries', [column], unique=False,
+            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+    for statement in BACKFILL:
+        op.execute(statement)
+
+
+def downgrade():
+    op.drop_index('ix_search_entries_patient_name_trgm', table_name='search_entries')
+    op.drop_index('ix_search_entries_search_text_trgm', table_name='search_entries')
+    op.drop_index('ix_search_entries_patient_id', table_name='search_entries')
+    op.drop_table('search_entries')
@@ -0,0 +1,28 @@
+"""added ward beds available index
+
+Revision ID: e1f7b3a9c652
+Revises: c28e9f4b7d31
+Create Date: 2026-10-18 21:30:44.093518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1f7b3a9c652'
+down_revision = 'c28e9f4b7d31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Partial index over free beds only (utils.bed_allocation.BED_IS_FREE)
+    op.create_index(
+        'ix_ward_beds_available', 'ward_beds', ['ward_id', 'id'], unique=False,
+        postgresql_where=sa.text("status = 'AVAILABLE' AND patient_id IS NULL AND is_active AND NOT is_deleted"),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_ward_beds_available', table_name='ward_beds')
@@ -1,27 +1,23 @@
 from functools import wraps
 
-from flask import request, g
-from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
-from Models.AccountInfo import AccountInfo
-from Models.Users import User
-from Serializers.UserSerializers import user_serializer
-from extentions import db
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from flask import request, g, current_app
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity, get_jwt
+from utils.account_cache import get_account
+from utils.principal_cache import load_principal, principal_from_claims
+from utils.tenant_engines import tenant_engines
 
 def with_tenant_session_and_user(f):
     @wraps(f)
     def decorated_function(self, account_uid, *args, **kwargs):
         # 1️⃣ Get account info
         print(account_uid)
-        account = db.session.query(AccountInfo).filter_by(id=account_uid).one_or_none()
+        account = get_account(account_uid)
         if not account:
             return {"message": "Account not found"}, 404
+        g.account = account
 
-        # 2️⃣ Create tenant engine and session
-        tenant_engine = create_engine(account.db_uri)
-        TenantSession = sessionmaker(bind=tenant_engine)
-        tenant_session = TenantSession()
+        # 2️⃣ Get a session from the tenant's pooled engine
+        tenant_session = tenant_engines.get_session(account["id"], account["db_uri"])
 
         try:
             if not request.url.__contains__("/login"):
@@ -30,10 +26,13 @@ def with_tenant_session_and_user(f):
                 if not username:
                     return {"message": "Invalid or expired token"}, 401
 
-                # 4️⃣ Get user from tenant DB
-                user = tenant_session.query(User).filter_by(username=username).first()
-
-                user = user_serializer.dump(user)
+                # 4️⃣ Get user principal from the token claims, else (cached) from tenant DB
+                user = None
+                if current_app.config.get('JWT_EMBED_TENANT_CLAIMS'):
+                    user = principal_from_claims(get_jwt(), tenant_session, account["id"],
+                                                 current_app.config.get('JWT_CLAIMS_VERSION'))
+                if not user:
+                    user = load_principal(tenant_session, account["id"], username)
                 g.user = user
 
                 print(user)
@@ -48,5 +47,4 @@ def with_tenant_session_and_user(f):
 
         finally:
             tenant_session.close()
-            tenant_engine.dispose()
     return decorated_function
@@ -0,0 +1,103 @@
+"""
+Row builders for tests. Each one commits, because model validators look related
+rows up through their own session.
+"""
+from datetime import date
+from itertools import count
+
+from Models.Billing import Billing
+from Models.Department import Department
+from Models.LabTest import LabTest
+from Models.Medicine import Medicine
+from Models.Orders import Orders
+from Models.PurchaseOrder import PurchaseOrder
+from Models.PurchaseSurgery import PurchaseSurgery
+from Models.PurchaseTest import PurchaseTest
+from Models.SurgeryType import SurgeryType
+from Models.UserExtraFields import UserExtraFields
+from Models.UserType import UserType
+from Models.Users import User
+from Models.WardBeds import WardBeds
+from Models.Wards import Ward
+
+_sequence = count(1)
+
+
+def _add(session, obj):
+    session.add(obj)
+    session.commit()
+    return obj
+
+
+def make_department(session, **values):
+    return _add(session, Department(**{"name": f"Department {next(_sequence)}", **values}))
+
+
+def make_user_type(session, **values):
+    return _add(session, UserType(**{"type": f"Type {next(_sequence)}", "description": "Staff", **values}))
+
+
+def make_user(session, department=None, user_type=None, extra_fields=None, **values):
+    department = department or make_department(session)
+    user_type = user_type or make_user_type(session)
+    n = next(_sequence)
+    user = _add(session, User(**{
+        "name": f"User {n}",
+        "phone_no": 9000000000 + n,
+        "date_of_birth": "1990-01-01",
+        "age": 35,
+        "gender": "FEMALE",
+        "address": {"city": "Pune"},
+        "username": f"user{n}",
+        "email": f"user{n}@example.com",
+        "password": "hashed",
+        "department_id": department.id,
+        "user_type_id": user_type.id,
+        **values,
+    }))
+    if extra_fields is not None:
+        _add(session, UserExtraFields(user_id=user.id, fields_data=extra_fields))
+    return user
+
+
+def make_catalog(session, department=None):
+    """One medicine, lab test and surgery type to order."""
+    department = department or make_department(session)
+    n = next(_sequence)
+    return (
+        _add(session, Medicine(name=f"Medicine {n}", manufacturer="Acme")),
+        _add(session, LabTest(name=f"Lab test {n}", price=250.0)),
+        _add(session, SurgeryType(name=f"Surgery {n}", department_id=department.id)),
+    )
+
+
+def make_order(session, user, medicine=None, lab_test=None, surgery_type=None, items=1):
+    """An order holding `items` lines of each catalog entry given."""
+    order = Orders(user_id=user.id, taken_by=user.name, taken_by_phone_no=str(user.phone_no),
+                   received_date=date(2026, 1, 5))
+    session.add(order)
+    session.flush()
+    for _ in range(items):
+        if medicine is not None:
+            session.add(PurchaseOrder(order_id=order.id, medicine_id=medicine.id, quantity=2))
+        if lab_test is not None:
+            session.add(PurchaseTest(order_id=order.id, test_id=lab_test.id, notes="Fasting"))
+        if surgery_type is not None:
+            session.add(PurchaseSurgery(order_id=order.id, surgery_type_id=surgery_type.id, price=1200.0))
+    session.commit()
+    return order
+
+
+def make_bed(session, department=None, **values):
+    department = department or make_department(session)
+    n = next(_sequence)
+    ward = _add(session, Ward(name=f"Ward {n}", ward_type="General", capacity=1, location="Block A",
+                              department_id=department.id))
+    return _add(session, WardBeds(**{"bed_no": f"Ward {n}-1", "ward_id": ward.id, "price": 800.0, **values}))
+
+
+def make_billing(session, order, **values):
+    return _add(session, Billing(**{
+        "order_id": order.id, "patient_id": order.user_id, "total_amount": 1500.0, "amount_paid": 500.0,
+        "notes": "Partially paid", **values,
+    }))
@@ -0,0 +1,76 @@
+import pytest
+
+from Models.Billing import Billing
+from Models.Orders import Orders
+from Models.Users import User
+from Serializers.BillingSerializers import BillingSerializer, billing_serializers, billing_fast_serializer
+from Serializers.OrdersSerializer import OrdersSerializer, order_serializers, order_fast_serializer
+from Serializers.UserSerializers import UserSchema, user_serializers, user_fast_serializer
+from tests.factories import make_bed, make_billing, make_catalog, make_department, make_order, make_user
+from utils.fast_serializer import FastSerializer
+
+
+@pytest.fixture
+def records(tenant_session):
+    """Users, orders and bills covering filled and empty relationships."""
+    cardiology = make_department(tenant_session, description="Heart")
+    patient = make_user(tenant_session, department=cardiology, extra_fields={"allergies": ["penicillin"]},
+                        blood_type="O+")
+    other = make_user(tenant_session, department=cardiology)
+    medicine, lab_test, surgery_type = make_catalog(tenant_session, department=cardiology)
+
+    orders = [
+        make_order(tenant_session, patient, medicine, lab_test, surgery_type, items=2),
+        make_order(tenant_session, patient, medicine),
+        make_order(tenant_session, other, lab_test=lab_test),
+        make_order(tenant_session, other),
+    ]
+    bed = make_bed(tenant_session, department=cardiology, patient_id=patient.id, status="OCCUPIED")
+    bills = [
+        make_billing(tenant_session, orders[0], bed_id=bed.id),
+        make_billing(tenant_session, orders[2]),
+        make_billing(tenant_session, orders[3], patient_id=None, total_amount=0.0),
+    ]
+    return {
+        User: [patient.id, other.id],
+        Orders: [order.id for order in orders],
+        Billing: [bill.id for bill in bills],
+    }
+
+
+def _dump(session, schema, model, ids):
+    objects = {obj.id: obj for obj in session.query(model).filter(model.id.in_(ids))}
+    return schema.dump([objects[obj_id] for obj_id in ids], many=True)
+
+
+@pytest.mark.parametrize("model, schema, fast", [
+    (User, user_serializers, user_fast_serializer),
+    (Orders, order_serializers, order_fast_serializer),
+    (Billing, billing_serializers, billing_fast_serializer),
+], ids=["users", "orders", "billing"])
+def test_fast_serializer_matches_schema(tenant_session, records, model, schema, fast):
+    ids = list(reversed(records[model]))  # output follows the order of ids
+    assert fast._compiled() is not None, "schema fell back to the ORM path"
+    assert fast.dump_ids(tenant_session, ids) == _dump(tenant_session, schema, model, ids)
+
+
+# Fieldsets as built by utils.fieldsets for fields= / include=
+@pytest.mark.parametrize("model, schema_cls, only", [
+    (User, UserSchema, ("id", "name", "email")),
+    (User, UserSchema, ("id", "username", "user_type", "department")),
+    (User, UserSchema, ("id", "department.name", "extra_fields.fields_data")),
+    (Orders, OrdersSerializer, ("id", "taken_by", "medicines")),
+    (Orders, OrdersSerializer, ("id", "user.name", "lab_tests.status", "surgeries")),
+    (Billing, BillingSerializer, ("id", "total_amount", "order.medicines")),
+    (Billing, BillingSerializer, ("id", "patient.username", "bed")),
+])
+def test_fast_serializer_matches_schema_with_fieldsets(tenant_session, records, model, schema_cls, only):
+    schema = schema_cls(many=True, only=only)
+    ids = records[model]
+    assert FastSerializer(schema).dump_ids(tenant_session, ids) == _dump(tenant_session, schema, model, ids)
+
+
+def test_fast_serializer_skips_missing_ids(tenant_session, records):
+    ids = [records[Orders][1], 999999, records[Orders][0]]
+    assert [row["id"] for row in order_fast_serializer.dump_ids(tenant_session, ids)] == ids[::2]
+    assert order_fast_serializer.dump_ids(tenant_session, []) == []
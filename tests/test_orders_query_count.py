@@ -0,0 +1,86 @@
+import json
+import threading
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from tests.factories import make_catalog, make_order, make_user
+from utils.tenant_engines import tenant_engines
+
+
+@contextmanager
+def count_statements(engine):
+    """Count the statements this thread sends through `engine` (not the activity log writer's)."""
+    statements = []
+    thread = threading.get_ident()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == thread:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def orders_api(client, auth_headers, account, tenant_session):
+    staff = make_user(tenant_session)
+    headers = auth_headers(staff.username)
+    url = f"/tenant/{account['id']}/orders"
+
+    def get(**args):
+        response = client.get(url, query_string=args, headers=headers)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        return response
+    return get
+
+
+def _order_many(tenant_session, count):
+    """`count` mixed orders and `count` medicine-only ones, two lines per item."""
+    patient = make_user(tenant_session)
+    medicine, lab_test, surgery_type = make_catalog(tenant_session)
+    for _ in range(count):
+        make_order(tenant_session, patient, medicine, lab_test, surgery_type, items=2)
+        make_order(tenant_session, patient, medicine, items=2)
+
+
+@pytest.mark.parametrize("args", [
+    {},
+    {"order_type": "medicine"},
+    {"fields": "id,taken_by,user.name,medicines"},
+])
+def test_orders_page_query_count_does_not_grow_with_page_size(orders_api, tenant_session, account, args):
+    _order_many(tenant_session, 100)
+    orders_api(page=1, limit=1, **args)  # warm the tenant engine and the auth caches
+    engine = tenant_engines.get_engine(account["id"], account["db_uri"])
+
+    counts = {}
+    for limit in (1, 100):
+        with count_statements(engine) as statements:
+            body = orders_api(page=1, limit=limit, **args).get_json()
+        assert len(body["data"]) == limit
+        counts[limit] = len(statements)
+
+    assert counts[1] == counts[100]
+
+
+def test_orders_stream_query_count_does_not_grow_with_rows(orders_api, tenant_session, account):
+    _order_many(tenant_session, 1)
+    orders_api(stream="true")
+    engine = tenant_engines.get_engine(account["id"], account["db_uri"])
+
+    counts = {}
+    for total in (1, 100):
+        if total > 1:
+            _order_many(tenant_session, total - 1)
+        with count_statements(engine) as statements:
+            lines = orders_api(stream="true").get_data(as_text=True).splitlines()
+        assert len(lines) == 2 * total
+        assert all(json.loads(line)["medicines"] for line in lines)
+        counts[total] = len(statements)
+
+    assert counts[1] == counts[100]
@@ -0,0 +1,24 @@
+from Models.UserField import UserField
+from tests.factories import make_user, make_user_type
+
+
+def test_search_casts_enum_columns(client, auth_headers, account, tenant_session):
+    staff = make_user(tenant_session)
+    user_type = make_user_type(tenant_session, type="Radiologist")
+    tenant_session.add(UserField(user_type=user_type.id, field_name="license_no", field_type="INTEGER"))
+    tenant_session.commit()
+
+    response = client.get(f"/tenant/{account['id']}/user-fields", query_string={"q": "integ"},
+                          headers=auth_headers(staff.username))
+    assert response.status_code == 200, response.get_data(as_text=True)
+    assert [row["field_name"] for row in response.get_json()["data"]] == ["license_no"]
+
+
+def test_user_types_search_by_type(client, auth_headers, account, tenant_session):
+    staff = make_user(tenant_session)
+    make_user_type(tenant_session, type="Radiologist")
+
+    response = client.get(f"/tenant/{account['id']}/user-types", query_string={"q": "radio"},
+                          headers=auth_headers(staff.username))
+    assert response.status_code == 200, response.get_data(as_text=True)
+    assert [row["type"] for row in response.get_json()["data"]] == ["Radiologist"]
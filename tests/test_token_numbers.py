@@ -0,0 +1,98 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from Models.Tokens import Token
+from tests.conftest import TEST_DATABASE_URL
+from tests.factories import make_department, make_user
+
+WRITERS = 16
+TOKENS_PER_WRITER = 5
+
+
+@pytest.fixture
+def writer_sessions(app, engine, account):
+    """Session factory on a pool big enough for every writer to hold a connection at once."""
+    writer_engine = create_engine(TEST_DATABASE_URL, pool_size=WRITERS, max_overflow=0)
+    yield sessionmaker(bind=writer_engine, info={"account_id": account["id"]})
+    writer_engine.dispose()
+
+
+def _insert_concurrently(app, writer_sessions, insert):
+    """Run `insert(session, writer, n)` for every token of every writer, all writers at once."""
+    start = threading.Barrier(WRITERS)
+
+    def writer(index):
+        with app.app_context():  # model validators query through db.session
+            session = writer_sessions()
+            try:
+                start.wait()
+                for n in range(TOKENS_PER_WRITER):
+                    insert(session, index, n)
+            finally:
+                session.close()
+
+    with ThreadPoolExecutor(max_workers=WRITERS) as pool:
+        list(pool.map(writer, range(WRITERS)))
+
+
+def _numbers(tenant_session, department_id, day):
+    return sorted(
+        number for number, in tenant_session.query(Token.token_number)
+        .filter(Token.department_id == department_id, Token.appointment_date == day)
+    )
+
+
+def test_concurrent_tokens_get_unique_gap_free_numbers(app, tenant_session, writer_sessions):
+    department = make_department(tenant_session)
+    other = make_department(tenant_session)
+    patient = make_user(tenant_session, department=department)
+    day = datetime(2026, 3, 2)
+
+    def insert(session, writer, n):
+        # Every third writer also books the other department, which keeps its own sequence
+        department_id = other.id if writer % 3 == 0 and n % 2 else department.id
+        session.add(Token(patient_id=patient.id, department_id=department_id, appointment_date=day))
+        session.commit()
+
+    _insert_concurrently(app, writer_sessions, insert)
+
+    numbers = _numbers(tenant_session, department.id, day)
+    other_numbers = _numbers(tenant_session, other.id, day)
+    assert len(numbers) + len(other_numbers) == WRITERS * TOKENS_PER_WRITER
+    assert numbers == list(range(1, len(numbers) + 1))
+    assert other_numbers == list(range(1, len(other_numbers) + 1))
+
+
+def test_rolled_back_tokens_leave_no_gaps(app, tenant_session, writer_sessions):
+    department = make_department(tenant_session)
+    patient = make_user(tenant_session, department=department)
+    day = datetime(2026, 3, 3)
+
+    def insert(session, writer, n):
+        session.add(Token(patient_id=patient.id, department_id=department.id, appointment_date=day))
+        session.flush()  # the number is allocated here
+        if (writer + n) % 4 == 0:
+            session.rollback()
+        else:
+            session.commit()
+
+    _insert_concurrently(app, writer_sessions, insert)
+
+    numbers = _numbers(tenant_session, department.id, day)
+    kept = sum((writer + n) % 4 != 0 for writer in range(WRITERS) for n in range(TOKENS_PER_WRITER))
+    assert numbers == list(range(1, kept + 1))
+
+
+def test_tokens_without_department_share_one_sequence(tenant_session):
+    patient = make_user(tenant_session)
+    day = datetime(2026, 3, 4)
+    for _ in range(3):
+        tenant_session.add(Token(patient_id=patient.id, appointment_date=day))
+        tenant_session.commit()
+
+    assert _numbers(tenant_session, None, day) == [1, 2, 3]
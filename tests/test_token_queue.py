@@ -0,0 +1,87 @@
+import threading
+from datetime import datetime
+
+from Models.Tokens import Token
+from tests.factories import make_department, make_user
+from utils.token_queue import TokenQueues
+
+
+class _HookedQueues(TokenQueues):
+    """TokenQueues running `during_load` between its database query and the swap."""
+
+    during_load = None
+
+    def _load(self, session, key):
+        tokens = super()._load(session, key)
+        if self.during_load is not None:
+            self.during_load()
+        return tokens
+
+
+def _lock_is_free(queues):
+    acquired = []
+    thread = threading.Thread(target=lambda: acquired.append(queues._changed.acquire(timeout=1)))
+    thread.start()
+    thread.join()
+    if acquired[0]:
+        queues._changed.release()
+    return acquired[0]
+
+
+def _book(session, patient, department, day):
+    token = Token(patient_id=patient.id, department_id=department.id, appointment_date=day)
+    session.add(token)
+    session.commit()
+    return token
+
+
+def test_loads_run_outside_the_lock(tenant_session, account):
+    department = make_department(tenant_session)
+    patient = make_user(tenant_session, department=department)
+    day = datetime(2026, 3, 2)
+    _book(tenant_session, patient, department, day)
+
+    queues = _HookedQueues()
+    free = []
+    queues.during_load = lambda: free.append(_lock_is_free(queues))
+
+    state = queues.snapshot(tenant_session, account["id"], department.id, day)
+    assert free == [True]
+    assert state["total"] == 1
+
+
+def test_changes_committed_during_a_load_are_kept(tenant_session, account):
+    department = make_department(tenant_session)
+    patient = make_user(tenant_session, department=department)
+    day = datetime(2026, 3, 2)
+    first = _book(tenant_session, patient, department, day)
+
+    queues = _HookedQueues()
+
+    def commit_meanwhile():
+        queues.during_load = None
+        queues.apply(account["id"], [
+            (first.id, (department.id, day), None, None, None),
+            (first.id + 1000, None, (department.id, day), 7, "Alloted"),
+        ])
+
+    queues.during_load = commit_meanwhile
+    state = queues.snapshot(tenant_session, account["id"], department.id, day)
+    assert state["total"] == 1
+    assert state["next"] == [7]
+
+
+def test_wait_returns_on_a_commit_from_another_thread(tenant_session, account):
+    department = make_department(tenant_session)
+    patient = make_user(tenant_session, department=department)
+    day = datetime(2026, 3, 2)
+
+    queues = TokenQueues()
+    version = queues.snapshot(tenant_session, account["id"], department.id, day)["version"]
+    timer = threading.Timer(0.2, queues.apply, (account["id"], [(1, None, (department.id, day), 1, "Alloted")]))
+    timer.start()
+    state = queues.wait(tenant_session, account["id"], department.id, day, version, timeout=5)
+    timer.join()
+
+    assert state["version"] != version
+    assert state["next"] == [1]
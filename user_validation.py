@@ -1,9 +1,8 @@
 from functools import wraps
 from flask import g, request
 from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
-from Models.Users import User
-from Serializers.UserSerializers import user_serializer
 from new import get_current_tenant_session  # your function to get tenant DB session
+from utils.principal_cache import load_principal
 
 def tenant_user_required(func):
     """
@@ -31,12 +30,13 @@ def tenant_user_required(func):
         # Get tenant session
         tenant_session = get_current_tenant_session()
 
-        # Fetch user from tenant DB
-        user = tenant_session.query(User).filter_by(username=identity).first()
+        # Fetch user principal (cached) from tenant DB
+        account_uid = (request.view_args or {}).get('account_uid')
+        user = load_principal(tenant_session, account_uid, identity)
         if not user:
             return {"msg": "User not found in tenant database"}, 401
 
-        g.user = user_serializer.dump(user)
+        g.user = user
 
         return func(tenant_session, *args, **kwargs)
 
@@ -0,0 +1,35 @@
+import os
+
+from Models.AccountInfo import AccountInfo
+from extentions import db
+from utils.cache import TTLCache
+
+# account id -> {"id", "name", "subdomain", "db_uri"}
+account_cache = TTLCache(
+    maxsize=int(os.environ.get("ACCOUNT_CACHE_SIZE", 1024)),
+    ttl=int(os.environ.get("ACCOUNT_CACHE_TTL", 300)),
+)
+
+
+def get_account(account_uid):
+    """
+    Resolve a tenant from the master DB, serving repeat lookups from the cache.
+    Returns None if the account does not exist.
+    """
+    def load():
+        account = db.session.query(AccountInfo).filter_by(id=account_uid).one_or_none()
+        if not account:
+            return None
+        return {
+            "id": account.id,
+            "name": account.name,
+            "subdomain": account.subdomain,
+            "db_uri": account.db_uri,
+        }
+
+    return account_cache.get_or_load(str(account_uid), load)
+
+
+def invalidate_account(account_id=None):
+    """Forget a cached tenant (or every tenant) after AccountInfo changes."""
+    account_cache.invalidate(None if account_id is None else str(account_id))
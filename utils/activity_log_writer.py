@@ -0,0 +1,141 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+
+from Models.ActivityLogs import ActivityLog
+from utils.tenant_engines import tenant_engines
+
+logger = logging.getLogger(__name__)
+
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+
+
+class ActivityLogWriter:
+    """
+    Buffers activity log rows in memory and writes them to the tenant databases from
+    a background thread, one multi-row INSERT per tenant and batch.
+
+    The backlog is bounded by `max_backlog`. When it is full, `overflow` decides what
+    is lost: "drop_newest" discards the incoming entry, "drop_oldest" evicts the oldest
+    queued one to make room. Requests never block on logging either way. Pending
+    entries are flushed when the process exits.
+    """
+
+    def __init__(self, max_backlog=10000, batch_size=200, flush_interval=1.0, overflow=DROP_NEWEST):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+
+        self._queue = queue.Queue(maxsize=max_backlog)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopping = threading.Event()
+        self._counters = {"enqueued": 0, "written": 0, "dropped": 0, "failed": 0, "batches": 0}
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="activity-log-writer", daemon=True)
+            self._thread.start()
+
+    def enqueue(self, account_id, db_uri, row):
+        """Queue one row (a dict of ActivityLog columns) for the given tenant database."""
+        self.start()
+        entry = (account_id, db_uri, row)
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            if self.overflow != DROP_OLDEST:
+                self._count("dropped")
+                return False
+            try:
+                self._queue.get_nowait()
+                self._count("dropped")
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                self._count("dropped")
+                return False
+        self._count("enqueued")
+        return True
+
+    def _drain(self, block):
+        """Take up to `batch_size` entries, waiting at most `flush_interval` for the first one."""
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=self.flush_interval) if block else self._queue.get_nowait())
+        except queue.Empty:
+            return batch
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                if block:
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        by_tenant = defaultdict(list)
+        for account_id, db_uri, row in batch:
+            by_tenant[(account_id, db_uri)].append(row)
+
+        for (account_id, db_uri), rows in by_tenant.items():
+            try:
+                engine = tenant_engines.get_engine(account_id, db_uri)
+                with engine.begin() as conn:
+                    conn.execute(ActivityLog.__table__.insert(), rows)
+                self._count("written", len(rows))
+                self._count("batches")
+            except Exception:
+                self._count("failed", len(rows))
+                logger.exception("Failed to write %s activity log rows for account %s", len(rows), account_id)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            batch = self._drain(block=True)
+            if batch:
+                self._write(batch)
+
+    def flush(self):
+        """Write everything currently queued from the calling thread."""
+        while True:
+            batch = self._drain(block=False)
+            if not batch:
+                return
+            self._write(batch)
+
+    def stop(self, timeout=5):
+        """Stop the background thread and flush whatever is still queued."""
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self.flush()
+
+    def stats(self):
+        with self._lock:
+            return {**self._counters, "backlog": self._queue.qsize(), "max_backlog": self._queue.maxsize}
+
+
+activity_log_writer = ActivityLogWriter(
+    max_backlog=int(os.environ.get("ACTIVITY_LOG_MAX_BACKLOG", 10000)),
+    batch_size=int(os.environ.get("ACTIVITY_LOG_BATCH_SIZE", 200)),
+    flush_interval=float(os.environ.get("ACTIVITY_LOG_FLUSH_INTERVAL", 1.0)),
+    overflow=os.environ.get("ACTIVITY_LOG_OVERFLOW", DROP_NEWEST),
+)
+atexit.register(activity_log_writer.stop)
@@ -0,0 +1,42 @@
+from sqlalchemy import func, distinct as sql_distinct
+
+
+def count_if(condition=None, column=None, distinct=False):
+    """
+    Aggregate expression for `summarize`: count(*) FILTER (WHERE condition).
+
+    Pass `column` to count non-null values of it instead of rows, and `distinct=True`
+    to count each value once (needed when joins fan out rows, e.g. Orders).
+    """
+    if column is None:
+        expr = func.count()
+    elif distinct:
+        expr = func.count(sql_distinct(column))
+    else:
+        expr = func.count(column)
+    return expr.filter(condition) if condition is not None else expr
+
+
+def sum_if(column, condition=None):
+    """Aggregate expression for `summarize`: coalesce(sum(column) FILTER (WHERE condition), 0)."""
+    expr = func.sum(column)
+    if condition is not None:
+        expr = expr.filter(condition)
+    return func.coalesce(expr, 0)
+
+
+def summarize(query, **aggregates):
+    """
+    Evaluate several aggregates over `query` in a single SELECT.
+
+        summarize(query, total=count_if(), paid=count_if(Billing.status == "PAID"))
+
+    The query keeps its joins and filters, but ordering/paging is dropped.
+    Returns a dict of name -> value (None results become 0).
+    """
+    row = (
+        query.order_by(None).limit(None).offset(None)
+        .with_entities(*[expr.label(name) for name, expr in aggregates.items()])
+        .one()
+    )
+    return {name: getattr(row, name) or 0 for name in aggregates}
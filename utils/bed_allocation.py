@@ -0,0 +1,182 @@
+import os
+from datetime import datetime
+from itertools import chain
+
+from sqlalchemy import event, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from Models.WardBeds import WardBeds, WardBedStatusEnum
+from utils.cache import TTLCache
+from utils.stats_cache import mark_stats_dirty
+
+AVAILABLE = WardBedStatusEnum.AVAILABLE.value
+OCCUPIED = WardBedStatusEnum.OCCUPIED.value
+UNAVAILABLE = WardBedStatusEnum.UNAVAILABLE.value
+
+# Beds counting towards a ward's capacity
+BED_IS_IN_SERVICE = WardBeds.is_active & ~WardBeds.is_deleted
+
+# Same predicate as the partial index ix_ward_beds_available on WardBeds
+BED_IS_FREE = (
+    (WardBeds.status == AVAILABLE)
+    & WardBeds.patient_id.is_(None)
+    & BED_IS_IN_SERVICE
+)
+
+# account id -> {ward id: free beds}; dropped on every committed bed write
+_tallies = TTLCache(
+    maxsize=int(os.environ.get("BED_TALLY_CACHE_SIZE", 256)),
+    ttl=int(os.environ.get("BED_TALLY_TTL", 300)),
+)
+
+
+class BedUnavailable(ValueError):
+    """The requested bed is taken, or the ward has no free bed left."""
+
+
+def free_beds_by_ward(tenant_session, account_id):
+    """Free bed count per ward id, from the partial index and cached until the next bed write."""
+    return _tallies.get_or_load(str(account_id), lambda: dict(
+        tenant_session.query(WardBeds.ward_id, func.count(WardBeds.id))
+        .filter(BED_IS_FREE)
+        .group_by(WardBeds.ward_id)
+        .all()
+    ))
+
+
+def allocate_bed(tenant_session, patient_id, ward_id=None, bed_id=None):
+    """
+    Assign a free bed to `patient_id`: the given `bed_id`, or any free bed of `ward_id`.
+
+    The bed row is locked (SELECT ... FOR UPDATE) until the caller commits, and is
+    re-checked as free under the lock, so two admissions can never get the same bed.
+    Picking any bed of a ward uses SKIP LOCKED: concurrent admissions take different
+    free beds instead of queueing on the same one. Raises BedUnavailable.
+    """
+    query = tenant_session.query(WardBeds).filter(BED_IS_FREE)
+    if bed_id is not None:
+        bed = query.filter(WardBeds.id == bed_id).with_for_update().first()
+        if bed is None:
+            raise BedUnavailable(f"Bed {bed_id} is not available")
+    else:
+        bed = (
+            query.filter(WardBeds.ward_id == ward_id)
+            .order_by(WardBeds.id)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if bed is None:
+            raise BedUnavailable(f"No free bed in ward {ward_id}")
+
+    bed.patient_id = patient_id
+    bed.status = OCCUPIED
+    bed.admission_date = datetime.utcnow()
+    return bed
+
+
+def release_bed(tenant_session, bed_id):
+    """
+    Free an occupied bed, locking its row first. Returns (bed, patient_id,
+    admission_date) as they were before the release, or None when the bed does
+    not exist or is not occupied.
+    """
+    bed = (
+        tenant_session.query(WardBeds)
+        .filter(WardBeds.id == bed_id, WardBeds.patient_id.isnot(None))
+        .with_for_update()
+        .first()
+    )
+    if bed is None:
+        return None
+
+    patient_id, admission_date = bed.patient_id, bed.admission_date
+    bed.patient_id = None
+    bed.admission_date = None
+    bed.status = AVAILABLE
+    return bed, patient_id, admission_date
+
+
+def _mark_beds_changed(tenant_session):
+    # Core statements bypass the flush hooks below
+    tenant_session.info["beds_dirty"] = True
+
+
+def count_beds(tenant_session, ward_id):
+    return tenant_session.query(func.count(WardBeds.id)).filter(WardBeds.ward_id == ward_id, BED_IS_IN_SERVICE).scalar()
+
+
+def provision_beds(tenant_session, ward, first_no, last_no):
+    """Create beds `{ward.name}-{first_no}` .. `{ward.name}-{last_no}` with one multi-row INSERT."""
+    if last_no < first_no:
+        return
+    tenant_session.execute(insert(WardBeds).values([
+        {"ward_id": ward.id, "bed_no": f"{ward.name}-{bed_no}"} for bed_no in range(first_no, last_no + 1)
+    ]))
+    _mark_beds_changed(tenant_session)
+
+
+def retire_beds(tenant_session, ward_id, count):
+    """
+    Take the `count` most recently added unoccupied beds of a ward out of service
+    with a single UPDATE ... WHERE id IN (...). Raises ValueError when fewer beds
+    are free, including beds allocated concurrently.
+    """
+    if count <= 0:
+        return
+    bed_ids = tenant_session.scalars(
+        select(WardBeds.id)
+        .where(WardBeds.ward_id == ward_id, WardBeds.patient_id.is_(None), BED_IS_IN_SERVICE)
+        .order_by(WardBeds.id.desc())
+        .limit(count)
+    ).all()
+    if len(bed_ids) < count:
+        raise ValueError("Cannot reduce capacity: not enough unoccupied beds")
+    retired = tenant_session.execute(
+        update(WardBeds)
+        .where(WardBeds.id.in_(bed_ids), WardBeds.patient_id.is_(None))
+        .values(is_active=False, is_deleted=True, status=UNAVAILABLE, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if retired < count:
+        raise ValueError("Cannot reduce capacity: not enough unoccupied beds")
+    _mark_beds_changed(tenant_session)
+
+
+def renumber_beds(tenant_session, ward):
+    """Rename the ward's beds `{ward.name}-1`, `-2`, ... in creation order, in one UPDATE."""
+    numbered = (
+        select(WardBeds.id, func.row_number().over(order_by=WardBeds.id).label("bed_index"))
+        .where(WardBeds.ward_id == ward.id, BED_IS_IN_SERVICE)
+        .subquery()
+    )
+    tenant_session.execute(
+        update(WardBeds)
+        .where(WardBeds.id == numbered.c.id)
+        .values(bed_no=func.concat(ward.name, "-", numbered.c.bed_index), updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    _mark_beds_changed(tenant_session)
+
+
+# --- Write tracking -------------------------------------------------------------
+# Tenant sessions carry their account id in session.info (see utils.tenant_engines).
+# Any committed bed write drops the tenant's tally; it is recounted on next read.
+
+@event.listens_for(Session, "after_flush")
+def _collect_bed_writes(session, flush_context):
+    if "account_id" not in session.info:
+        return
+    if any(isinstance(obj, WardBeds) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info["beds_dirty"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_bed_tally(session):
+    if session.info.pop("beds_dirty", None):
+        _tallies.invalidate(str(session.info["account_id"]))
+        mark_stats_dirty(session.info["account_id"], ["beds"])
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _keep_bed_tally(session, previous_transaction):
+    session.info.pop("beds_dirty", None)
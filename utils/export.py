@@ -0,0 +1,176 @@
+import csv
+import io
+import json
+import os
+import tempfile
+
+import xlsxwriter
+from flask import Response, stream_with_context
+from sqlalchemy import func
+
+from Models.Billing import Billing
+from Models.Department import Department
+from Models.MedicineStock import MedicineStock
+from Models.Orders import Orders
+from Models.Payments import Payment
+from Models.UserType import UserType
+from Models.Users import User
+from Serializers.BillingSerializers import billing_serializer
+from Serializers.DepartmentSerializers import department_serializer
+from Serializers.MedicineStockSerializer import medicine_stock_serializer
+from Serializers.OrdersSerializer import order_serializer
+from Serializers.PaymentsSerializers import payment_serializer
+from Serializers.UserSerializers import user_serializer
+from utils.pagination import STREAM_BATCH_SIZE
+
+CSV_MIMETYPE = "text/csv"
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+def _users_query(tenant_session, args):
+    query = tenant_session.query(User).join(UserType, UserType.id == User.user_type_id)
+    user_type = args.get("user_type", "").lower()
+    if user_type:
+        query = query.filter(func.lower(UserType.type) == user_type)
+    return query.filter(User.is_deleted == False).order_by(User.id)
+
+
+# Export type -> (query builder, serializer, sheet name)
+EXPORTS = {
+    "departments": (
+        lambda session, args: session.query(Department).filter_by(is_deleted=False).order_by(Department.id),
+        department_serializer,
+        "Departments",
+    ),
+    "users": (_users_query, user_serializer, "Users"),
+    "orders": (lambda session, args: session.query(Orders).order_by(Orders.id), order_serializer, "Orders"),
+    "billing": (lambda session, args: session.query(Billing).order_by(Billing.id), billing_serializer, "Billing"),
+    "payments": (lambda session, args: session.query(Payment).order_by(Payment.id), payment_serializer, "Payments"),
+    "medicine_stock": (
+        lambda session, args: session.query(MedicineStock).order_by(MedicineStock.id),
+        medicine_stock_serializer,
+        "Medicine Stock",
+    ),
+}
+
+
+def export_query(tenant_session, table, args):
+    """Return (query, serializer, sheet name) for an export type, or None if it is not supported."""
+    spec = EXPORTS.get(table)
+    if not spec:
+        return None
+    build, serializer, sheet_name = spec
+    return build(tenant_session, args), serializer, sheet_name
+
+
+def _cell(value):
+    # Nested relationships don't fit in a cell, keep them as JSON text
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return value
+
+
+def iter_export_rows(query, serializer, batch_size=STREAM_BATCH_SIZE):
+    """
+    Yield each row of `query` as a flat dict, reading through a server-side cursor
+    and serializing `batch_size` rows at a time.
+    """
+    batch = []
+    for obj in query.yield_per(batch_size):
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            for item in serializer.dump(batch, many=True):
+                yield {key: _cell(value) for key, value in item.items()}
+            batch = []
+    for item in serializer.dump(batch, many=True):
+        yield {key: _cell(value) for key, value in item.items()}
+
+
+def iter_csv(rows):
+    """Encode dict rows as CSV text, one line at a time. The header comes from the first row."""
+    buffer = io.StringIO()
+    writer = None
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(row.keys()), extrasaction="ignore")
+            writer.writeheader()
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def write_xlsx(rows, path, sheet_name):
+    """
+    Write dict rows to an XLSX file at `path` in constant memory: xlsxwriter flushes
+    each finished row to disk, so only the current row is held. Returns the row count.
+    """
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True, "tmpdir": os.path.dirname(path) or None})
+    worksheet = workbook.add_worksheet(sheet_name[:31])
+    count = 0
+    try:
+        for row in rows:
+            if count == 0:
+                worksheet.write_row(0, 0, list(row.keys()))
+            count += 1
+            worksheet.write_row(count, 0, [value if value is None or isinstance(value, (int, float, bool)) else str(value)
+                                          for value in row.values()])
+    finally:
+        workbook.close()
+    return count
+
+
+def iter_file(path, chunk_size=FILE_CHUNK_SIZE, start=0, end=None):
+    """Read `path` in chunks from byte `start` up to and including byte `end`."""
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        remaining = None if end is None else end - start + 1
+        while remaining is None or remaining > 0:
+            chunk = fh.read(chunk_size if remaining is None else min(chunk_size, remaining))
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+
+
+def stream_export(query, serializer, sheet_name, export_format, filename, session):
+    """
+    Build a streamed download of `query` as CSV or XLSX.
+
+    CSV is produced row by row while the response is being sent. XLSX has to be
+    complete before its first byte is valid, so it is written to a temporary file
+    in constant-memory mode and that file is streamed and removed. The generator
+    runs after the view returns, so it owns `session` and closes it when done.
+    """
+    if export_format == "csv":
+        def generate():
+            try:
+                yield from iter_csv(iter_export_rows(query, serializer))
+            finally:
+                session.close()
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype=CSV_MIMETYPE,
+            headers={"Content-Disposition": f"attachment; filename={filename}.csv"},
+        )
+
+    def generate_xlsx():
+        fd, path = tempfile.mkstemp(suffix=".xlsx")
+        os.close(fd)
+        try:
+            try:
+                write_xlsx(iter_export_rows(query, serializer), path, sheet_name)
+            finally:
+                session.close()
+            yield from iter_file(path)
+        finally:
+            os.remove(path)
+
+    return Response(
+        stream_with_context(generate_xlsx()),
+        mimetype=XLSX_MIMETYPE,
+        headers={"Content-Disposition": f"attachment; filename={filename}.xlsx"},
+    )
@@ -0,0 +1,181 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from utils.export import export_query, iter_csv, iter_export_rows, write_xlsx
+from utils.tenant_engines import tenant_engines
+
+logger = logging.getLogger(__name__)
+
+# Exports hold tenant data, so they live outside the public /uploads route
+EXPORT_FOLDER = os.path.abspath(os.environ.get("EXPORT_FOLDER", "exports"))
+EXPORT_WORKERS = int(os.environ.get("EXPORT_WORKERS", 2))
+# Export files and job statuses are deleted this many seconds after their last update
+EXPORT_RETENTION = int(os.environ.get("EXPORT_RETENTION", 86400))
+# A queued or running job whose status has not been saved for this long is reported
+# as failed: the process running it died. Running jobs save their progress every
+# EXPORT_PROGRESS_ROWS rows.
+EXPORT_STALE_AFTER = int(os.environ.get("EXPORT_STALE_AFTER", 1800))
+EXPORT_PROGRESS_ROWS = int(os.environ.get("EXPORT_PROGRESS_ROWS", 10000))
+# Minimum seconds between two retention sweeps of one process
+EXPORT_SWEEP_INTERVAL = int(os.environ.get("EXPORT_SWEEP_INTERVAL", 600))
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+_JOB_ID = re.compile(r"^[0-9a-f]{32}$")
+_executor = ThreadPoolExecutor(max_workers=EXPORT_WORKERS, thread_name_prefix="export-job")
+_sweep_lock = threading.Lock()
+_last_sweep = 0.0
+
+
+def _job_dir(account_id):
+    return os.path.join(EXPORT_FOLDER, str(account_id))
+
+
+def _status_path(account_id, job_id):
+    return os.path.join(_job_dir(account_id), f"{job_id}.json")
+
+
+def _save(job):
+    # Status lives next to the file so every app process sees the same state
+    path = _status_path(job["account_id"], job["id"])
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as fh:
+        json.dump(job, fh)
+    os.replace(tmp_path, path)
+
+
+def get_job(account_id, job_id):
+    """
+    Return the job's status dict, or None if the tenant has no such job. A queued or
+    running job that stopped saving progress is marked failed.
+    """
+    if not _JOB_ID.match(job_id or ""):
+        return None
+    path = _status_path(account_id, job_id)
+    try:
+        with open(path) as fh:
+            job = json.load(fh)
+        updated = os.path.getmtime(path)
+    except FileNotFoundError:
+        return None
+
+    if job["status"] in (QUEUED, RUNNING) and time.time() - updated > EXPORT_STALE_AFTER:
+        job.update(status=FAILED, error="Export was interrupted", finished_at=datetime.utcnow().isoformat())
+        _save(job)
+    return job
+
+
+def job_file_path(job):
+    return os.path.join(_job_dir(job["account_id"]), job["filename"])
+
+
+def submit_export(account, table, export_format, args, user_id=None):
+    """
+    Queue an export of `table` for the tenant and return its job dict.
+    The file is written by a worker thread; poll `get_job` until it is completed.
+    """
+    job_id = uuid.uuid4().hex
+    extension = "csv" if export_format == "csv" else "xlsx"
+    job = {
+        "id": job_id,
+        "account_id": account["id"],
+        "user_id": user_id,
+        "type": table,
+        "format": export_format,
+        "args": dict(args),
+        "filename": f"{job_id}.{extension}",
+        "status": QUEUED,
+        "rows": 0,
+        "size": None,
+        "error": None,
+        "created_at": datetime.utcnow().isoformat(),
+        "finished_at": None,
+    }
+    os.makedirs(_job_dir(account["id"]), exist_ok=True)
+    _save(job)
+    _executor.submit(_run, job, account["db_uri"])
+    _executor.submit(sweep_exports)
+    return job
+
+
+def sweep_exports(force=False):
+    """
+    Delete export files, leftover partial files and job statuses of every tenant not
+    updated for EXPORT_RETENTION seconds. Runs at most once per EXPORT_SWEEP_INTERVAL
+    unless forced. Returns the number of files removed.
+    """
+    global _last_sweep
+    with _sweep_lock:
+        now = time.time()
+        if not force and now - _last_sweep < EXPORT_SWEEP_INTERVAL:
+            return 0
+        _last_sweep = now
+
+    removed = 0
+    cutoff = now - EXPORT_RETENTION
+    try:
+        tenant_dirs = [entry.path for entry in os.scandir(EXPORT_FOLDER) if entry.is_dir()]
+    except FileNotFoundError:
+        return 0
+    for tenant_dir in tenant_dirs:
+        # Status files last, so a job never points at a file that is already gone
+        entries = sorted(os.scandir(tenant_dir), key=lambda entry: entry.name.endswith(".json"))
+        for entry in entries:
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                pass  # removed by another process
+    if removed:
+        logger.info("Removed %s expired export files", removed)
+    return removed
+
+
+def _progress(job, rows):
+    """Count rows as they are written, saving the job every EXPORT_PROGRESS_ROWS rows."""
+    for row in rows:
+        yield row
+        job["rows"] += 1
+        if job["rows"] % EXPORT_PROGRESS_ROWS == 0:
+            _save(job)
+
+
+def _run(job, db_uri):
+    session = tenant_engines.get_session(job["account_id"], db_uri)
+    path = job_file_path(job)
+    part_path = f"{path}.part"
+    try:
+        job["status"] = RUNNING
+        _save(job)
+
+        query, serializer, sheet_name = export_query(session, job["type"], job["args"])
+        rows = _progress(job, iter_export_rows(query, serializer))
+        if job["format"] == "csv":
+            with open(part_path, "w", newline="") as fh:
+                for line in iter_csv(rows):
+                    fh.write(line)
+        else:
+            write_xlsx(rows, part_path, sheet_name)
+
+        os.replace(part_path, path)
+        job.update(status=COMPLETED, size=os.path.getsize(path))
+    except Exception as e:
+        logger.exception("Export job %s failed", job["id"])
+        job.update(status=FAILED, error=str(e))
+        if os.path.exists(part_path):
+            os.remove(part_path)
+    finally:
+        session.close()
+        job["finished_at"] = datetime.utcnow().isoformat()
+        _save(job)
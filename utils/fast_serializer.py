@@ -0,0 +1,213 @@
+from collections import defaultdict
+
+from marshmallow import fields
+from sqlalchemy import bindparam, inspect, select, Boolean, Integer, String
+from sqlalchemy.orm import aliased
+
+from utils.loader_plan import loader_plan
+
+# Deepest schema nesting the compiler follows before giving up on the fast path
+MAX_DEPTH = 8
+
+# Field types whose dump is the column value itself, when the column type matches
+_PASSTHROUGH = {fields.String: String, fields.Integer: Integer, fields.Boolean: Boolean}
+
+
+class UnsupportedSchema(Exception):
+    pass
+
+
+def _converter(field, column):
+    """Return a function turning a non-null column value into the field's dumped value, or None for as-is."""
+    column_type = _PASSTHROUGH.get(type(field))
+    if column_type is not None and isinstance(column.type, column_type):
+        return None
+    if type(field) in (fields.DateTime, fields.Date):
+        format_func = field.SERIALIZATION_FUNCS.get(field.format or field.DEFAULT_FORMAT)
+        if format_func:
+            return format_func
+    name = field.name
+    return lambda value: field._serialize(value, name, None)
+
+
+class _Node:
+    """Compiled shape of one schema over one model: its columns, to-one and to-many nested parts."""
+
+    def __init__(self, model):
+        mapper = inspect(model)
+        self.model = model
+        self.pk = mapper.get_property_by_column(mapper.primary_key[0]).key
+        self.columns = []     # (output key, attribute, converter)
+        self.ones = []        # (output key, relationship, child node)
+        self.manys = []       # (output key, relationship, child node, local attribute, remote attribute, order_by)
+        self.order = []       # ("col" | "one" | "many", index) in dump order
+        self.keys = set()     # local attributes collections are joined on
+        self.statement = None  # (bound, SELECT) cached by _statement
+
+
+def _compile(schema, model, depth=0):
+    if depth > MAX_DEPTH:
+        raise UnsupportedSchema("Schema nesting is too deep")
+    mapper = inspect(model)
+    node = _Node(model)
+
+    for name, field in schema.dump_fields.items():
+        attribute = field.attribute or name
+        out = field.data_key or name
+
+        if isinstance(field, fields.Nested):
+            prop = mapper.relationships.get(attribute)
+            if prop is None:
+                continue  # marshmallow leaves out attributes the object doesn't have
+            target = prop.mapper.class_
+            child = _compile(field.schema, target, depth + 1)
+            many = field.schema.many or field.many
+            if not prop.uselist:
+                if many:
+                    raise UnsupportedSchema(f"{name} is a list field over a scalar relationship")
+                node.order.append(("one", len(node.ones)))
+                node.ones.append((out, prop.key, child))
+                continue
+            if not many or prop.secondary is not None or len(prop.local_remote_pairs) != 1:
+                raise UnsupportedSchema(f"Relationship {name} can't be loaded by key")
+            local, remote = prop.local_remote_pairs[0]
+            local_key = mapper.get_property_by_column(local).key
+            remote_key = prop.mapper.get_property_by_column(remote).key
+            node.keys.add(local_key)
+            node.order.append(("many", len(node.manys)))
+            node.manys.append((out, prop.key, child, local_key, remote_key, prop.order_by))
+            continue
+
+        column_prop = mapper.column_attrs.get(attribute)
+        if column_prop is None or len(column_prop.columns) != 1:
+            raise UnsupportedSchema(f"{name} is not a plain column")
+        node.order.append(("col", len(node.columns)))
+        node.columns.append((out, column_prop.key, _converter(field, column_prop.columns[0])))
+
+    return node
+
+
+class _Bound:
+    """A compiled node placed in one SELECT: where each of its values sits in the result row."""
+
+    def __init__(self, node, entity, columns, joins):
+        def add(attribute):
+            columns.append(getattr(entity, attribute))
+            return len(columns) - 1
+
+        self.node = node
+        self.pk = add(node.pk)
+        self.columns = [(out, add(attribute), convert) for out, attribute, convert in node.columns]
+        self.keys = {attribute: add(attribute) for attribute in node.keys}
+        self.ones = []
+        for out, relationship, child in node.ones:
+            alias = aliased(child.model)
+            joins.append(getattr(entity, relationship).of_type(alias))
+            self.ones.append((out, _Bound(child, alias, columns, joins)))
+
+    def build(self, row, pending):
+        if row[self.pk] is None:
+            return None
+        data = {}
+        for kind, index in self.node.order:
+            if kind == "col":
+                out, position, convert = self.columns[index]
+                value = row[position]
+                data[out] = convert(value) if convert is not None and value is not None else value
+            elif kind == "one":
+                out, bound = self.ones[index]
+                data[out] = bound.build(row, pending)
+            else:
+                spec = self.node.manys[index]
+                data[spec[0]] = items = []
+                pending[id(spec)].append((spec, row[self.keys[spec[3]]], items))
+        return data
+
+
+def _statement(node, key, order_by=None):
+    """
+    Build (once per node) the SELECT reading `node` for a list of `key` values, passed
+    as the expanding `keys` parameter. The key column is selected last.
+    """
+    if node.statement is None:
+        columns, joins = [], []
+        bound = _Bound(node, node.model, columns, joins)
+        key_column = getattr(node.model, key)
+        statement = select(*columns, key_column).select_from(node.model)
+        for join in joins:
+            statement = statement.outerjoin(join)
+        statement = statement.where(key_column.in_(bindparam("keys", expanding=True)))
+        if order_by:
+            statement = statement.order_by(*order_by)
+        node.statement = (bound, statement)
+    return node.statement
+
+
+def _fill_collections(session, pending):
+    """Load every pending to-many field with one query per relationship, breadth first."""
+    while pending:
+        next_pending = defaultdict(list)
+        for entries in pending.values():
+            _, _, child, _, remote_key, order_by = entries[0][0]
+            targets = defaultdict(list)
+            for _, key, items in entries:
+                if key is not None:
+                    targets[key].append(items)
+            if not targets:
+                continue
+
+            bound, statement = _statement(child, remote_key, order_by or (getattr(child.model, child.pk),))
+            for row in session.execute(statement, {"keys": list(targets)}):
+                item = bound.build(row, next_pending)
+                for items in targets[row[-1]]:
+                    items.append(item)
+        pending = next_pending
+
+
+class FastSerializer:
+    """
+    Column-tuple serializer producing the same output as a marshmallow-sqlalchemy schema.
+
+    The schema is compiled once into the columns it dumps. Scalar nested relationships
+    become outer joins in a single SELECT, and nested collections are read with one
+    `IN` query each. Rows are mapped straight to dicts, with no ORM instances and no
+    per-field marshmallow dispatch. Schemas the compiler can't express (method fields,
+    many-to-many, ...) fall back to eager-loaded ORM objects and `schema.dump`.
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self._node = None
+        self._supported = None
+
+    def _compiled(self):
+        if self._supported is None:
+            try:
+                self._node = _compile(self.schema, self.schema.opts.model)
+                self._supported = True
+            except UnsupportedSchema:
+                self._supported = False
+        return self._node if self._supported else None
+
+    def dump_ids(self, session, ids):
+        """Serialize the rows with the given primary keys, in the order of `ids`."""
+        ids = list(ids)
+        if not ids:
+            return []
+
+        model = self.schema.opts.model
+        pk = getattr(model, inspect(model).get_property_by_column(inspect(model).primary_key[0]).key)
+        node = self._compiled()
+        if node is None:
+            objects = session.query(model).options(*loader_plan(self.schema)).filter(pk.in_(ids)).all()
+            by_id = {obj_id: data for obj_id, data in zip(
+                [getattr(obj, pk.key) for obj in objects], self.schema.dump(objects, many=True))}
+            return [by_id[obj_id] for obj_id in ids if obj_id in by_id]
+
+        bound, statement = _statement(node, node.pk)
+        pending = defaultdict(list)
+        by_id = {}
+        for row in session.execute(statement, {"keys": ids}):
+            by_id[row[bound.pk]] = bound.build(row, pending)
+        _fill_collections(session, pending)
+        return [by_id[obj_id] for obj_id in ids if obj_id in by_id]
@@ -0,0 +1,47 @@
+from functools import lru_cache
+
+from flask import request
+from marshmallow import fields
+
+from utils.fast_serializer import FastSerializer
+
+
+def _split(value):
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+@lru_cache(maxsize=64)
+def _plain_fields(schema_cls):
+    return frozenset(name for name, field in schema_cls().dump_fields.items() if not isinstance(field, fields.Nested))
+
+
+@lru_cache(maxsize=256)
+def _sparse(schema_cls, only):
+    schema = schema_cls(many=True, only=only)
+    return schema, FastSerializer(schema)
+
+
+def sparse_serializers(schema_cls, default_schema, default_fast):
+    """
+    Return the (schema, fast serializer) pair for a list endpoint, honouring the
+    sparse fieldset query arguments:
+
+        fields=id,name,email         only these fields (dotted names reach into nested ones)
+        include=user_type,department  nested objects to embed
+
+    With `include` alone every plain column is kept and only the listed nested
+    objects are embedded. Without either argument the defaults are returned.
+    Both the selected columns and the output follow the fieldset, and schemas are
+    cached per fieldset. Raises ValueError for unknown field names.
+    """
+    requested = _split(request.args.get("fields", ""))
+    include = _split(request.args.get("include", ""))
+    if not requested and not include:
+        return default_schema, default_fast
+
+    if requested:
+        only = set(requested)
+    else:
+        only = set(_plain_fields(schema_cls))
+    only.update(include)
+    return _sparse(schema_cls, frozenset(only))
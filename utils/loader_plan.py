@@ -0,0 +1,66 @@
+import weakref
+
+from marshmallow import fields
+from sqlalchemy import inspect
+from sqlalchemy.orm import selectinload
+
+# Nested schemas that refer back to each other are cut off after this many levels
+MAX_DEPTH = 4
+
+_plans = weakref.WeakKeyDictionary()
+
+
+def _schema_model(schema):
+    opts = getattr(schema, "opts", None)
+    return getattr(opts, "model", None)
+
+
+def _nested_relationships(schema, model):
+    """Yield (relationship property, nested schema) for each dumped Nested field backed by a relationship."""
+    relationships = inspect(model).relationships
+    for name, field in schema.fields.items():
+        if not isinstance(field, fields.Nested) or field.load_only:
+            continue
+        prop = relationships.get(field.attribute or name)
+        if prop is None:
+            continue  # Nested field with no relationship behind it (nothing to load)
+        yield prop, field.schema
+
+
+def _options(schema, model, parent=None, depth=0, path=()):
+    options = []
+    for prop, nested in _nested_relationships(schema, model):
+        target = prop.mapper.class_
+        if depth >= MAX_DEPTH or target in path + (model,):
+            continue
+
+        attr = getattr(model, prop.key)
+        if parent is None or prop.uselist:
+            # One IN query per relationship: safe with LIMIT, DISTINCT and yield_per
+            loader = parent.selectinload(attr) if parent is not None else selectinload(attr)
+        else:
+            # Many-to-one below the root rides along in the parent's query
+            loader = parent.joinedload(attr)
+
+        options.append(loader)
+        if _schema_model(nested) is not None:
+            options.extend(_options(nested, target, loader, depth + 1, path + (model,)))
+    return options
+
+
+def loader_plan(schema):
+    """
+    Derive SQLAlchemy loader options from a marshmallow-sqlalchemy schema's Nested fields.
+
+        query = query.options(*loader_plan(order_serializers))
+
+    Every relationship the schema (and its nested schemas, recursively) dumps is
+    eager-loaded, so serializing a list costs a fixed number of queries instead of
+    lazy loads per row. Fields excluded through `only`/`exclude` are not loaded.
+    """
+    plan = _plans.get(schema)
+    if plan is None:
+        model = _schema_model(schema)
+        plan = tuple(_options(schema, model)) if model is not None else ()
+        _plans[schema] = plan
+    return plan
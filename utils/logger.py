@@ -1,23 +1,37 @@
+from datetime import datetime
+
 from flask import request, g
 
-from Models.ActivityLogs import ActivityLog
-from extentions import db
+from utils.account_cache import get_account
+from utils.activity_log_writer import activity_log_writer
 
 
 def log_activity(action, details=None):
+    """
+    Record an activity log entry for the current user in the tenant's database.
+
+    The row is handed to the background writer and inserted in a later batch, so
+    the request does not pay for a commit. Entries may be dropped under overload.
+    """
     try:
         user_id = getattr(g, 'user', {}).get('id', None)
         if not user_id:
             return  # Skip if user is not identified
 
-        log = ActivityLog(
-            user_id=user_id,
-            action=action,
-            details=details,
-            ip_address=request.remote_addr
-        )
-        db.session.add(log)
-        db.session.commit()
+        account = getattr(g, 'account', None)
+        if account is None:
+            account_uid = (request.view_args or {}).get('account_uid')
+            account = get_account(account_uid) if account_uid else None
+        if not account:
+            return  # Skip if the tenant is unknown
+
+        activity_log_writer.enqueue(account["id"], account["db_uri"], {
+            "user_id": user_id,
+            "action": action,
+            "details": details,
+            "ip_address": request.remote_addr,
+            "created_at": datetime.utcnow(),
+        })
     except Exception as e:
         # Optionally log to stderr if logging fails
         print(e)
@@ -0,0 +1,54 @@
+from sqlalchemy import and_, case, event, or_, update
+from sqlalchemy.orm import Session
+
+from Models.Orders import Orders
+from utils.order_search import ITEM_TYPES, has_items
+
+MIXED = "mixed"
+
+
+def order_kind_expression():
+    """
+    SQL classification of an order by its items: the item type when the order
+    holds a single type of item, "mixed" for several, NULL for none.
+    """
+    present = {name: has_items(items) for name, (items, _, _) in ITEM_TYPES.items()}
+    whens = [
+        (and_(*[exists if other == name else ~exists for other, exists in present.items()]), name)
+        for name in present
+    ]
+    whens.append((or_(*present.values()), MIXED))
+    return case(*whens, else_=None)
+
+
+def refresh_order_kind(connection, order_ids):
+    """Recompute the persisted order_kind of `order_ids` in one UPDATE."""
+    if order_ids:
+        connection.execute(
+            update(Orders).where(Orders.id.in_(order_ids)).values(order_kind=order_kind_expression())
+        )
+
+
+# --- Write tracking -------------------------------------------------------------
+# Items are usually added by order_id rather than through the relationships, so
+# the kind is recomputed in SQL for every order whose items were flushed.
+
+_ITEM_MODELS = tuple(items for items, _, _ in ITEM_TYPES.values())
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_flushed_orders(session, flush_context):
+    order_ids = {obj.id for obj in session.new if isinstance(obj, Orders)}
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, _ITEM_MODELS) and obj.order_id is not None:
+            order_ids.add(obj.order_id)
+    order_ids -= {obj.id for obj in session.deleted if isinstance(obj, Orders)}
+    if not order_ids:
+        return
+
+    refresh_order_kind(session.connection(), order_ids)
+    # Loaded orders pick up the new value on next access
+    for order_id in order_ids:
+        order = session.identity_map.get(session.identity_key(Orders, order_id))
+        if order is not None:
+            session.expire(order, ["order_kind"])
@@ -0,0 +1,118 @@
+from sqlalchemy import distinct, exists, func, or_
+from sqlalchemy.orm import aliased
+
+from Models.LabTest import LabTest
+from Models.Medicine import Medicine
+from Models.Orders import Orders
+from Models.Prescriptions import Prescriptions
+from Models.PurchaseOrder import PurchaseOrder
+from Models.PurchaseSurgery import PurchaseSurgery
+from Models.PurchaseTest import PurchaseTest
+from Models.SurgeryType import SurgeryType
+from Models.Users import User
+from utils.search import search_filter
+
+ORDER_TYPES = ("medicine", "lab_test", "surgery", "prescription")
+
+# order_type -> (item table, named catalogue entry, item -> catalogue join)
+ITEM_TYPES = {
+    "medicine": (PurchaseOrder, Medicine, PurchaseOrder.medicine_id == Medicine.id),
+    "lab_test": (PurchaseTest, LabTest, PurchaseTest.test_id == LabTest.id),
+    "surgery": (PurchaseSurgery, SurgeryType, PurchaseSurgery.surgery_type_id == SurgeryType.id),
+}
+
+Doctor = aliased(User)
+
+
+def has_items(items, *conditions):
+    """Correlated EXISTS: the order has at least one `items` row matching `conditions`."""
+    return exists().where(items.order_id == Orders.id, *conditions)
+
+
+def orders_query(session, order_type=None):
+    """
+    Orders of one `order_type`, one row per order. Item types are filtered on
+    the indexed order_kind column (see utils.order_kind) rather than joins, so no
+    DISTINCT is needed; only many-to-one tables (patient, prescription, doctor)
+    are joined.
+    """
+    query = session.query(Orders).join(User, User.id == Orders.user_id)
+    if order_type in ITEM_TYPES:
+        # 🔹 Strict type: items of this type only, persisted as order_kind
+        query = query.filter(Orders.order_kind == order_type)
+    elif order_type == "prescription":
+        query = query.join(Prescriptions, Prescriptions.id == Orders.prescription_id)
+        query = query.join(Doctor, Doctor.id == Prescriptions.doctor_id)
+    return query
+
+
+def order_search_filter(order_type, q):
+    """
+    Search clause for `q` within `order_type` orders.
+
+    Names and phone numbers are matched exactly but case-insensitively as
+    `lower(col) = :q`, served by the lower() functional indexes; e-mails and
+    notes are substring matches served by the trigram indexes.
+    """
+    q = q.strip()
+    if order_type == "prescription":
+        return search_filter(q, User.email, Doctor.email, Doctor.name, Prescriptions.notes)
+
+    term = q.lower()
+    clauses = [
+        search_filter(q, User.email),
+        func.lower(Orders.taken_by) == term,
+        func.lower(Orders.taken_by_phone_no) == term,
+    ]
+    if order_type in ITEM_TYPES:
+        items, named, on = ITEM_TYPES[order_type]
+        clauses.append(has_items(items, on, func.lower(named.name) == term))
+    return or_(*clauses)
+
+
+COUNTER_NAMES = (
+    "total_records", "today_orders", "total_purchase_items", "total_pending_tests",
+    "total_pending_surgeries", "total_in_progress_surgeries", "total_completed_surgeries",
+)
+
+
+def _item_counters(order_type):
+    """Labelled aggregates over the items of `order_type` orders."""
+    if order_type == "medicine":
+        return [func.coalesce(func.sum(PurchaseOrder.quantity), 0).label("total_purchase_items")]
+    if order_type == "lab_test":
+        return [
+            func.count(PurchaseTest.id).label("total_purchase_items"),
+            func.count(PurchaseTest.id).filter(PurchaseTest.result.is_(None)).label("total_pending_tests"),
+        ]
+    if order_type == "surgery":
+        return [
+            func.count(PurchaseSurgery.id).label("total_purchase_items"),
+            func.count(PurchaseSurgery.id).filter(PurchaseSurgery.status == "SCHEDULED").label("total_pending_surgeries"),
+            func.count(PurchaseSurgery.id).filter(PurchaseSurgery.status == "IN_PROGRESS").label("total_in_progress_surgeries"),
+            func.count(PurchaseSurgery.id).filter(PurchaseSurgery.status == "COMPLETED").label("total_completed_surgeries"),
+        ]
+    return []
+
+
+def order_counters(query, order_type):
+    """
+    Every list counter of `order_type` orders matched by `query`, in a single
+    aggregate: the item table is outer-joined once and order-level counts use
+    COUNT(DISTINCT orders.id), the rest FILTER clauses. Counters that do not
+    apply to the type are 0.
+    """
+    counters = dict.fromkeys(COUNTER_NAMES, 0)
+    if order_type is None:
+        return counters
+
+    if order_type in ITEM_TYPES:
+        items = ITEM_TYPES[order_type][0]
+        query = query.outerjoin(items, items.order_id == Orders.id)
+    row = query.with_entities(
+        func.count(distinct(Orders.id)).label("total_records"),
+        func.count(distinct(Orders.id)).filter(Orders.received_date == func.current_date()).label("today_orders"),
+        *_item_counters(order_type),
+    ).one()
+    counters.update({name: int(value or 0) for name, value in row._asdict().items()})
+    return counters
@@ -0,0 +1,94 @@
+import base64
+import json
+import os
+from datetime import datetime
+
+from flask import request, Response, stream_with_context
+from sqlalchemy import select, tuple_
+
+DEFAULT_KEYSET_LIMIT = 20
+# Hard cap on rows returned by one list call, including calls without page/limit
+MAX_PAGE_SIZE = int(os.environ.get("MAX_PAGE_SIZE", 500))
+STREAM_BATCH_SIZE = int(os.environ.get("STREAM_BATCH_SIZE", 500))
+
+
+def encode_cursor(created_at, row_id):
+    payload = json.dumps([created_at.isoformat(), row_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def keyset_requested():
+    """True when the client asked for keyset paging (`cursor` — empty for the first page — or `after_id`)."""
+    return "cursor" in request.args or "after_id" in request.args
+
+
+def keyset_paginate(query, model, limit=None):
+    """
+    Page through `query` ordered by (model.created_at, model.id) without OFFSET.
+
+    Reads `cursor`, `after_id` and `limit` from the request args. `cursor` is the opaque
+    `next_cursor` from a previous page; `after_id` starts right after the row with that id.
+    Returns (items, limit, next_cursor); next_cursor is None on the last page.
+    Raises ValueError for a malformed cursor.
+    """
+    limit = limit or request.args.get("limit", default=DEFAULT_KEYSET_LIMIT, type=int)
+    if limit < 1:
+        limit = DEFAULT_KEYSET_LIMIT
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    cursor = request.args.get("cursor")
+    after_id = request.args.get("after_id", type=int)
+    position = tuple_(model.created_at, model.id)
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(position > tuple_(created_at, row_id))
+    elif after_id is not None:
+        anchor = select(model.created_at).where(model.id == after_id).scalar_subquery()
+        query = query.filter(position > tuple_(anchor, after_id))
+
+    items = query.order_by(model.created_at, model.id).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+    return items, limit, next_cursor
+
+
+def stream_requested():
+    return request.args.get("stream", "").lower() in ("1", "true", "yes")
+
+
+def stream_ndjson(query, serializer, session, batch_size=STREAM_BATCH_SIZE):
+    """
+    Stream every row of `query` as newline-delimited JSON.
+
+    Rows are fetched with a server-side cursor in batches of `batch_size` and dumped
+    batch by batch, so memory stays flat regardless of table size. The generator
+    runs after the view returns, so it owns `session` and closes it when done.
+    """
+    def generate():
+        try:
+            batch = []
+            for row in query.yield_per(batch_size):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    for item in serializer.dump(batch, many=True):
+                        yield json.dumps(item, default=str) + "\n"
+                    batch = []
+            for item in serializer.dump(batch, many=True):
+                yield json.dumps(item, default=str) + "\n"
+        finally:
+            session.close()
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
@@ -0,0 +1,121 @@
+import os
+
+from Models.UserType import UserType
+from Models.Users import User
+from utils.cache import TTLCache
+
+# (account id, username) -> compact principal dict used to populate g.user
+principal_cache = TTLCache(
+    maxsize=int(os.environ.get("PRINCIPAL_CACHE_SIZE", 4096)),
+    ttl=int(os.environ.get("PRINCIPAL_CACHE_TTL", 60)),
+)
+
+# (account id, username) -> the user's current token_version. Tokens carrying an older
+# version fall back to the database. Kept short so a revocation made by another worker
+# process is honoured within PRINCIPAL_VERSION_TTL seconds.
+token_versions = TTLCache(
+    maxsize=int(os.environ.get("PRINCIPAL_CACHE_SIZE", 4096)),
+    ttl=int(os.environ.get("PRINCIPAL_VERSION_TTL", 10)),
+)
+
+CLAIMS_KEY = "principal"
+
+# Changing any of these user columns revokes the tokens issued so far
+PRINCIPAL_FIELDS = ("username", "user_type_id", "department_id", "is_active", "is_deleted")
+
+
+def load_principal(tenant_session, account_id, username):
+    """
+    Return the authenticated user's principal for a tenant:
+    {"id", "username", "user_type_id", "user_type": {"id", "type"}, "department_id", "is_active"}.
+
+    Only the columns needed for authorization are selected, and the result is cached
+    for a short TTL keyed by the JWT identity. Returns None if the user does not exist.
+    """
+    def load():
+        row = (
+            tenant_session.query(
+                User.id, User.username, User.user_type_id, UserType.type,
+                User.department_id, User.is_active,
+            )
+            .outerjoin(UserType, UserType.id == User.user_type_id)
+            .filter(User.username == username)
+            .first()
+        )
+        if not row:
+            return None
+        return {
+            "id": row.id,
+            "username": row.username,
+            "user_type_id": row.user_type_id,
+            "user_type": {"id": row.user_type_id, "type": row.type},
+            "department_id": row.department_id,
+            "is_active": row.is_active,
+        }
+
+    return principal_cache.get_or_load((str(account_id), username), load)
+
+
+def invalidate_principal(account_id, *usernames):
+    """Forget cached principals of a tenant, either for the given usernames or all of them."""
+    account_id = str(account_id)
+
+    def matches(key):
+        return key[0] == account_id and (not usernames or key[1] in usernames)
+
+    principal_cache.invalidate_where(matches)
+    token_versions.invalidate_where(matches)
+
+
+def revoke_tokens(user):
+    """Invalidate every token issued to `user` so far, once the caller commits."""
+    user.token_version = User.token_version + 1
+
+
+def current_token_version(tenant_session, account_id, username):
+    """The user's token_version (briefly cached), or None if the user does not exist."""
+    return token_versions.get_or_load(
+        (str(account_id), username),
+        lambda: tenant_session.query(User.token_version).filter(User.username == username).limit(1).scalar(),
+    )
+
+
+def principal_claims(user, account_id, version):
+    """Build the additional JWT claims that let later requests authorize without a user lookup."""
+    return {
+        CLAIMS_KEY: {
+            "id": user.id,
+            "username": user.username,
+            "user_type_id": user.user_type_id,
+            "user_type": user.user_type.type if user.user_type else None,
+            "department_id": user.department_id,
+            "is_active": user.is_active,
+            "tenant_id": str(account_id),
+            "version": version,
+            "token_version": user.token_version,
+        }
+    }
+
+
+def principal_from_claims(claims, tenant_session, account_id, version):
+    """
+    Rebuild the principal from verified JWT claims.
+    Returns None when the token has no embedded principal, belongs to another tenant,
+    was issued under a different claims version or carries an older token_version
+    than the user's (the user was changed or deactivated since it was issued).
+    """
+    data = (claims or {}).get(CLAIMS_KEY)
+    if not data or data.get("tenant_id") != str(account_id) or data.get("version") != version:
+        return None
+
+    if data.get("token_version") != current_token_version(tenant_session, account_id, data.get("username")):
+        return None
+
+    return {
+        "id": data["id"],
+        "username": data["username"],
+        "user_type_id": data["user_type_id"],
+        "user_type": {"id": data["user_type_id"], "type": data["user_type"]},
+        "department_id": data["department_id"],
+        "is_active": data["is_active"],
+    }
@@ -0,0 +1,43 @@
+from sqlalchemy import Enum, Index, String, cast, func, or_, text
+
+ESCAPE = "/"
+
+
+def escape_like(value):
+    """Escape LIKE wildcards so user input is matched literally."""
+    return value.replace(ESCAPE, ESCAPE * 2).replace("%", ESCAPE + "%").replace("_", ESCAPE + "_")
+
+
+def searchable(column):
+    """
+    Text form of a column for substring search: non-string columns are cast to VARCHAR.
+    Enum is a String subclass, but Postgres has no ILIKE for enum types, so it is cast too.
+    """
+    if isinstance(column.type, String) and not isinstance(column.type, Enum):
+        return column
+    return cast(column, String)
+
+
+def search_filter(q, *columns):
+    """
+    Case-insensitive substring match of `q` against any of `columns`:
+
+        query = query.filter(search_filter(q, User.name, User.email, Payment.amount))
+
+    Renders `col ILIKE '%q%'`, which the pg_trgm GIN indexes on the searched
+    columns (see the trigram search migration) serve without a sequential scan.
+    Non-string columns are compared through CAST(col AS VARCHAR), matching the
+    expression indexes on integer columns.
+    """
+    pattern = f"%{escape_like(q.strip())}%"
+    return or_(*[searchable(column).ilike(pattern, escape=ESCAPE) for column in columns])
+
+
+def trigram_index(table, column):
+    """pg_trgm GIN index letting `column ILIKE '%...%'` (and so search_filter) use an index scan."""
+    return Index(f"ix_{table}_{column}_trgm", column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"})
+
+
+def lower_index(table, column):
+    """Functional index on lower(column), serving case-insensitive equality `lower(col) = :value`."""
+    return Index(f"ix_{table}_{column}_lower", func.lower(text(column)))
@@ -0,0 +1,136 @@
+from datetime import datetime
+
+from sqlalchemy import event, select, update, delete, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from Models.Appointments import Appointment
+from Models.Orders import Orders
+from Models.SearchEntries import SearchEntry
+from Models.Users import User
+
+USER = "user"
+ORDER = "order"
+APPOINTMENT = "appointment"
+ENTITY_TYPES = (USER, ORDER, APPOINTMENT)
+
+
+def _text(*parts):
+    # Same shape as lower(concat_ws(' ', ...)) used by the backfill migration
+    return " ".join(str(part) for part in parts if part is not None).lower()
+
+
+def _user_document(user, names):
+    if user.is_deleted:
+        return None
+    return {
+        "title": user.name,
+        "subtitle": user.email,
+        "search_text": _text(user.name, user.username, user.email, user.phone_no),
+        "patient_id": user.id,
+        "patient_name": user.name,
+    }
+
+
+def _order_document(order, names):
+    return {
+        "title": f"Order #{order.id}",
+        "subtitle": order.taken_by,
+        "search_text": _text("order", order.id, order.taken_by, order.taken_by_phone_no),
+        "patient_id": order.user_id,
+        "patient_name": names.get(order.user_id),
+    }
+
+
+def _appointment_document(appointment, names):
+    if appointment.is_deleted:
+        return None
+    day = appointment.appointment_date.strftime("%Y-%m-%d") if appointment.appointment_date else None
+    return {
+        "title": f"Appointment {day}" if day else "Appointment",
+        "subtitle": appointment.status,
+        "search_text": _text("appointment", day, appointment.status, appointment.reason),
+        "patient_id": appointment.patient_id,
+        "patient_name": names.get(appointment.patient_id),
+    }
+
+
+# Model -> (entity type, document builder). A builder returning None removes the entry.
+DOCUMENTS = {
+    User: (USER, _user_document),
+    Orders: (ORDER, _order_document),
+    Appointment: (APPOINTMENT, _appointment_document),
+}
+
+
+def _patient_names(connection, objects):
+    """Names of the patients referenced by the flushed orders/appointments, in one query."""
+    ids = set()
+    for obj in objects:
+        if isinstance(obj, Orders):
+            ids.add(obj.user_id)
+        elif isinstance(obj, Appointment):
+            ids.add(obj.patient_id)
+    ids.discard(None)
+    names = {obj.id: obj.name for obj in objects if isinstance(obj, User)}
+    missing = ids - names.keys()
+    if missing:
+        names.update(connection.execute(select(User.id, User.name).where(User.id.in_(missing))).all())
+    return names
+
+
+def sync_search_entries(connection, changed, deleted=()):
+    """Upsert the search documents of `changed` objects and drop those of `deleted` ones."""
+    changed = [obj for obj in changed if type(obj) in DOCUMENTS]
+    removed = [(DOCUMENTS[type(obj)][0], obj.id) for obj in deleted if type(obj) in DOCUMENTS]
+
+    names = _patient_names(connection, changed)
+    now = datetime.utcnow()
+    rows = []
+    for obj in changed:
+        entity_type, build = DOCUMENTS[type(obj)]
+        document = build(obj, names)
+        if document is None:
+            removed.append((entity_type, obj.id))
+        else:
+            rows.append({"entity_type": entity_type, "entity_id": obj.id, "updated_at": now, **document})
+
+    if removed:
+        connection.execute(
+            delete(SearchEntry).where(tuple_(SearchEntry.entity_type, SearchEntry.entity_id).in_(removed))
+        )
+    if rows:
+        statement = insert(SearchEntry.__table__)
+        connection.execute(
+            statement.on_conflict_do_update(
+                index_elements=["entity_type", "entity_id"],
+                set_={column: statement.excluded[column] for column in (
+                    "title", "subtitle", "search_text", "patient_id", "patient_name", "updated_at")},
+            ),
+            rows,
+        )
+
+    # A renamed patient shows up under the new name on their orders and appointments too
+    for obj in changed:
+        if isinstance(obj, User) and not obj.is_deleted:
+            connection.execute(
+                update(SearchEntry)
+                .where(SearchEntry.patient_id == obj.id, SearchEntry.entity_type != USER,
+                       SearchEntry.patient_name.is_distinct_from(obj.name))
+                .values(patient_name=obj.name)
+            )
+
+
+# --- Write tracking -------------------------------------------------------------
+# Only tenant sessions (carrying an account id, see utils.tenant_engines) are synced.
+# Entries are written on the flushing connection, so they commit or roll back with
+# the change itself.
+
+@event.listens_for(Session, "after_flush")
+def _sync_flushed(session, flush_context):
+    if "account_id" not in session.info:
+        return
+    changed = [obj for obj in list(session.new) + list(session.dirty) if type(obj) in DOCUMENTS]
+    deleted = [obj for obj in session.deleted if type(obj) in DOCUMENTS]
+    if changed or deleted:
+        sync_search_entries(session.connection(), changed, deleted)
@@ -0,0 +1,201 @@
+import os
+from itertools import chain
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from Models.staffSchedule import StaffSchedule, Schedule, ScheduleStatusEnum
+from utils.cache import TTLCache
+
+DAY = 24 * 60  # minutes
+
+# Shifts in these states do not make the staff member available
+OFF_SHIFT_STATUSES = (ScheduleStatusEnum.cancelled,)
+
+
+def minutes(value):
+    """Minutes since midnight of a datetime.time."""
+    return value.hour * 60 + value.minute
+
+
+def spans(start, end):
+    """Half-open minute ranges covered by start..end; a shift ending before it starts runs past midnight."""
+    start, end = minutes(start), minutes(end)
+    if start < end:
+        return [(start, end)]
+    if start > end:
+        return [(start, DAY), (0, end)] if end else [(start, DAY)]
+    return []
+
+
+class IntervalTree:
+    """
+    Static centered interval tree over half-open [start, end) intervals carrying a
+    value. `overlapping(start, end)` returns the values of every interval
+    intersecting the query in O(log n + k).
+    """
+
+    def __init__(self, intervals):
+        self._root = self._build([interval for interval in intervals if interval[0] < interval[1]])
+
+    def _build(self, intervals):
+        if not intervals:
+            return None
+        center = sorted(start for start, _, _ in intervals)[len(intervals) // 2]
+        left, here, right = [], [], []
+        for interval in intervals:
+            if interval[1] <= center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        return (
+            center,
+            sorted(here, key=lambda interval: interval[0]),
+            sorted(here, key=lambda interval: interval[1], reverse=True),
+            self._build(left),
+            self._build(right),
+        )
+
+    def overlapping(self, start, end):
+        found = []
+        node = self._root
+        stack = [node] if node else []
+        while stack:
+            center, by_start, by_end, left, right = stack.pop()
+            if end <= center:
+                # Everything here ends after center >= end; keep those starting before end
+                found.extend(value for s, _, value in _take_while(by_start, lambda i: i[0] < end))
+                if left:
+                    stack.append(left)
+            elif start >= center:
+                # Everything here starts at or before center <= start; keep those ending after start
+                found.extend(value for _, _, value in _take_while(by_end, lambda i: i[1] > start))
+                if right:
+                    stack.append(right)
+            else:
+                found.extend(value for _, _, value in by_start)
+                stack.extend(child for child in (left, right) if child)
+        return found
+
+
+def _take_while(intervals, predicate):
+    for interval in intervals:
+        if not predicate(interval):
+            break
+        yield interval
+
+
+def find_overlaps(items):
+    """Pairs of (start, end, value) items whose time ranges intersect, by a sweep over start times."""
+    ranges = sorted(
+        (span_start, span_end, value)
+        for start, end, value in items
+        for span_start, span_end in spans(start, end)
+    )
+    overlaps = []
+    active = []
+    for start, end, value in ranges:
+        active = [other for other in active if other[1] > start]
+        overlaps.extend((other[2], value) for other in active if other[2] != value)
+        active.append((start, end, value))
+    return overlaps
+
+
+class _TenantSchedules:
+    """Shifts and booked items of one tenant, indexed by time of day."""
+
+    def __init__(self, shifts, items):
+        self.shifts = {}  # staff id -> [(start, end)] minutes, for staff on duty
+        for staff_id, start, end, status in shifts:
+            if status not in OFF_SHIFT_STATUSES:
+                self.shifts.setdefault(staff_id, []).extend(spans(start, end))
+        self.items = IntervalTree(
+            (span_start, span_end, (staff_id, item_id, title))
+            for item_id, staff_id, title, start, end in items
+            for span_start, span_end in spans(start, end)
+        )
+
+    def on_shift(self, staff_id, start, end):
+        return any(shift_start <= start and end <= shift_end for shift_start, shift_end in self.shifts.get(staff_id, ()))
+
+
+_schedules = TTLCache(
+    maxsize=int(os.environ.get("STAFF_AVAILABILITY_CACHE_SIZE", 256)),
+    ttl=int(os.environ.get("STAFF_AVAILABILITY_TTL", 600)),
+)
+
+
+def _load(tenant_session):
+    shifts = tenant_session.query(
+        StaffSchedule.staff_id, StaffSchedule.start_time, StaffSchedule.end_time, StaffSchedule.status,
+    ).all()
+    items = (
+        tenant_session.query(Schedule.id, StaffSchedule.staff_id, Schedule.title, Schedule.start_time, Schedule.end_time)
+        .join(StaffSchedule, StaffSchedule.id == Schedule.staff_schedule_id)
+        .filter(StaffSchedule.status.notin_(OFF_SHIFT_STATUSES))
+        .all()
+    )
+    return _TenantSchedules(shifts, items)
+
+
+def free_busy(tenant_session, account_id, start, end, staff_ids=None):
+    """
+    Availability of staff between two datetime.time values (a window ending before
+    it starts runs past midnight), in one call for any number of staff:
+
+        {"free": [staff ids], "busy": [{"staff_id", "conflicts": [{"id", "title"}]}], "off_shift": [staff ids]}
+
+    A staff member is free when their shift covers the whole window and none of
+    their schedule items overlaps it. `staff_ids` limits the answer, otherwise
+    every staff member with a schedule is included. The tenant's schedules are
+    indexed in memory and rebuilt after the next committed schedule write.
+    """
+    schedules = _schedules.get_or_load(str(account_id), lambda: _load(tenant_session))
+    window = spans(start, end)
+
+    busy = {}
+    for window_start, window_end in window:
+        for staff_id, item_id, title in schedules.items.overlapping(window_start, window_end):
+            conflicts = busy.setdefault(staff_id, [])
+            if all(conflict["id"] != item_id for conflict in conflicts):
+                conflicts.append({"id": item_id, "title": title})
+
+    candidates = set(schedules.shifts) if staff_ids is None else set(staff_ids)
+    free, off_shift = [], []
+    for staff_id in sorted(candidates):
+        if not window or not all(schedules.on_shift(staff_id, s, e) for s, e in window):
+            off_shift.append(staff_id)
+        elif staff_id not in busy:
+            free.append(staff_id)
+    return {
+        "free": free,
+        "busy": [
+            {"staff_id": staff_id, "conflicts": busy[staff_id]} for staff_id in sorted(candidates) if staff_id in busy
+        ],
+        "off_shift": [staff_id for staff_id in off_shift if staff_id not in busy],
+    }
+
+
+# --- Write tracking -------------------------------------------------------------
+# Tenant sessions carry their account id in session.info (see utils.tenant_engines).
+# Committed schedule writes drop the tenant's index; it is rebuilt on next query.
+
+@event.listens_for(Session, "after_flush")
+def _collect_schedule_writes(session, flush_context):
+    if "account_id" not in session.info:
+        return
+    if any(isinstance(obj, (StaffSchedule, Schedule)) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info["schedules_dirty"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_schedules(session):
+    if session.info.pop("schedules_dirty", None):
+        _schedules.invalidate(str(session.info["account_id"]))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _keep_schedules(session, previous_transaction):
+    session.info.pop("schedules_dirty", None)
@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+from datetime import datetime
+from itertools import chain
+
+from sqlalchemy import event, func, case
+from sqlalchemy.orm import Session
+
+from Models.Appointments import Appointment
+from Models.Emergencies import Emergency
+from Models.Payments import Payment
+from Models.UserType import UserType
+from Models.Users import User
+from Models.WardBeds import WardBeds
+from Models.Wards import Ward
+from utils.aggregates import summarize, count_if, sum_if
+from utils.cache import TTLCache
+
+# Snapshots older than this are rebuilt in full on the next read, which also rolls
+# date-based metrics (today's appointments, this month's revenue) over.
+STATS_SNAPSHOT_TTL = int(os.environ.get("STATS_SNAPSHOT_TTL", 300))
+
+
+def _user_stats(tenant_session):
+    return summarize(
+        tenant_session.query(User).join(UserType, UserType.id == User.user_type_id),
+        total_patients=count_if(UserType.type.ilike("%patient%")),
+        available_doctors=count_if(UserType.type.ilike("%doctor%")),
+    )
+
+
+def _appointment_stats(tenant_session):
+    return summarize(
+        tenant_session.query(Appointment),
+        todays_appointments=count_if(func.date(Appointment.appointment_date) == func.current_date()),
+    )
+
+
+def _emergency_stats(tenant_session):
+    return summarize(
+        tenant_session.query(Emergency),
+        todays_emergencies=count_if(Emergency.status == 'active'),
+    )
+
+
+def _bed_stats(tenant_session):
+    stats = summarize(
+        tenant_session.query(WardBeds),
+        total_beds=count_if(),
+        occupied_beds=count_if(WardBeds.status == "ACTIVE"),
+    )
+    ward_counts = (
+        tenant_session.query(
+            Ward.ward_type,
+            func.count(WardBeds.id).label("total_beds"),
+            func.count(case((WardBeds.patient_id == None, 1))).label("available_beds"),
+        )
+        .outerjoin(WardBeds, WardBeds.ward_id == Ward.id)  # include wards with 0 beds
+        .group_by(Ward.ward_type)
+        .all()
+    )
+    stats["wards"] = {
+        ward_type: {"total_beds": total, "available_beds": available}
+        for ward_type, total, available in ward_counts
+    }
+    return stats
+
+
+def _revenue_stats(tenant_session):
+    return summarize(
+        tenant_session.query(Payment),
+        monthly_revenue=sum_if(
+            Payment.amount,
+            func.date_trunc('month', Payment.created_at) == func.date_trunc('month', func.current_date()),
+        ),
+    )
+
+
+# Metric group -> (function computing it, models whose writes make it stale)
+STATS_GROUPS = {
+    "users": (_user_stats, (User, UserType)),
+    "appointments": (_appointment_stats, (Appointment,)),
+    "emergencies": (_emergency_stats, (Emergency,)),
+    "beds": (_bed_stats, (WardBeds, Ward)),
+    "revenue": (_revenue_stats, (Payment,)),
+}
+_MODEL_GROUPS = {model: group for group, (_, models) in STATS_GROUPS.items() for model in models}
+
+_snapshots = TTLCache(maxsize=int(os.environ.get("STATS_CACHE_SIZE", 256)), ttl=STATS_SNAPSHOT_TTL)
+_dirty = {}  # account id -> set of stale metric groups
+_lock = threading.Lock()
+
+
+def mark_stats_dirty(account_id, groups=None):
+    """Flag metric groups of a tenant (all of them by default) for recomputation on the next read."""
+    with _lock:
+        _dirty.setdefault(str(account_id), set()).update(groups or STATS_GROUPS.keys())
+
+
+def get_tenant_stats(tenant_session, account_id):
+    """
+    Return the tenant's dashboard snapshot: {"as_of": iso timestamp, "metrics": {...}}.
+
+    A missing or expired snapshot is computed in full. Otherwise only the groups that
+    were written to since the last read are recomputed, and `as_of` reports the age of
+    the oldest group still being served.
+    """
+    key = str(account_id)
+    with _lock:
+        dirty = _dirty.pop(key, set())
+
+    snapshot = _snapshots.get(key)
+    if snapshot is None:
+        snapshot = {"created": time.monotonic(), "refreshed": {}, "metrics": {}}
+        dirty = set(STATS_GROUPS)
+    elif not dirty:
+        return snapshot
+
+    metrics = dict(snapshot["metrics"])
+    refreshed = dict(snapshot["refreshed"])
+    now = datetime.utcnow()
+    for group in dirty:
+        metrics.update(STATS_GROUPS[group][0](tenant_session))
+        refreshed[group] = now
+
+    snapshot = {
+        "created": snapshot["created"],
+        "refreshed": refreshed,
+        "metrics": metrics,
+        "as_of": min(refreshed.values()).isoformat(),
+    }
+    remaining = STATS_SNAPSHOT_TTL - (time.monotonic() - snapshot["created"])
+    _snapshots.set(key, snapshot, ttl=max(remaining, 0))
+    return snapshot
+
+
+# --- Write tracking -------------------------------------------------------------
+# Tenant sessions carry their account id in session.info (see utils.tenant_engines).
+# Flushed changes to tracked models mark the matching groups dirty once the
+# transaction commits.
+
+@event.listens_for(Session, "after_flush")
+def _collect_stale_groups(session, flush_context):
+    if "account_id" not in session.info:
+        return
+    groups = session.info.setdefault("stats_dirty", set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        group = _MODEL_GROUPS.get(type(obj))
+        if group:
+            groups.add(group)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_stale_groups(session):
+    groups = session.info.pop("stats_dirty", None)
+    if groups:
+        mark_stats_dirty(session.info["account_id"], groups)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_stale_groups(session, previous_transaction):
+    session.info.pop("stats_dirty", None)
@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+
+class TenantEngineRegistry:
+    """
+    Process-wide registry of tenant engines keyed by AccountInfo.id.
+
+    Each tenant gets one pooled engine that is reused across requests instead of
+    opening (and disposing) a fresh engine per call. The registry is bounded:
+    least recently used tenants are evicted once `max_engines` is reached, and
+    tenants idle for longer than `idle_timeout` seconds are disposed lazily.
+    """
+
+    def __init__(self, max_engines=32, idle_timeout=900, pool_size=5, max_overflow=5,
+                 pool_timeout=30, pool_recycle=1800):
+        self.max_engines = max_engines
+        self.idle_timeout = idle_timeout
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_timeout = pool_timeout
+        self.pool_recycle = pool_recycle
+
+        self._lock = threading.RLock()
+        self._entries = OrderedDict()  # account_id -> {"engine", "session_factory", "db_uri", "last_used"}
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "disposals": 0}
+
+    def _create_entry(self, account_id, db_uri):
+        engine = create_engine(
+            db_uri,
+            poolclass=QueuePool,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_timeout=self.pool_timeout,
+            pool_recycle=self.pool_recycle,
+            pool_pre_ping=True,
+        )
+        return {
+            "engine": engine,
+            # account_id lets session event hooks know which tenant a write belongs to
+            "session_factory": sessionmaker(bind=engine, info={"account_id": account_id}),
+            "db_uri": db_uri,
+            "last_used": time.monotonic(),
+            "sessions": 0,
+        }
+
+    def _evict_idle(self, now):
+        # Entries are kept in LRU order, so idle tenants are always at the front
+        while self._entries:
+            account_id, entry = next(iter(self._entries.items()))
+            if now - entry["last_used"] < self.idle_timeout:
+                break
+            self._pop(account_id)
+            self._counters["evictions"] += 1
+
+    def _pop(self, account_id):
+        entry = self._entries.pop(account_id, None)
+        if entry:
+            entry["engine"].dispose()
+            self._counters["disposals"] += 1
+        return entry
+
+    def get_entry(self, account_id, db_uri):
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+
+            entry = self._entries.get(account_id)
+            if entry and entry["db_uri"] != db_uri:
+                # Tenant was moved to another database, drop the stale pool
+                self._pop(account_id)
+                entry = None
+
+            if entry:
+                self._counters["hits"] += 1
+                self._entries.move_to_end(account_id)
+            else:
+                self._counters["misses"] += 1
+                entry = self._create_entry(account_id, db_uri)
+                self._entries[account_id] = entry
+                while len(self._entries) > self.max_engines:
+                    oldest_id = next(iter(self._entries))
+                    self._pop(oldest_id)
+                    self._counters["evictions"] += 1
+
+            entry["last_used"] = now
+            entry["sessions"] += 1
+            return entry
+
+    def get_engine(self, account_id, db_uri):
+        return self.get_entry(account_id, db_uri)["engine"]
+
+    def get_session(self, account_id, db_uri):
+        return self.get_entry(account_id, db_uri)["session_factory"]()
+
+    def dispose(self, account_id=None):
+        """Dispose one tenant engine, or every engine when no id is given."""
+        with self._lock:
+            if account_id is not None:
+                self._pop(account_id)
+                return
+            for key in list(self._entries):
+                self._pop(key)
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            tenants = {}
+            for account_id, entry in self._entries.items():
+                pool = entry["engine"].pool
+                tenants[account_id] = {
+                    "pool_size": pool.size(),
+                    "checked_in": pool.checkedin(),
+                    "checked_out": pool.checkedout(),
+                    "overflow": pool.overflow(),
+                    "sessions": entry["sessions"],
+                    "idle_seconds": round(now - entry["last_used"], 1),
+                }
+            return {
+                **self._counters,
+                "engines": len(self._entries),
+                "max_engines": self.max_engines,
+                "tenants": tenants,
+            }
+
+
+tenant_engines = TenantEngineRegistry(
+    max_engines=int(os.environ.get("TENANT_ENGINE_CACHE_SIZE", 32)),
+    idle_timeout=int(os.environ.get("TENANT_ENGINE_IDLE_TIMEOUT", 900)),
+    pool_size=int(os.environ.get("TENANT_POOL_SIZE", 5)),
+    max_overflow=int(os.environ.get("TENANT_POOL_MAX_OVERFLOW", 5)),
+    pool_timeout=int(os.environ.get("TENANT_POOL_TIMEOUT", 30)),
+    pool_recycle=int(os.environ.get("TENANT_POOL_RECYCLE", 1800)),
+)
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from sqlalchemy.dialects.postgresql import insert
+
+from Models.TokenCounters import TokenCounter
+
+NO_DEPARTMENT = 0
+
+
+def allocate_token_number(connection, department_id, day):
+    """
+    Next token number for `department_id` on `day`, as one atomic statement:
+
+        INSERT INTO token_counters ... VALUES (:department, :day, 1)
+        ON CONFLICT (department_key, token_date)
+        DO UPDATE SET last_number = token_counters.last_number + 1
+        RETURNING last_number
+
+    The counter row stays locked until the caller's transaction ends, so
+    concurrent allocations for the same queue are serialized and never collide,
+    and a rolled back token gives its number back. Numbers are gap-free in O(1),
+    without counting the day's tokens.
+    """
+    if isinstance(day, datetime):
+        day = day.date()
+    statement = insert(TokenCounter.__table__).values(
+        department_key=department_id or NO_DEPARTMENT, token_date=day, last_number=1,
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["department_key", "token_date"],
+        set_={"last_number": TokenCounter.__table__.c.last_number + 1},
+    ).returning(TokenCounter.__table__.c.last_number)
+    return connection.execute(statement).scalar_one()
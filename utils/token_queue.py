@@ -0,0 +1,231 @@
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from Models.Tokens import Token
+
+# Tokens being seen by the doctor, and tokens still waiting to be called
+SERVING_STATUS = "Confirmed"
+WAITING_STATUSES = ("Alloted", "Pending")
+STATUSES = ("Alloted", "Pending", "Confirmed", "Completed")
+
+# Queues are also rebuilt from the database after this many seconds, which picks
+# up writes made by other worker processes.
+TOKEN_QUEUE_TTL = int(os.environ.get("TOKEN_QUEUE_TTL", 30))
+TOKEN_QUEUE_NEXT = int(os.environ.get("TOKEN_QUEUE_NEXT", 5))
+
+
+def _day(value):
+    return value.date() if isinstance(value, datetime) else value
+
+
+class TokenQueues:
+    """
+    Waiting-room state of this worker process, one queue per (tenant, department, day).
+
+    A queue is loaded from the database on first use, then kept current from
+    Token writes committed in this process (see the session hooks below), so
+    displays read it without querying. Readers can block in `wait()` until a
+    queue changes.
+
+    Changes are not published between processes: with several workers, a write
+    made by another one shows up when the queue is reloaded, at most
+    TOKEN_QUEUE_TTL seconds later (`wait()` wakes up for that reload too).
+
+    Loads query the database outside the lock, one request per queue at a time;
+    Token changes committed while a load runs are replayed onto its result
+    before it is installed.
+    """
+
+    def __init__(self, max_queues=1024, ttl=TOKEN_QUEUE_TTL, next_size=TOKEN_QUEUE_NEXT):
+        self.max_queues = max_queues
+        self.ttl = ttl
+        self.next_size = next_size
+        self._changed = threading.Condition()
+        self._queues = OrderedDict()  # key -> {"tokens": {id: (number, status)}, "version", "loaded", "view"}
+        self._loading = {}  # key -> {token id: (number, status) or None} changed while the key is loading
+        self._versions = itertools.count(1)
+
+    @staticmethod
+    def _key(account_id, department_id, day):
+        return str(account_id), department_id, _day(day)
+
+    @staticmethod
+    def _load(session, key):
+        _, department_id, day = key
+        start = datetime.combine(day, datetime.min.time())
+        department = Token.department_id.is_(None) if department_id is None else Token.department_id == department_id
+        rows = (
+            session.query(Token.id, Token.token_number, Token.status)
+            .filter(department, Token.appointment_date >= start, Token.appointment_date < start + timedelta(days=1))
+            .all()
+        )
+        return {token_id: (number, status) for token_id, number, status in rows}
+
+    def _fresh(self, key):
+        """The loaded queue for `key` if it is within its TTL, else None. Called with the lock held."""
+        queue = self._queues.get(key)
+        if queue is not None and time.monotonic() - queue["loaded"] < self.ttl:
+            return queue
+        return None
+
+    def _queue(self, session, key):
+        """The queue for `key`, (re)loaded from the database if needed. Called without the lock."""
+        with self._changed:
+            while True:
+                queue = self._fresh(key)
+                if queue is not None:
+                    return queue
+                if key not in self._loading:
+                    break
+                self._changed.wait()  # another request is loading this queue
+            missed = self._loading[key] = {}
+
+        try:
+            tokens = self._load(session, key)
+        except Exception:
+            with self._changed:
+                del self._loading[key]
+                self._changed.notify_all()
+            raise
+
+        with self._changed:
+            del self._loading[key]
+            for token_id, token in missed.items():
+                if token is None:
+                    tokens.pop(token_id, None)
+                else:
+                    tokens[token_id] = token
+            queue = {"tokens": tokens, "version": next(self._versions), "loaded": time.monotonic(), "view": None}
+            self._queues[key] = queue
+            self._queues.move_to_end(key)
+            while len(self._queues) > self.max_queues:
+                self._queues.popitem(last=False)
+            self._changed.notify_all()
+            return queue
+
+    def _view(self, key, queue):
+        if queue["view"] is None:
+            tokens = sorted(queue["tokens"].values())
+            counts = dict.fromkeys(STATUSES, 0)
+            for _, status in tokens:
+                counts[status] = counts.get(status, 0) + 1
+            serving = [number for number, status in tokens if status == SERVING_STATUS]
+            queue["view"] = {
+                "department_id": key[1],
+                "date": key[2].isoformat(),
+                "version": queue["version"],
+                "now_serving": serving[0] if serving else None,
+                "next": [number for number, status in tokens if status in WAITING_STATUSES][:self.next_size],
+                "counts": counts,
+                "total": len(tokens),
+            }
+        return queue["view"]
+
+    def snapshot(self, session, account_id, department_id, day):
+        """Current state of a queue: now serving, the next numbers, counts by status."""
+        key = self._key(account_id, department_id, day)
+        queue = self._queue(session, key)
+        with self._changed:
+            return self._view(key, queue)
+
+    def wait(self, session, account_id, department_id, day, version, timeout):
+        """Block until the queue moves past `version` (or `timeout` seconds pass) and return its state."""
+        key = self._key(account_id, department_id, day)
+        deadline = time.monotonic() + timeout
+        queue = self._queue(session, key)
+        while True:
+            with self._changed:
+                while self._queues.get(key) is queue and queue["version"] == version:
+                    remaining = min(deadline, queue["loaded"] + self.ttl) - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._changed.wait(remaining)
+                if queue["version"] != version or time.monotonic() >= deadline:
+                    return self._view(key, queue)
+            # Dropped, evicted or past its TTL: reload outside the lock and keep waiting
+            queue = self._queue(session, key)
+
+    def apply(self, account_id, changes):
+        """Apply committed token changes: (token id, old (department, day) or None, new one or None, number, status)."""
+        with self._changed:
+            touched = set()
+            for token_id, old, new, number, status in changes:
+                if old is not None:
+                    key = self._key(account_id, *old)
+                    if key in self._loading:
+                        self._loading[key][token_id] = None
+                    if key in self._queues and self._queues[key]["tokens"].pop(token_id, None) is not None:
+                        touched.add(key)
+                if new is not None:
+                    key = self._key(account_id, *new)
+                    if key in self._loading:
+                        self._loading[key][token_id] = (number, status)
+                    if key in self._queues:
+                        self._queues[key]["tokens"][token_id] = (number, status)
+                        touched.add(key)
+            for key in touched:
+                queue = self._queues[key]
+                queue["version"] = next(self._versions)
+                queue["view"] = None
+            if touched:
+                self._changed.notify_all()
+
+    def invalidate(self, account_id=None):
+        """Drop loaded queues (of one tenant, or all); they are reloaded on next use."""
+        with self._changed:
+            for key in list(self._queues):
+                if account_id is None or key[0] == str(account_id):
+                    del self._queues[key]
+            self._changed.notify_all()
+
+
+token_queues = TokenQueues(max_queues=int(os.environ.get("TOKEN_QUEUE_CACHE_SIZE", 1024)))
+
+
+# --- Write tracking -------------------------------------------------------------
+# Tenant sessions carry their account id in session.info (see utils.tenant_engines).
+# Token changes are collected on flush and applied to the queues once committed.
+
+def _previous(attr, current):
+    deleted = attr.history.deleted
+    return deleted[0] if deleted else current
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_token_changes(session, flush_context):
+    if "account_id" not in session.info:
+        return
+    changes = session.info.setdefault("token_queue_changes", [])
+    for token in session.new:
+        if isinstance(token, Token):
+            changes.append((token.id, None, (token.department_id, token.appointment_date),
+                            token.token_number, token.status))
+    for token in session.dirty:
+        if isinstance(token, Token):
+            attrs = inspect(token).attrs
+            old = (_previous(attrs.department_id, token.department_id),
+                   _previous(attrs.appointment_date, token.appointment_date))
+            changes.append((token.id, old, (token.department_id, token.appointment_date),
+                            token.token_number, token.status))
+    for token in session.deleted:
+        if isinstance(token, Token):
+            changes.append((token.id, (token.department_id, token.appointment_date), None, None, None))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_token_changes(session):
+    changes = session.info.pop("token_queue_changes", None)
+    if changes:
+        token_queues.apply(session.info["account_id"], changes)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_token_changes(session, previous_transaction):
+    session.info.pop("token_queue_changes", None)